@@ -0,0 +1,55 @@
+"""
+Benchmark decoding a tasks file into Task objects.
+
+Writes a tasks file, loads it with FileHandler.load_tasks and reports the
+decode throughput the handler records in decode_stats.
+
+Usage:
+    python benchmarks/bench_decode.py [--count 200000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.task import Task
+from src.utils.file_handler import FileHandler
+
+STATUSES = ["pending", "in_progress", "completed"]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=200_000, help="number of tasks in the file")
+    args = parser.parse_args()
+
+    created = datetime(2025, 1, 1)
+    tasks = [Task(
+        title=f"Benchmark task {i}",
+        description=f"Description of benchmark task {i}",
+        status=STATUSES[i % len(STATUSES)],
+        priority=i % 5 + 1,
+        created_date=created + timedelta(seconds=i),
+        due_date=created + timedelta(days=i % 90) if i % 4 == 0 else None,
+    ) for i in range(args.count)]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        FileHandler(data_dir=data_dir, fsync=False).save_tasks(tasks)
+        # A fresh handler, so the load is not served from the task cache
+        file_handler = FileHandler(data_dir=data_dir)
+        start = time.perf_counter()
+        file_handler.load_tasks()
+        elapsed = time.perf_counter() - start
+
+    stats = file_handler.decode_stats
+    print(f"tasks:          {stats['tasks']:,}")
+    print(f"load time:      {elapsed:.2f} s")
+    print(f"decode time:    {stats['seconds']:.2f} s")
+    print(f"decode rate:    {stats['tasks_per_sec']:,.0f} tasks/sec")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark point lookups and single-task mutations as the task list grows.
+
+For each size, writes a tasks file and times TaskAPI.get_task,
+update_task and delete_task on tasks spread over the list. Mutations are
+journaled, so the timings show the cost of finding the task rather than of
+rewriting the file. Then times a combined filter (pending, priority 4 or 5,
+source "ai") through TaskAPI.find_tasks and through a full scan, and the
+first page of a sorted query over all pending tasks.
+
+Usage:
+    python benchmarks/bench_lookup.py [--sizes 1000 10000 100000 1000000] [--calls 50]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.api.task_api import TaskAPI
+from src.models.task import Task
+from src.utils.file_handler import FileHandler
+
+def _median_ms(call, arguments) -> float:
+    """Median latency of a call over the given arguments, in milliseconds."""
+    latencies = []
+    for argument in arguments:
+        start = time.perf_counter()
+        call(argument)
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000],
+                        help="numbers of tasks to test")
+    parser.add_argument("--calls", type=int, default=50, help="calls timed per operation")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>10} {'get ms':>8} {'update ms':>10} {'delete ms':>10} {'filter ms':>10} {'scan ms':>10} {'query ms':>10}")
+    created = datetime(2025, 1, 1)
+    for size in args.sizes:
+        tasks = [Task(title=f"Benchmark task {i}", description="Lookup benchmark", priority=i % 5 + 1,
+                      source="ai" if i % 50 == 0 else "human",
+                      created_date=created + timedelta(seconds=i)) for i in range(size)]
+        with tempfile.TemporaryDirectory() as data_dir:
+            FileHandler(data_dir=data_dir, fsync=False).save_tasks(tasks)
+            del tasks
+            # A high compaction threshold keeps every mutation in the journal
+            task_api = TaskAPI(file_handler=FileHandler(data_dir=data_dir, journal=True, fsync=False,
+                                                        compact_threshold=10 * args.calls))
+            task_api.get_task("Benchmark task 0")
+
+            step = size // (3 * args.calls)
+            titles = [f"Benchmark task {i * step}" for i in range(3 * args.calls)]
+            get = _median_ms(task_api.get_task, titles[:args.calls])
+            update = _median_ms(lambda title: task_api.update_task(title, status="completed"),
+                                titles[args.calls:2 * args.calls])
+            delete = _median_ms(task_api.delete_task, titles[2 * args.calls:])
+
+            criteria = {"status": "pending", "priority": range(4, 6), "source": "ai"}
+            found = _median_ms(lambda _: task_api.find_tasks(**criteria), range(args.calls))
+            handler = task_api._file_handler
+            scan = _median_ms(lambda _: handler.find_tasks(**criteria), range(5))
+            query = _median_ms(lambda _: task_api.query("status:pending sort:-priority,created limit:50"),
+                               range(5))
+        print(f"{size:>10,} {get:>8.3f} {update:>10.3f} {delete:>10.3f} {found:>10.3f} {scan:>10.3f}"
+              f" {query:>10.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark the memory held by loaded tasks.
+
+Decodes task records in batches, as FileHandler.load_tasks does, and
+reports the memory retained by the resulting Task objects.
+
+Usage:
+    python benchmarks/bench_task_memory.py [--count 1000000]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.models.task import Task
+
+BATCH_SIZE = 10_000
+STATUSES = ["pending", "in_progress", "completed"]
+
+def _batch_json(start: int, size: int) -> str:
+    """Encode a batch of realistic task records as a tasks file would hold them."""
+    created = datetime(2025, 1, 1)
+    records = [{
+        "id": None,
+        "uuid": f"00000000-0000-4000-8000-{i:012d}",
+        "title": f"Benchmark task {i}",
+        "description": f"Description of benchmark task {i}",
+        "dependencies": [f"Benchmark task {i - 1}"] if i % 10 == 0 and i else [],
+        "status": STATUSES[i % len(STATUSES)],
+        "priority": i % 5 + 1,
+        "created_date": (created + timedelta(seconds=i)).isoformat(),
+        "due_date": (created + timedelta(days=i % 90)).isoformat() if i % 4 == 0 else None,
+        "model": "llama3.2" if i % 3 else "unknown",
+        "source": "ai" if i % 3 else "human",
+    } for i in range(start, start + size)]
+    return json.dumps(records)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000, help="number of tasks to load")
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    tasks = []
+    for offset in range(0, args.count, BATCH_SIZE):
+        # Each batch is decoded from fresh text, so values are not shared by accident
+        data = _batch_json(offset, min(BATCH_SIZE, args.count - offset))
+        tasks.extend(Task.from_dict(record) for record in json.loads(data))
+        del data
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"tasks:          {len(tasks):,}")
+    print(f"retained:       {retained / 2**20:,.1f} MiB ({retained / len(tasks):,.0f} bytes/task)")
+    print(f"peak:           {peak / 2**20:,.1f} MiB")
+    print(f"load time:      {elapsed:.2f} s (with tracemalloc)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark updating a single task in a large tasks file.
+
+Writes a tasks file, then changes one task at a time through TaskAPI and
+reports the latency of each update, which includes rewriting the file.
+
+Usage:
+    python benchmarks/bench_update.py [--count 50000] [--updates 20] [--snapshot]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.api.task_api import TaskAPI
+from src.models.task import Task
+from src.utils.file_handler import FileHandler
+
+STATUSES = ["pending", "in_progress", "completed"]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=50_000, help="number of tasks in the file")
+    parser.add_argument("--updates", type=int, default=20, help="number of updates to time")
+    parser.add_argument("--snapshot", action="store_true", help="keep a binary snapshot, as the CLI does")
+    args = parser.parse_args()
+
+    created = datetime(2025, 1, 1)
+    tasks = [Task(
+        title=f"Benchmark task {i}",
+        description=f"Description of benchmark task {i}",
+        status=STATUSES[i % len(STATUSES)],
+        priority=i % 5 + 1,
+        created_date=created + timedelta(seconds=i),
+    ) for i in range(args.count)]
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        FileHandler(data_dir=data_dir, fsync=False).save_tasks(tasks)
+        # Without the journal every update rewrites the whole file
+        task_api = TaskAPI(file_handler=FileHandler(data_dir=data_dir, journal=False,
+                                                        snapshot=args.snapshot))
+        start = time.perf_counter()
+        task_api.update_task("Benchmark task 0", priority=5)
+        first = time.perf_counter() - start
+
+        latencies = []
+        step = max(1, args.count // args.updates)
+        for i in range(args.updates):
+            start = time.perf_counter()
+            task_api.update_task(f"Benchmark task {i * step % args.count}", status="completed")
+            latencies.append(time.perf_counter() - start)
+
+    print(f"tasks:          {args.count:,}")
+    print(f"first update:   {first * 1000:.1f} ms (loads and encodes every task)")
+    print(f"median update:  {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"max update:     {max(latencies) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
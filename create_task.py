@@ -1,7 +1,12 @@
-update rules to include JSON schemaimport json
+import json
 import uuid
 import argparse
 from datetime import datetime
+from pathlib import Path
+
+from src.api.task_api import TaskAPI
+from src.utils.file_handler import FileHandler
+from src.utils.ndjson import is_ndjson
 
 def create_task(title, description, priority=3, status="pending", due_date=None, model="unknown", source="human"):
     """Create a new task with the required fields."""
@@ -22,48 +27,80 @@ def create_task(title, description, priority=3, status="pending", due_date=None,
     return task
 
 def add_task_to_file(task, file_path="data/tasks.json"):
-    """Add a task to the specified file."""
-    try:
-        # Read existing tasks
-        with open(file_path, 'r') as f:
-            try:
-                data = json.load(f)
-                
-                # Handle both formats: direct list of tasks or {"tasks": [...]}
-                if isinstance(data, dict) and "tasks" in data:
-                    tasks = data["tasks"]
-                    data["tasks"].append(task)
-                else:
-                    tasks = data
-                    data.append(task)
-            except json.JSONDecodeError:
-                # If the file is empty or invalid, create a new task list
-                tasks = [task]
-                data = tasks
-    except FileNotFoundError:
-        # If the file doesn't exist, create a new task list
-        tasks = [task]
-        data = tasks
+    """
+    Add a task to the specified file.
+    
+    NDJSON task files (.ndjson/.jsonl, or line-delimited content) get the task
+    appended as a single line; list and {"tasks": [...]} files are rewritten
+    while holding the file's write lock, so saves made by other processes in
+    the meantime are not lost. Existing records are kept exactly as they are.
     
-    # Write the updated tasks back to the file
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
+    Returns:
+        The number of tasks in the file, or None for NDJSON files, which would
+        have to be read in full to be counted
+    """
+    path = Path(file_path)
+    handler = FileHandler(data_dir=str(path.parent))
+    if is_ndjson(path):
+        handler.append_records([task], file_path)
+        return None
+    
+    with handler.locked(path):
+        try:
+            data = handler.read_records(file_path)
+        except json.JSONDecodeError:
+            # If the file is invalid, create a new task list
+            data = []
+        
+        # Handle both formats: direct list of tasks or {"tasks": [...]}
+        tasks = data["tasks"] if isinstance(data, dict) and "tasks" in data else data
+        tasks.append(task)
+        handler.write_records(data, file_path)
     
     return len(tasks)
 
+def import_tasks(import_file, file_path="data/tasks.json"):
+    """
+    Create every task listed in a JSON file, with a single save.
+    
+    The import file holds a list of tasks, or {"tasks": [...]}, each with a
+    title, a description and optionally any other task field. Titles are
+    validated and made unique like tasks created one by one.
+    
+    Returns:
+        One result per task, as returned by TaskAPI.create_many
+    """
+    with open(import_file, 'r') as f:
+        data = json.load(f)
+    records = data["tasks"] if isinstance(data, dict) and "tasks" in data else data
+    handler = FileHandler(data_dir=str(Path(file_path).parent))
+    return TaskAPI(data_file=file_path, file_handler=handler).create_many(records)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Create a new task")
-    parser.add_argument("title", help="Task title")
-    parser.add_argument("description", help="Task description")
+    parser.add_argument("title", nargs="?", help="Task title")
+    parser.add_argument("description", nargs="?", help="Task description")
     parser.add_argument("--priority", type=int, default=3, help="Task priority (1-5)")
     parser.add_argument("--status", default="pending", help="Task status")
     parser.add_argument("--due-date", help="Task due date (ISO format)")
     parser.add_argument("--model", default="unknown", help="Model used to create the task")
     parser.add_argument("--source", default="human", help="Source of the task")
     parser.add_argument("--file", default="data/tasks.json", help="File to add the task to")
+    parser.add_argument("--import-file", help="JSON file of tasks to create at once instead of a single task")
     
     args = parser.parse_args()
     
+    if args.import_file:
+        results = import_tasks(args.import_file, args.file)
+        created = sum(1 for result in results if result["error"] is None)
+        for number, result in enumerate(results, 1):
+            if result["error"] is not None:
+                print(f"Task {number} skipped: {result['error']}")
+        print(f"Imported {created} of {len(results)} tasks into {args.file}")
+        raise SystemExit(0)
+    if args.title is None or args.description is None:
+        parser.error("a title and a description are required unless --import-file is given")
+    
     task = create_task(
         args.title,
         args.description,
@@ -77,4 +114,5 @@ if __name__ == "__main__":
     count = add_task_to_file(task, args.file)
     
     print(f"Task '{args.title}' added to {args.file}")
-    print(f"Total tasks: {count}")
+    if count is not None:
+        print(f"Total tasks: {count}")
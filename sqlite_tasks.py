@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Script to import JSON task files into the SQLite store and export them back.
+"""
+
+import argparse
+from pathlib import Path
+
+from src.utils.sqlite_handler import SqliteFileHandler
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move tasks between JSON files and SQLite")
+    parser.add_argument("command", choices=["import", "export"], help="Direction of the transfer")
+    parser.add_argument("files", nargs="*", help="JSON files to import, or the file to export to")
+    parser.add_argument("--db", default="data/tasks.db", help="SQLite database file")
+
+    args = parser.parse_args()
+
+    db_path = Path(args.db)
+    handler = SqliteFileHandler(data_dir=str(db_path.parent), db_name=db_path.name)
+
+    if args.command == "import":
+        # Default to every valid task file next to the database
+        json_files = args.files or [
+            str(f) for f in handler.list_task_files()[0] if handler.validate_task_file(str(f))[0]
+        ]
+        count = handler.import_json(*json_files)
+        print(f"Imported {count} tasks from {len(json_files)} file(s) into {args.db}")
+    else:
+        json_file = args.files[0] if args.files else str(db_path.with_suffix(".json"))
+        count = handler.export_json(json_file)
+        print(f"Exported {count} tasks from {args.db} to {json_file}")
@@ -2,31 +2,130 @@
 Task API implementation.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, TypeVar, Union
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
+import random
+import time
+import uuid
 
 from .base import BaseAPI
+from .task_index import TaskIndex
+from .task_query import TaskQuery, parse_query
 from ..models.task import Task
-from ..utils.file_handler import FileHandler
+from ..models.task_table import TaskTable
+from ..utils.file_handler import FileHandler, StaleVersionError
+
+T = TypeVar("T")
+
+# Applies a change to a task list and its index, records it and returns a result
+Mutation = Callable[[List[Task], TaskIndex, "_Changes"], T]
+
+def _api_dict(task: Task) -> Dict[str, Any]:
+    """Convert a task to the dict the API returns."""
+    # Add created_at/updated_at for compatibility with tests
+    task_dict = task.to_dict()
+    task_dict['created_at'] = task_dict.pop('created_date')
+    task_dict['updated_at'] = task_dict['created_at']
+    return task_dict
+
+class _Changes:
+    """Tasks created, updated and removed by mutations that are not persisted yet."""
+    
+    def __init__(self):
+        self.created: List[Task] = []
+        self.updated: List[Task] = []
+        self.removed: List[Task] = []
+    
+    def __bool__(self) -> bool:
+        return bool(self.created or self.updated or self.removed)
+    
+    def persist(self, handler: FileHandler, tasks: List[Task]) -> None:
+        """
+        Persist the changes with the handler's narrowest persist method.
+        
+        Args:
+            handler: The storage handler
+            tasks: The full task list, with the changes applied
+        """
+        created = set(map(id, self.created))
+        removed_ids = set(map(id, self.removed))
+        # Tasks created or updated and then deleted in the same batch only need deleting,
+        # and tasks created and then deleted need nothing at all
+        changed = list({id(task): task for task in self.created + self.updated
+                        if id(task) not in removed_ids}.values())
+        removed = [task for task in self.removed if id(task) not in created]
+        if not changed and not removed:
+            return
+        if not removed and len(changed) == 1:
+            if id(changed[0]) in created:
+                handler.persist_create(tasks, changed[0])
+            else:
+                handler.persist_update(tasks, changed[0])
+        elif not changed:
+            handler.persist_delete(tasks, removed)
+        else:
+            handler.persist_batch(tasks, changed, removed)
+
+class _Batch:
+    """Mutations made inside TaskAPI.batch(), with the tasks they were applied to."""
+    
+    def __init__(self):
+        self.mutations: List[Mutation] = []
+        # What each mutation returned when last applied
+        self.results: List[Any] = []
+        self.tasks: Optional[List[Task]] = None
+        self.index: Optional[TaskIndex] = None
+        self.changes = _Changes()
 
 class TaskAPI(BaseAPI):
     """API for task management operations."""
     
-    def __init__(self, data_file=None):
+    # How often a mutation is tried when another process changed the file;
+    # the last attempt holds the write lock, so no one can change it again
+    MAX_CONFLICT_RETRIES = 5
+    
+    # Longest pause before the first retry, in seconds, doubled for each further one
+    CONFLICT_BACKOFF = 0.005
+    
+    def __init__(self, data_file=None, journal: bool = False, file_handler: Optional[FileHandler] = None,
+                 snapshot: bool = False, lazy: bool = False):
+        """
+        Initialize the Task API.
+        
+        Args:
+            data_file: Optional path to the tasks file to use.
+            journal: Journal single-task mutations instead of rewriting the file.
+            file_handler: Optional storage handler to use instead of a JSON
+                FileHandler, e.g. a SqliteFileHandler.
+            snapshot: Keep a binary snapshot of the tasks file for fast loading.
+            lazy: Load tasks as views that parse fields only when read.
+        """
         super().__init__()
-        self._file_handler = FileHandler()
+        self._journal = journal
+        self._snapshot = snapshot
+        self._lazy = lazy
+        self._custom_file_handler = file_handler is not None
+        self._file_handler = file_handler or FileHandler(journal=journal, snapshot=snapshot, lazy=lazy)
         if data_file:
             self._file_handler.tasks_file = Path(data_file)
         self._original_tasks_file = self._file_handler.tasks_file
+        # Indexes of the handler's cached tasks, rebuilt when it re-reads them
+        self._index: Optional[TaskIndex] = None
+        # Mutations waiting for the end of a batch() block
+        self._batch: Optional[_Batch] = None
     
     def initialize(self) -> None:
         """Initialize the Task API components."""
-        # Keep the existing file handler if it has a custom tasks_file
-        custom_tasks_file = getattr(self._file_handler, 'tasks_file', None)
-        self._file_handler = FileHandler()
-        if custom_tasks_file:
-            self._file_handler.tasks_file = custom_tasks_file
+        # An injected storage handler is kept as configured
+        if not self._custom_file_handler:
+            # Keep the existing file handler if it has a custom tasks_file
+            custom_tasks_file = getattr(self._file_handler, 'tasks_file', None)
+            self._file_handler = FileHandler(journal=self._journal, snapshot=self._snapshot, lazy=self._lazy)
+            if custom_tasks_file:
+                self._file_handler.tasks_file = custom_tasks_file
+            self._index = None
         # TODO: Initialize model, controller, and presenter
     
     def validate(self) -> bool:
@@ -41,35 +140,9 @@ class TaskAPI(BaseAPI):
     def create_task(self, title: str, description: str, **kwargs) -> Dict[str, Any]:
         """Create a new task."""
         try:
-            # Validate title
-            if title.isdigit():
-                raise ValueError("Task title cannot be purely numeric")
-            if len(title) < 5:
-                raise ValueError("Task title must be at least 5 characters long")
-                
-            # Check if a task with the same title already exists
-            tasks = self._file_handler.load_tasks()
-            title_exists = any(task.title == title for task in tasks)
-            
-            if title_exists:
-                # Make the title unique by appending a suffix
-                base_title = title
-                suffix = 1
-                while any(task.title == f"{base_title} ({suffix})" for task in tasks):
-                    suffix += 1
-                title = f"{base_title} ({suffix})"
-            
-            task = Task(title=title, description=description, **kwargs)
-            tasks.append(task)
-            self._file_handler.save_tasks(tasks)
-            
-            # Convert to dict and add created_at/updated_at for compatibility with tests
-            task_dict = task.to_dict()
-            task_dict['created_at'] = task_dict.pop('created_date')
-            task_dict['updated_at'] = task_dict['created_at']
-            return task_dict
-        except ValueError as e:
-            # Handle validation errors
+            return _api_dict(self._mutate(self._creator(title, description, **kwargs)))
+        except (ValueError, StaleVersionError) as e:
+            # Handle validation errors and writes other processes kept conflicting with
             from rich.console import Console
             console = Console()
             console.print(f"[red]Error: {str(e)}[/red]")
@@ -77,74 +150,25 @@ class TaskAPI(BaseAPI):
     
     def get_task(self, task_id_or_title: str) -> Optional[Dict[str, Any]]:
         """Get a task by ID or title."""
-        tasks = self._file_handler.load_tasks()
-        
-        # First try to find by ID
-        task = next((task for task in tasks if task.id == task_id_or_title), None)
-        
-        # If not found by ID, try to find by title
-        if task is None:
-            task = next((task for task in tasks if task.title == task_id_or_title), None)
+        if not self._file_handler.CACHES_TASKS:
+            # Handlers that do not cache tasks query their own indexes
+            task = next(iter(self._file_handler.find_tasks(id=task_id_or_title)), None)
+            if task is None:
+                task = next(iter(self._file_handler.find_tasks(title=task_id_or_title)), None)
+        else:
+            task = self._find_task(self._index_of(*self._file_handler.cached_tasks()), task_id_or_title)
         
         if task:
-            # Convert to dict and add created_at/updated_at for compatibility with tests
-            task_dict = task.to_dict()
-            task_dict['created_at'] = task_dict.pop('created_date')
-            task_dict['updated_at'] = task_dict['created_at']
-            return task_dict
+            return _api_dict(task)
         return None
     
     def update_task(self, task_id_or_title: str, **kwargs) -> Optional[Dict[str, Any]]:
         """Update a task by ID or title."""
         try:
-            # Validate title if it's being updated
-            if 'title' in kwargs:
-                new_title = kwargs['title']
-                if new_title.isdigit():
-                    raise ValueError("Task title cannot be purely numeric")
-                if len(new_title) < 5:
-                    raise ValueError("Task title must be at least 5 characters long")
-            
-            tasks = self._file_handler.load_tasks()
-            
-            # First try to find by ID
-            task_index = next((i for i, task in enumerate(tasks) if task.id == task_id_or_title), None)
-            
-            # If not found by ID, try to find by title
-            if task_index is None:
-                task_index = next((i for i, task in enumerate(tasks) if task.title == task_id_or_title), None)
-            
-            if task_index is not None:
-                task = tasks[task_index]
-                
-                # Check if we're updating the title and if the new title would be a duplicate
-                if 'title' in kwargs:
-                    new_title = kwargs['title']
-                    # Check if another task (not this one) already has this title
-                    title_exists = any(t.title == new_title and t != task for t in tasks)
-                    
-                    if title_exists:
-                        # Make the title unique by appending a suffix
-                        base_title = new_title
-                        suffix = 1
-                        while any(t.title == f"{base_title} ({suffix})" and t != task for t in tasks):
-                            suffix += 1
-                        kwargs['title'] = f"{base_title} ({suffix})"
-                
-                # Update the task
-                for key, value in kwargs.items():
-                    setattr(task, key, value)
-                
-                self._file_handler.save_tasks(tasks)
-                
-                # Convert to dict and add created_at/updated_at for compatibility with tests
-                task_dict = task.to_dict()
-                task_dict['created_at'] = task_dict.pop('created_date')
-                task_dict['updated_at'] = task_dict['created_at']
-                return task_dict
-            return None
-        except ValueError as e:
-            # Handle validation errors
+            task = self._mutate(self._updater(task_id_or_title, kwargs))
+            return _api_dict(task) if task is not None else None
+        except (ValueError, StaleVersionError) as e:
+            # Handle validation errors and writes other processes kept conflicting with
             from rich.console import Console
             console = Console()
             console.print(f"[red]Error: {str(e)}[/red]")
@@ -152,44 +176,429 @@ class TaskAPI(BaseAPI):
     
     def delete_task(self, task_id_or_title: str) -> bool:
         """Delete a task by ID or title."""
-        tasks = self._file_handler.load_tasks()
-        initial_length = len(tasks)
+        try:
+            return self._mutate(self._deleter([task_id_or_title]))[0]
+        except StaleVersionError as e:
+            from rich.console import Console
+            console = Console()
+            console.print(f"[red]Error: {str(e)}[/red]")
+            return False
+    
+    def create_many(self, tasks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create many tasks with a single load and a single save.
+        
+        Args:
+            tasks: Task fields per task, as create_task() takes them: a title,
+                a description and any other Task field
+                
+        Returns:
+            One result per task, in order: {"task": the created task, as
+            create_task() returns it, "error": None}, or {"task": None,
+            "error": why the task was rejected}. Rejected tasks do not stop
+            the others from being created. Inside an enclosing batch() the
+            tasks are described as created in memory, before the save.
+        """
+        # Positions of the mutations in the batch, or why a task was rejected
+        outcomes: List[Union[int, str]] = []
+        with self.batch():
+            batch = self._batch
+            for fields in tasks:
+                fields = dict(fields)
+                try:
+                    self._mutate(self._creator(fields.pop("title", ""), fields.pop("description", ""), **fields))
+                    outcomes.append(len(batch.results) - 1)
+                except (ValueError, TypeError, AttributeError) as e:
+                    outcomes.append(str(e))
+        # Built after the save, which may have applied the mutations again
+        return [{"task": _api_dict(batch.results[outcome]), "error": None} if isinstance(outcome, int)
+                else {"task": None, "error": outcome} for outcome in outcomes]
+    
+    def update_many(self, updates: Iterable[Tuple[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Update many tasks with a single load and a single save.
+        
+        Args:
+            updates: (task ID or title, fields to change) pairs, applied in order
+            
+        Returns:
+            One result per update, in order: {"task": the updated task, as
+            update_task() returns it, "error": None}, or {"task": None,
+            "error": why the update failed}, e.g. because no task matched.
+        """
+        # Positions of the mutations in the batch, or why an update failed
+        outcomes: List[Tuple[str, Union[int, str]]] = []
+        with self.batch():
+            batch = self._batch
+            for task_id_or_title, changes in updates:
+                try:
+                    self._mutate(self._updater(task_id_or_title, changes))
+                    outcomes.append((task_id_or_title, len(batch.results) - 1))
+                except (ValueError, TypeError, AttributeError) as e:
+                    outcomes.append((task_id_or_title, str(e)))
+        
+        # Built after the save, which may have applied the mutations again
+        results = []
+        for task_id_or_title, outcome in outcomes:
+            task = batch.results[outcome] if isinstance(outcome, int) else None
+            if task is not None:
+                results.append({"task": _api_dict(task), "error": None})
+            elif isinstance(outcome, int):
+                results.append({"task": None, "error": f"Task not found: {task_id_or_title}"})
+            else:
+                results.append({"task": None, "error": outcome})
+        return results
+    
+    def delete_many(self, task_ids_or_titles: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Delete many tasks with a single load and a single save.
+        
+        Args:
+            task_ids_or_titles: IDs or titles of the tasks to delete
+            
+        Returns:
+            One result per ID or title, in order: {"deleted": True, "error":
+            None}, or {"deleted": False, "error": why nothing was deleted}
+        """
+        task_ids_or_titles = list(task_ids_or_titles)
+        # A single mutation, so the task list is compacted once for all of them
+        deleted = self._mutate(self._deleter(task_ids_or_titles))
+        return [{"deleted": True, "error": None} if found
+                else {"deleted": False, "error": f"Task not found: {task_id_or_title}"}
+                for task_id_or_title, found in zip(task_ids_or_titles, deleted)]
+    
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Defer the writes of all mutations made in the block until it exits.
+        
+        Inside the block, create_task(), update_task() and delete_task()
+        change the tasks in memory only; reads in the block see the changes
+        for as long as the tasks file is not changed by someone else. When
+        the block exits the changes are written with a single save. If
+        another process wrote the file meanwhile, the mutations are applied
+        again to its new contents first. If the block raises, nothing is
+        written and the changes are discarded. Nested blocks join the
+        outermost one.
+        
+        Raises:
+            StaleVersionError: If other writers kept changing the file while
+                the changes were being saved
+        """
+        if self._batch is not None:
+            yield
+            return
+        
+        batch = self._batch = _Batch()
+        try:
+            yield
+        except BaseException:
+            self._batch = None
+            if batch.changes:
+                # The cached tasks hold changes that will never be written
+                self._file_handler.clear_cache()
+            raise
+        self._batch = None
+        if batch.mutations:
+            self._retry_on_conflict(lambda: self._persist_batch(batch))
+    
+    def _creator(self, title: str, description: str, **kwargs) -> "Mutation[Task]":
+        """
+        Validate a new task and build the mutation that creates it.
         
-        # Try to delete by ID first
-        filtered_tasks = [task for task in tasks if task.id != task_id_or_title]
+        Raises:
+            ValueError: If the title is invalid
+        """
+        if title.isdigit():
+            raise ValueError("Task title cannot be purely numeric")
+        if len(title) < 5:
+            raise ValueError("Task title must be at least 5 characters long")
+        # Fixed here, so a batch applied again creates the same task
+        if kwargs.get('uuid') is None:
+            kwargs['uuid'] = str(uuid.uuid4())
+        if kwargs.get('created_date') is None:
+            kwargs['created_date'] = datetime.now()
         
-        # If no tasks were deleted by ID, try to delete by title
-        if len(filtered_tasks) == initial_length:
-            filtered_tasks = [task for task in tasks if task.title != task_id_or_title]
+        def create(tasks: List[Task], index: TaskIndex, changes: "_Changes") -> Task:
+            # Make the title unique by appending a suffix if it is taken
+            task = Task(title=index.unique_title(title), description=description, **kwargs)
+            tasks.append(task)
+            index.add(task)
+            changes.created.append(task)
+            return task
         
-        if len(filtered_tasks) < initial_length:
-            self._file_handler.save_tasks(filtered_tasks)
-            return True
-        return False
+        return create
     
-    def list_tasks(self) -> List[Dict[str, Any]]:
-        """Get all tasks."""
+    def _updater(self, task_id_or_title: str, fields: Dict[str, Any]) -> "Mutation[Optional[Task]]":
+        """
+        Validate changes to a task and build the mutation that applies them.
+        
+        Raises:
+            ValueError: If the new title is invalid, a field does not exist or
+                the uuid would change
+        """
+        # Validate title if it's being updated
+        if 'title' in fields:
+            new_title = fields['title']
+            if new_title.isdigit():
+                raise ValueError("Task title cannot be purely numeric")
+            if len(new_title) < 5:
+                raise ValueError("Task title must be at least 5 characters long")
+        # Checked up front, so a task is never left half updated
+        unknown = set(fields) - set(Task.__dataclass_fields__)
+        if unknown:
+            raise ValueError(f"Unknown task fields: {', '.join(sorted(unknown))}")
+        # Storage handlers find the stored record of a task by its uuid
+        if 'uuid' in fields:
+            raise ValueError("Task uuid cannot be changed")
+        fields = dict(fields)
+        # Cached tasks are not rebuilt from the file, so normalize like Task.__post_init__
+        if 'priority' in fields:
+            fields['priority'] = Task.normalize_priority(fields['priority'])
+        
+        def update(tasks: List[Task], index: TaskIndex, changes: "_Changes") -> Optional[Task]:
+            # First try to find by ID, then by title
+            task = self._find_task(index, task_id_or_title)
+            if task is None:
+                return None
+            
+            values = dict(fields)
+            # Make the new title unique among the other tasks
+            if 'title' in values:
+                values['title'] = index.unique_title(values['title'], task)
+            
+            # Update the task; the cached task changes in place, so the index follows at once
+            old_values = index.values(task)
+            for key, value in values.items():
+                setattr(task, key, value)
+            index.reindex(task, old_values)
+            changes.updated.append(task)
+            return task
+        
+        return update
+    
+    def _deleter(self, task_ids_or_titles: List[str]) -> "Mutation[List[bool]]":
+        """Build the mutation that deletes the tasks with each of several IDs or titles."""
+        def delete(tasks: List[Task], index: TaskIndex, changes: "_Changes") -> List[bool]:
+            found = []
+            removed: List[Task] = []
+            for task_id_or_title in task_ids_or_titles:
+                # Try to delete by ID first, then by title
+                matches = index.find("id", task_id_or_title) or index.find("title", task_id_or_title)
+                for task in matches:
+                    index.remove(task)
+                removed.extend(matches)
+                found.append(bool(matches))
+            
+            if removed:
+                # One pass over the list, however many tasks are removed
+                removed_ids = set(map(id, removed))
+                tasks[:] = [task for task in tasks if id(task) not in removed_ids]
+                changes.removed.extend(removed)
+            return found
+        
+        return delete
+    
+    def _mutate(self, mutation: "Mutation[T]") -> T:
+        """
+        Apply a mutation to the current tasks and persist it, or, inside
+        batch(), record it for the batch's save.
+        
+        Returns:
+            The result of the mutation
+        """
+        batch = self._batch
+        if batch is not None:
+            if batch.tasks is None:
+                batch.tasks, batch.index = self._load_indexed()
+            result = mutation(batch.tasks, batch.index, batch.changes)
+            batch.mutations.append(mutation)
+            batch.results.append(result)
+            return result
+        
+        def apply() -> T:
+            tasks, index = self._load_indexed()
+            changes = _Changes()
+            result = mutation(tasks, index, changes)
+            self._persist(tasks, index, changes)
+            return result
+        
+        return self._retry_on_conflict(apply)
+    
+    def _persist_batch(self, batch: "_Batch") -> None:
+        """
+        Persist the mutations of a batch, applying them again to the current
+        tasks if the file was re-read since they were applied.
+        """
+        if self._file_handler.CACHES_TASKS and self._file_handler.cached_tasks()[1] is not batch.tasks:
+            batch.tasks, batch.index = self._load_indexed()
+            batch.changes = _Changes()
+            batch.results = [mutation(batch.tasks, batch.index, batch.changes)
+                             for mutation in batch.mutations]
+        self._persist(batch.tasks, batch.index, batch.changes)
+    
+    def _index_of(self, generation: Optional[int], tasks: List[Task]) -> TaskIndex:
+        """Get the index of the handler's cached tasks, building it if they were re-read."""
+        if generation is None:
+            # Nothing is cached to keep an index for
+            return TaskIndex(tasks)
+        if self._index is None or self._index.generation != generation:
+            self._index = TaskIndex(tasks, generation)
+        return self._index
+    
+    def _load_indexed(self) -> Tuple[List[Task], TaskIndex]:
+        """
+        Load the tasks for a mutation, together with their index.
+        
+        The list is the handler's cached one, not a copy: copying and freeing
+        a list of a million tasks costs more than the rest of a journaled
+        mutation. Mutations change it in place and persist it through
+        _persist().
+        
+        Returns:
+            The task list and the index of the tasks as loaded
+        """
+        generation, tasks = self._file_handler.cached_tasks()
+        return tasks, self._index_of(generation, tasks)
+    
+    def _persist(self, tasks: List[Task], index: TaskIndex, changes: "_Changes") -> None:
+        """
+        Persist changes made in place to the handler's cached task list.
+        
+        Persisting caches the changed list under a new generation, and the
+        index carries over to it instead of being rebuilt. If persisting
+        fails before that, the cache is dropped, so the next load reads the
+        file again instead of serving changes that were never written.
+        
+        Args:
+            tasks: The changed task list
+            index: The index of the changed tasks
+            changes: What the mutations changed
+        """
+        generation = self._file_handler.cache_generation
+        try:
+            changes.persist(self._file_handler, tasks)
+        except BaseException:
+            if self._file_handler.cache_generation == generation:
+                self._file_handler.clear_cache()
+            raise
+        if index is self._index:
+            index.generation = self._file_handler.cache_generation
+    
+    @staticmethod
+    def _find_task(index: TaskIndex, task_id_or_title: str) -> Optional[Task]:
+        """Find a task by ID, or failing that by title."""
+        task = index.get("id", task_id_or_title)
+        return task if task is not None else index.get("title", task_id_or_title)
+    
+    def _retry_on_conflict(self, mutation: Callable[[], T]) -> T:
+        """
+        Run a load-modify-persist cycle, retrying it against the fresh file
+        when another process wrote the tasks file in between.
+        
+        Retries wait a random, growing pause, so writers that collided do
+        not collide again. The last attempt holds the write lock from load
+        to persist, making other writers wait for it instead.
+        
+        Args:
+            mutation: Function that loads the tasks, changes them and persists them
+            
+        Returns:
+            The result of the mutation
+        """
+        for attempt in range(self.MAX_CONFLICT_RETRIES - 1):
+            try:
+                return mutation()
+            except StaleVersionError:
+                time.sleep(random.uniform(0, self.CONFLICT_BACKOFF * 2 ** attempt))
+        with self._file_handler.locked():
+            return mutation()
+    
+    def list_tasks(self, as_table: bool = False) -> Union[List[Dict[str, Any]], TaskTable]:
+        """
+        Get all tasks.
+        
+        Args:
+            as_table: Return a columnar TaskTable for analytics instead of a
+                list of dicts. Needs NumPy.
+        """
         tasks = self._file_handler.load_tasks()
+        if as_table:
+            return TaskTable.from_tasks(tasks)
+        
+        return [_api_dict(task) for task in tasks]
+    
+    def count_tasks(self) -> int:
+        """Get the number of tasks in the current file."""
+        return len(self._file_handler.load_tasks())
+    
+    def find_tasks(self, **criteria) -> List[Task]:
+        """
+        Find the tasks matching all of the given criteria.
+        
+        Combined filters such as status="pending", priority=range(4, 6),
+        source="ai" are answered by intersecting the indexed sets of tasks
+        per value instead of scanning every task.
+        
+        Args:
+            **criteria: Field/value pairs, e.g. status="pending". A list,
+                tuple, set or range matches any of its values. Supported
+                fields are listed in FileHandler.QUERY_FIELDS.
+                
+        Returns:
+            The matching tasks, in file order
+        """
+        if not self._file_handler.CACHES_TASKS:
+            return self._file_handler.find_tasks(**criteria)
+        return self._index_of(*self._file_handler.cached_tasks()).select(**criteria)
+    
+    def query(self, query: Union[str, TaskQuery], cursor: Optional[str] = None,
+              limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get a page of the tasks matching a query.
         
-        # Convert to dicts and add created_at/updated_at for compatibility with tests
-        task_dicts = []
-        for task in tasks:
-            task_dict = task.to_dict()
-            task_dict['created_at'] = task_dict.pop('created_date')
-            task_dict['updated_at'] = task_dict['created_at']
-            task_dicts.append(task_dict)
+        Conditions on indexed fields, such as status:pending or priority>=4,
+        are answered from the indexes; only the tasks they select are
+        checked against the other conditions, and only one page is sorted
+        and converted to dicts.
         
-        return task_dicts
+        Args:
+            query: A query in the query DSL, e.g. "status:pending priority>=4
+                due<7d sort:-priority,due limit:50" (see task_query), or a
+                compiled TaskQuery
+            cursor: The next_cursor of the previous page, to continue from it
+            limit: Page size, overriding the query's limit:
+            
+        Returns:
+            A dictionary with:
+            - tasks: The tasks of the page, as list_tasks() returns them
+            - next_cursor: Cursor of the next page, or None after the last page
+            
+        Raises:
+            ValueError: If the query or the cursor is invalid
+        """
+        if isinstance(query, str):
+            query = parse_query(query)
+        criteria = query.index_criteria()
+        if not self._file_handler.CACHES_TASKS:
+            # The handler's own indexes select the candidates
+            tasks = self._file_handler.find_tasks(**criteria)
+            index = TaskIndex(tasks)
+        else:
+            generation, tasks = self._file_handler.cached_tasks()
+            index = self._index_of(generation, tasks)
+            tasks = index.select(**criteria) if criteria else tasks
+        
+        page, next_cursor = query.page(tasks, index, cursor, limit)
+        return {"tasks": [_api_dict(task) for task in page], "next_cursor": next_cursor}
     
     def get_tasks_by_status(self, status: str) -> List[Task]:
         """Get tasks by status."""
-        tasks = self._file_handler.load_tasks()
-        return [task for task in tasks if task.status == status]
+        return self.find_tasks(status=status)
     
     def get_tasks_by_priority(self, priority: int) -> List[Task]:
         """Get tasks by priority."""
-        tasks = self._file_handler.load_tasks()
-        return [task for task in tasks if task.priority == priority]
+        return self.find_tasks(priority=priority)
     
     def change_tasks_file(self, file_path: str) -> tuple[bool, str, int]:
         """
@@ -254,5 +663,9 @@ class TaskAPI(BaseAPI):
             - The number of tasks in the file
         """
         current_file = str(self._file_handler.tasks_file)
-        task_count = len(self.list_tasks())
+        if self._file_handler.get_journal().exists():
+            # Journaled mutations are not reflected in the snapshot's catalog entry
+            task_count = self.count_tasks()
+        else:
+            task_count = self._file_handler.get_file_info()["task_count"]
         return current_file, task_count
@@ -0,0 +1,294 @@
+"""
+In-memory indexes over a task list.
+
+TaskAPI looks tasks up by id, uuid or title, and filters them by status,
+priority and source. A TaskIndex answers those lookups from dicts instead of
+scanning the list; it is built once per cached task list and kept up to date
+as the API creates, changes and deletes tasks.
+"""
+
+import re
+from itertools import count
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ..models.task import Task
+from ..utils.file_handler import MULTI_VALUE_TYPES
+
+# A title made unique with a numbered suffix, e.g. "Daily standup (3)"
+SUFFIXED_TITLE = re.compile(r"(.*) \(([1-9][0-9]*)\)")
+
+class TaskIndex:
+    """Hash indexes from a task's id, uuid and title to the task, and from
+    its status, priority and source to the tasks sharing them."""
+
+    # Fields that identify a task. Tasks whose value is None are left out.
+    KEYS = ("id", "uuid", "title")
+
+    # Fields with few distinct values that tasks are filtered by
+    FILTERS = ("status", "priority", "source")
+
+    def __init__(self, tasks: Iterable[Task], generation: Optional[int] = None):
+        """
+        Index a task list.
+
+        Args:
+            tasks: The tasks, in list order. A list is kept, not copied: its
+                owner changes it together with calling add() and remove().
+            generation: The FileHandler cache generation of the list, if any
+        """
+        tasks = tasks if isinstance(tasks, list) else list(tasks)
+        self.generation = generation
+        self._tasks = tasks
+        # The first task per value, and every task for the rare values held by several
+        self._first: Dict[str, Dict[Any, Task]] = {}
+        self._all: Dict[str, Dict[Any, List[Task]]] = {}
+        for key in self.KEYS:
+            values = list(map(attrgetter(key), tasks))
+            # Built in C; inserting in reverse makes the first task win
+            first = dict(zip(reversed(values), reversed(tasks)))
+            first.pop(None, None)
+            shared: Dict[Any, List[Task]] = {}
+            if len(first) + values.count(None) < len(values):
+                for value, task in zip(values, tasks):
+                    if value is not None:
+                        shared.setdefault(value, []).append(task)
+                shared = {value: group for value, group in shared.items() if len(group) > 1}
+            self._first[key] = first
+            self._all[key] = shared
+        # Filter groups hold the id() of each task; they are built on first use
+        self._groups: Optional[Dict[str, Dict[Any, Set[int]]]] = None
+        self._by_id: Dict[int, Task] = {}
+        self._order: Dict[int, int] = {}
+        self._next = 0
+        # Per title, the lowest suffix that may be free: every smaller one is taken
+        self._suffixes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._first["uuid"])
+
+    def get(self, key: str, value: Any) -> Optional[Task]:
+        """
+        Get the first task, in list order, with a value.
+
+        Args:
+            key: One of KEYS
+            value: The value to look up
+
+        Returns:
+            The task, or None if no task has the value
+        """
+        return self._first[key].get(value)
+
+    def find(self, key: str, value: Any) -> List[Task]:
+        """Get every task with a value, in list order."""
+        shared = self._all[key].get(value)
+        if shared is not None:
+            return list(shared)
+        task = self._first[key].get(value)
+        return [] if task is None else [task]
+
+    def select(self, **criteria) -> List[Task]:
+        """
+        Get the tasks matching all criteria, like FileHandler.find_tasks().
+
+        Each criterion is answered by the sets of tasks holding its values,
+        and the sets are intersected; tasks are only visited to put the
+        matches in order.
+
+        Args:
+            **criteria: Field/value pairs, e.g. status="pending". A list,
+                tuple, set or range matches any of its values, e.g.
+                priority=range(4, 6). Fields are KEYS and FILTERS.
+
+        Returns:
+            The matching tasks, in list order
+
+        Raises:
+            ValueError: If a field is not indexed
+        """
+        unknown = set(criteria) - set(self.KEYS) - set(self.FILTERS)
+        if unknown:
+            raise ValueError(f"Cannot query tasks by: {', '.join(sorted(unknown))}")
+        if self._groups is None:
+            self._build_groups()
+
+        if not criteria:
+            return list(self._tasks)
+        # The sets of tasks each criterion accepts, one per value
+        accepted = []
+        for field, value in criteria.items():
+            values = value if isinstance(value, MULTI_VALUE_TYPES) else (value,)
+            if field in self.FILTERS:
+                groups = self._groups[field]
+                accepted.append([groups[v] for v in values if v in groups])
+            else:
+                accepted.append([{id(task) for task in self.find(field, v)} for v in values])
+        # Start from the most selective criterion, so each intersection only
+        # visits the tasks still matching
+        accepted.sort(key=lambda sets: sum(map(len, sets)))
+        matches = set().union(*accepted[0])
+        for sets in accepted[1:]:
+            if not matches:
+                return []
+            matches = set().union(*(matches & group for group in sets))
+        if not matches:
+            return []
+
+        if len(matches) * 8 > len(self._tasks):
+            # Many matches: one pass over the list beats sorting them
+            return [task for task in self._tasks if id(task) in matches]
+        by_id = self._by_id
+        return [by_id[task_id] for task_id in sorted(matches, key=self._order.__getitem__)]
+
+    def unique_title(self, title: str, task: Optional[Task] = None) -> str:
+        """
+        Get a title that no other task has.
+
+        A taken title gets the smallest free numbered suffix, e.g. "Daily
+        standup (3)". Titles that already carry a suffix count as taken
+        like any other. The registry remembers per title the suffix to try
+        next, so allocating is amortized constant time however many copies
+        of a title exist; deleting or renaming a suffixed task frees its
+        suffix for reuse.
+
+        Args:
+            title: The wanted title
+            task: The task being renamed, if any; its own title is not taken
+
+        Returns:
+            The title, or the title with a suffix
+        """
+        first, shared = self._first["title"], self._all["title"]
+
+        def taken(candidate: str) -> bool:
+            holder = first.get(candidate)
+            return holder is not None and (holder is not task or candidate in shared)
+
+        if not taken(title):
+            return title
+        suffix = self._suffixes.get(title, 1)
+        own = SUFFIXED_TITLE.fullmatch(task.title) if task is not None else None
+        if own is not None and own.group(1) == title:
+            # The task's own suffix is free for it even where it is below the hint
+            suffix = min(suffix, int(own.group(2)))
+        while taken(f"{title} ({suffix})"):
+            suffix += 1
+        # Not past the new suffix: the caller may still fail to use it
+        self._suffixes[title] = suffix
+        return f"{title} ({suffix})"
+
+    def ordinal(self, task: Task) -> int:
+        """
+        Get a number that orders a task by its place in the list.
+
+        Numbers grow along the list and are not reused, so they stay valid
+        for the tasks that remain when others are added or removed.
+        """
+        if self._groups is None:
+            self._build_groups()
+        return self._order[id(task)]
+
+    def values(self, task: Task) -> Dict[str, Any]:
+        """Get a task's indexed values, to pass to reindex() after changing it."""
+        return {field: getattr(task, field) for field in self.KEYS + self.FILTERS}
+
+    def add(self, task: Task) -> None:
+        """Index a task appended to the end of the list."""
+        for key in self.KEYS:
+            self._insert(key, getattr(task, key), task)
+        if self._groups is not None:
+            task_id = id(task)
+            self._by_id[task_id] = task
+            self._order[task_id] = self._next
+            self._next += 1
+            for field in self.FILTERS:
+                self._groups[field].setdefault(getattr(task, field), set()).add(task_id)
+
+    def remove(self, task: Task) -> None:
+        """Stop indexing a task removed from the list."""
+        for key in self.KEYS:
+            self._delete(key, getattr(task, key), task)
+        if self._groups is not None:
+            task_id = id(task)
+            del self._by_id[task_id], self._order[task_id]
+            for field in self.FILTERS:
+                self._leave_group(field, getattr(task, field), task_id)
+
+    def reindex(self, task: Task, old_values: Dict[str, Any]) -> None:
+        """
+        Move a task changed in place to its new values.
+
+        A task whose key changed is indexed as if it were at the end of the
+        list among the tasks sharing its new key. Filters keep its position.
+
+        Args:
+            task: The task, already changed
+            old_values: The task's values() before the change
+        """
+        for key in self.KEYS:
+            old, new = old_values[key], getattr(task, key)
+            if old != new:
+                self._delete(key, old, task)
+                self._insert(key, new, task)
+        if self._groups is not None:
+            task_id = id(task)
+            for field in self.FILTERS:
+                old, new = old_values[field], getattr(task, field)
+                if old != new:
+                    self._leave_group(field, old, task_id)
+                    self._groups[field].setdefault(new, set()).add(task_id)
+
+    def _build_groups(self) -> None:
+        """Group the tasks by each filter field."""
+        tasks = self._tasks
+        ids = list(map(id, tasks))
+        self._by_id = dict(zip(ids, tasks))
+        self._order = dict(zip(ids, count()))
+        self._next = len(ids)
+        self._groups = {}
+        for field in self.FILTERS:
+            groups: Dict[Any, Set[int]] = {}
+            for task_id, value in zip(ids, map(attrgetter(field), tasks)):
+                groups.setdefault(value, set()).add(task_id)
+            self._groups[field] = groups
+
+    def _leave_group(self, field: str, value: Any, task_id: int) -> None:
+        """Remove a task from the group of a filter value, dropping the group once empty."""
+        group = self._groups[field][value]
+        group.discard(task_id)
+        if not group:
+            del self._groups[field][value]
+
+    def _insert(self, key: str, value: Any, task: Task) -> None:
+        """Add a task after the tasks already holding a value."""
+        if value is None:
+            return
+        first = self._first[key]
+        current = first.setdefault(value, task)
+        if current is not task:
+            self._all[key].setdefault(value, [current]).append(task)
+
+    def _delete(self, key: str, value: Any, task: Task) -> None:
+        """Remove a task from the tasks holding a value."""
+        if value is None:
+            return
+        if key == "title":
+            self._free_suffix(value)
+        shared = self._all[key].get(value)
+        if shared is None:
+            if self._first[key].get(value) is task:
+                del self._first[key][value]
+            return
+        shared[:] = [t for t in shared if t is not task]
+        self._first[key][value] = shared[0]
+        if len(shared) == 1:
+            del self._all[key][value]
+
+    def _free_suffix(self, title: str) -> None:
+        """Let the suffix of a title that is going away be allocated again."""
+        match = SUFFIXED_TITLE.fullmatch(title)
+        if match is not None:
+            base, suffix = match.group(1), int(match.group(2))
+            if suffix < self._suffixes.get(base, 1):
+                self._suffixes[base] = suffix
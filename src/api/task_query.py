@@ -0,0 +1,356 @@
+"""
+Task queries: filtering, sorting and cursor pagination.
+
+Queries are written in a small text DSL of space-separated terms, e.g.
+
+    status:pending priority>=4 due<7d sort:-priority,due limit:50
+
+- ``field:value`` matches a value; ``field:a,b`` matches any of several.
+  ``=`` is the same as ``:``; ``!=`` excludes values.
+- ``field>value``, ``>=``, ``<`` and ``<=`` compare; tasks without a value
+  (e.g. no due date) never match a comparison.
+- ``due`` and ``created`` take ISO dates, ``none``, or offsets from now such
+  as ``7d``, ``-12h`` or ``2w``. Dates with a UTC offset, in the query or in
+  tasks, are compared as local times. ``priority`` takes 1-5 or a name like "high".
+- ``sort:`` lists fields to sort by, ``-`` for descending; tasks without a
+  value come last. ``limit:`` sets the page size.
+- Any other word must appear in the title or description (case-insensitive).
+  Values with spaces are quoted: ``title:"Daily standup"``.
+
+parse_query() compiles the text into a TaskQuery. Conditions that a TaskIndex
+can answer (equality on indexed fields and priority ranges) become index
+criteria; the others become a predicate checked per candidate task. Pages end
+with a cursor holding the sort values of their last task, so the next page
+continues after it even when tasks were added or removed in between.
+"""
+
+import base64
+import heapq
+import json
+import re
+import shlex
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from operator import attrgetter, ge, gt, le, lt
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..models.task import Task
+from .task_index import TaskIndex
+
+# Query field names and the Task fields they stand for
+FIELDS = {
+    "id": "id",
+    "uuid": "uuid",
+    "title": "title",
+    "description": "description",
+    "status": "status",
+    "priority": "priority",
+    "source": "source",
+    "model": "model",
+    "due": "due_date",
+    "due_date": "due_date",
+    "created": "created_date",
+    "created_date": "created_date",
+}
+
+DATE_FIELDS = ("due_date", "created_date")
+
+# Longest operators first, so ">=" is not read as ">"
+OPERATORS = ("!=", ">=", "<=", ":", "=", ">", "<")
+
+COMPARISONS = {">": gt, ">=": ge, "<": lt, "<=": le}
+
+PRIORITIES = range(1, 6)
+
+_TERM = re.compile(r"([a-z_]+)(" + "|".join(map(re.escape, OPERATORS)) + r")(.*)", re.DOTALL)
+
+_OFFSET = re.compile(r"([+-]?\d+)([hdw])")
+
+_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+
+def _naive(value: Any) -> Any:
+    """Convert an aware datetime to naive local time, so it compares with naive ones."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+def _field_getter(name: str) -> Callable[[Task], Any]:
+    """Build a function reading a Task field, giving dates as naive local times."""
+    get = attrgetter(name)
+    if name not in DATE_FIELDS:
+        return get
+    return lambda task: _naive(get(task))
+
+def _parse_value(name: str, text: str, now: datetime) -> Any:
+    """Convert a query value to the type of a Task field."""
+    if text.lower() == "none":
+        return None
+    if name == "priority":
+        if text.lower() in Task.PRIORITY_MAP:
+            return Task.PRIORITY_MAP[text.lower()]
+        if text.isdigit() and int(text) in PRIORITIES:
+            return int(text)
+        raise ValueError(f"Invalid priority in query: {text}")
+    if name in DATE_FIELDS:
+        offset = _OFFSET.fullmatch(text)
+        if offset is not None:
+            return now + timedelta(**{_UNITS[offset.group(2)]: int(offset.group(1))})
+        try:
+            return _naive(datetime.fromisoformat(text))
+        except ValueError:
+            raise ValueError(f"Invalid date in query: {text}") from None
+    return text
+
+class _Descending:
+    """Sort key wrapper that orders values from largest to smallest."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: "_Descending") -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+@dataclass
+class Condition:
+    """One filter of a query: a Task field compared with one or more values."""
+
+    name: str
+    op: str
+    values: Tuple[Any, ...]
+
+    def index_values(self) -> Optional[set]:
+        """Get the values an index lookup would match, or None if the index cannot answer this."""
+        # Indexes leave out tasks without an id, uuid or title, and SQL never
+        # matches NULL, so "none" is checked per task
+        if self.name not in TaskIndex.KEYS + TaskIndex.FILTERS or None in self.values:
+            return None
+        if self.op in (":", "="):
+            return set(self.values)
+        if self.name == "priority":
+            # Priorities take five values, so ranges and exclusions are sets of them
+            if self.op == "!=":
+                return set(PRIORITIES) - set(self.values)
+            compare = COMPARISONS[self.op]
+            return {p for p in PRIORITIES if compare(p, self.values[0])}
+        return None
+
+    def predicate(self) -> Callable[[Task], bool]:
+        """Build the check of this condition against a single task."""
+        get = _field_getter(self.name)
+        if self.op in (":", "="):
+            if len(self.values) == 1:
+                expected = self.values[0]
+                return lambda task: get(task) == expected
+            return lambda task: get(task) in self.values
+        if self.op == "!=":
+            return lambda task: get(task) not in self.values
+        compare, bound = COMPARISONS[self.op], self.values[0]
+        if bound is None:
+            raise ValueError(f"Cannot compare {self.name} with none")
+
+        def check(task: Task) -> bool:
+            value = get(task)
+            return value is not None and compare(value, bound)
+        return check
+
+@dataclass
+class TaskQuery:
+    """A compiled query: conditions, free-text words, sort order and page size."""
+
+    conditions: List[Condition] = field(default_factory=list)
+    words: List[str] = field(default_factory=list)
+    sort: List[Tuple[str, bool]] = field(default_factory=list)
+    limit: Optional[int] = None
+
+    def index_criteria(self) -> Dict[str, set]:
+        """Get the criteria for TaskIndex.select() from the conditions it can answer."""
+        criteria: Dict[str, set] = {}
+        for condition in self.conditions:
+            values = condition.index_values()
+            if values is not None:
+                criteria[condition.name] = criteria[condition.name] & values if condition.name in criteria else values
+        return criteria
+
+    def predicate(self) -> Optional[Callable[[Task], bool]]:
+        """Build the check of the conditions an index cannot answer, or None if there are none."""
+        checks = [c.predicate() for c in self.conditions if c.index_values() is None]
+        for word in self.words:
+            checks.append(lambda task, word=word: word in task.title.lower()
+                          or word in (task.description or "").lower())
+        if not checks:
+            return None
+        if len(checks) == 1:
+            return checks[0]
+        return lambda task: all(check(task) for check in checks)
+
+    def sort_key(self, index: TaskIndex) -> Callable[[Task], tuple]:
+        """
+        Build the key that orders tasks for this query.
+
+        The task's place in the list breaks ties, so the order is total and
+        a cursor can point between any two tasks.
+        """
+        ordinal = index.ordinal
+        if len(self.sort) == 1:
+            # The common case, without the loop over sort fields
+            get, descending = _field_getter(self.sort[0][0]), self.sort[0][1]
+            wrap = _Descending if descending else None
+
+            def key(task: Task) -> tuple:
+                value = get(task)
+                return (value is None, wrap(value) if wrap else value, ordinal(task))
+            return key
+
+        getters = [_field_getter(name) for name, _ in self.sort]
+
+        def key(task: Task) -> tuple:
+            return self._key([get(task) for get in getters], ordinal(task))
+        return key
+
+    def _key(self, values: Sequence[Any], ordinal: int) -> tuple:
+        """Combine sort values and a list position into a sort key."""
+        parts = []
+        for value, (_, descending) in zip(values, self.sort):
+            # Tasks without a value come last in either direction
+            parts += (value is None, _Descending(value) if descending else value)
+        parts.append(ordinal)
+        return tuple(parts)
+
+    def page(self, tasks: List[Task], index: TaskIndex, cursor: Optional[str] = None,
+             limit: Optional[int] = None) -> Tuple[List[Task], Optional[str]]:
+        """
+        Get one page of the tasks matching the query.
+
+        Args:
+            tasks: Candidate tasks, in list order, e.g. as selected by
+                index_criteria(); the predicate is checked here
+            index: The index of the task list the candidates come from
+            cursor: Cursor returned with the previous page, if any
+            limit: Page size; defaults to the query's limit, or all tasks
+
+        Returns:
+            The tasks of the page, in query order, and the cursor of the
+            next page, or None if this is the last page
+
+        Raises:
+            ValueError: If the cursor is invalid, or a sort field holds
+                values that cannot be compared, e.g. numbers and strings
+        """
+        limit = limit if limit is not None else self.limit
+        predicate = self.predicate()
+        anchor = self._decode_cursor(cursor, index) if cursor else None
+
+        if not self.sort:
+            # Candidates are already in order: start after the anchor's place
+            start = bisect_right(tasks, anchor[-1], key=index.ordinal) if anchor else 0
+            matches = filter(predicate, tasks[start:]) if predicate else iter(tasks[start:])
+            found = [task for _, task in zip(range(limit + 1), matches)] if limit is not None else list(matches)
+        else:
+            key = self.sort_key(index)
+            matches = filter(predicate, tasks) if predicate else tasks
+            if anchor is not None:
+                matches = (task for task in matches if key(task) > anchor)
+            try:
+                found = heapq.nsmallest(limit + 1, matches, key=key) if limit is not None else sorted(matches, key=key)
+            except TypeError:
+                fields = ", ".join(name for name, _ in self.sort)
+                raise ValueError(f"Cannot sort tasks by {fields}: values of different types") from None
+
+        if limit is None or len(found) <= limit:
+            return found, None
+        found = found[:limit]
+        return found, self._encode_cursor(found[-1], index)
+
+    def _sort_spec(self) -> List[str]:
+        """The sort order in the form it takes in a cursor."""
+        return [("-" if descending else "") + name for name, descending in self.sort]
+
+    def _encode_cursor(self, task: Task, index: TaskIndex) -> str:
+        """Encode the position after a task as an opaque cursor."""
+        values = [_field_getter(name)(task) for name, _ in self.sort]
+        values = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        state = {"sort": self._sort_spec(), "values": values, "uuid": task.uuid, "ordinal": index.ordinal(task)}
+        return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+    def _decode_cursor(self, cursor: str, index: TaskIndex) -> tuple:
+        """
+        Decode a cursor into the sort key after which the page starts.
+
+        If the cursor's task still exists its current place in the list is
+        used; otherwise the place it had, which is exact while the tasks are
+        unchanged and approximate after tasks before it were removed.
+
+        Raises:
+            ValueError: If the cursor is malformed or belongs to another sort order
+        """
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            values, uuid, ordinal = state["values"], state["uuid"], state["ordinal"]
+            sort = state["sort"]
+        except (ValueError, TypeError, KeyError):
+            raise ValueError("Invalid query cursor") from None
+        if sort != self._sort_spec() or len(values) != len(self.sort):
+            raise ValueError("Query cursor belongs to a different sort order")
+        values = [datetime.fromisoformat(value) if name in DATE_FIELDS and value is not None else value
+                  for value, (name, _) in zip(values, self.sort)]
+        task = index.get("uuid", uuid)
+        if task is not None:
+            ordinal = index.ordinal(task)
+        return self._key(values, ordinal)
+
+def parse_query(text: str, now: Optional[datetime] = None) -> TaskQuery:
+    """
+    Compile a query written in the query DSL.
+
+    Args:
+        text: The query, e.g. "status:pending priority>=4 sort:-priority limit:50"
+        now: Reference time of relative dates such as "7d". Defaults to the current time.
+
+    Returns:
+        The compiled query
+
+    Raises:
+        ValueError: If the query is malformed
+    """
+    now = _naive(now or datetime.now())
+    query = TaskQuery()
+    try:
+        terms = shlex.split(text)
+    except ValueError as e:
+        raise ValueError(f"Invalid query: {e}") from None
+
+    for term in terms:
+        match = _TERM.fullmatch(term)
+        if match is None or (match.group(1) not in FIELDS and match.group(1) not in ("sort", "limit")):
+            # Not a known field: a word to search for
+            query.words.append(term.lower())
+            continue
+        key, op, value = match.groups()
+        if key == "sort" and op == ":":
+            for item in filter(None, value.split(",")):
+                name = item.lstrip("-")
+                if name not in FIELDS:
+                    raise ValueError(f"Cannot sort tasks by: {name}")
+                query.sort.append((FIELDS[name], item.startswith("-")))
+        elif key == "limit" and op == ":":
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(f"Invalid limit in query: {value}")
+            query.limit = int(value)
+        elif key in FIELDS:
+            name = FIELDS[key]
+            parts = value.split(",") if op in (":", "=", "!=") else [value]
+            values = tuple(_parse_value(name, part, now) for part in parts)
+            condition = Condition(name, op, values)
+            # Comparisons with none are rejected now rather than when run
+            if op in COMPARISONS:
+                condition.predicate()
+            query.conditions.append(condition)
+        else:
+            raise ValueError(f"Invalid query term: {term}")
+    return query
@@ -17,6 +17,8 @@ from rich.panel import Panel
 from rich.status import Status
 
 from .api import TaskAPI, AIAPI
+from .api.task_query import parse_query
+from .utils.compression import compress, detect_compression
 
 console = Console()
 
@@ -32,12 +34,32 @@ class TaskManager:
     """Main application class."""
     
     def __init__(self, data_file=None):
-        self.task_api = TaskAPI(data_file=data_file)
+        self.task_api = TaskAPI(data_file=data_file, snapshot=True)
         self.ai_api = None
         self.ai_enabled = False
         self.default_data_dir = "data"
         self.current_file = data_file or "data/tasks.json"
     
+    def view_tasks(self, page_size=50):
+        """Show the tasks matching a query, one page at a time."""
+        query = Prompt.ask(
+            "Filter (e.g. status:pending priority>=4 due<7d sort:-priority,due; Enter for all)",
+            default=""
+        )
+        try:
+            query = parse_query(query)
+        except ValueError as e:
+            console.print(f"[red]Error: {str(e)}[/red]")
+            return
+        
+        cursor = None
+        while True:
+            page = self.task_api.query(query, cursor=cursor, limit=query.limit or page_size)
+            self.display_tasks(page["tasks"])
+            cursor = page["next_cursor"]
+            if cursor is None or Prompt.ask("Show more?", choices=["y", "n"], default="y") != "y":
+                return
+    
     def show_priority_guide(self):
         """Display the priority level guide."""
         console.print("\n[bold]Priority Levels Guide:[/bold]")
@@ -189,6 +211,7 @@ class TaskManager:
         """Handle AI task suggestions with streaming output."""
         context = Prompt.ask("\nDescribe your current situation")
         
+        suggestions = []
         with Status("[bold blue]Generating task suggestions...", spinner="dots") as status:
             try:
                 current_suggestion = ""
@@ -198,17 +221,49 @@ class TaskManager:
                         status.update(f"[bold blue]Generating suggestions...\n\n{current_suggestion}")
                     elif result['status'] == 'complete':
                         console.print("\n[bold green]Generated Suggestions:[/bold green]")
-                        for task in result['tasks']:
+                        for i, task in enumerate(result['tasks'], 1):
                             console.print(Panel(
                                 f"[cyan]Title:[/cyan] {task['title']}\n"
                                 f"[yellow]Priority:[/yellow] {task['priority']}\n"
                                 f"[green]Est. Time:[/green] {task['estimated_time']}\n"
-                                f"[white]{task['description']}[/white]"
+                                f"[white]{task['description']}[/white]",
+                                title=str(i)
                             ))
+                        suggestions = result['tasks']
                     else:
                         console.print(f"\n[red]Error: {result.get('message', 'Unknown error')}[/red]")
             except Exception as e:
                 console.print(f"\n[red]Failed to generate suggestions: {str(e)}[/red]")
+        
+        if suggestions:
+            self.accept_suggestions(suggestions)
+    
+    def accept_suggestions(self, suggestions):
+        """Ask which AI suggestions to keep and create them together with a single save."""
+        selection = Prompt.ask("\nAdd suggestions as tasks (comma-separated numbers, 'all', or Enter for none)",
+                               default="")
+        if not selection.strip():
+            return
+        if selection.strip().lower() == "all":
+            chosen = suggestions
+        else:
+            try:
+                chosen = [suggestions[int(idx.strip()) - 1] for idx in selection.split(",")
+                          if 0 < int(idx.strip()) <= len(suggestions)]
+            except ValueError:
+                console.print("[yellow]Invalid selection format. No tasks added.[/yellow]")
+                return
+        
+        results = self.task_api.create_many([
+            {"title": task.get('title', ''), "description": task.get('description', ''),
+             "priority": task.get('priority', 3), "source": "ai"}
+            for task in chosen
+        ])
+        for task, result in zip(chosen, results):
+            if result["error"]:
+                console.print(f"[red]Could not add '{task.get('title', '')}': {result['error']}[/red]")
+            else:
+                console.print(f"[green]Created task: {result['task']['title']}[/green]")
     
     def handle_task_analysis(self):
         """Handle task pattern analysis with streaming output."""
@@ -337,8 +392,8 @@ class TaskManager:
         # Ask for the new file name
         file_name = Prompt.ask("\nEnter new file name (without extension)")
         
-        # Ensure it has .json extension
-        if not file_name.endswith('.json'):
+        # Ensure it has .json extension (.json.gz and .json.zst are kept compressed)
+        if not file_name.endswith(('.json', '.json.gz', '.json.zst')):
             file_name += '.json'
         
         # Create full path in the data directory
@@ -363,8 +418,10 @@ class TaskManager:
         
         # Write the empty task list to the file
         try:
-            with open(file_path, 'w') as f:
-                json.dump(empty_tasks, f, indent=2)
+            # Compressed first, so a missing codec leaves no empty file behind
+            data = compress(json.dumps(empty_tasks, indent=2).encode("utf-8"), detect_compression(file_path))
+            with open(file_path, 'wb') as f:
+                f.write(data)
             
             console.print(f"[green]Created new task file: {file_name}[/green]")
             
@@ -395,7 +452,7 @@ class TaskManager:
             while True:
                 # Show the current file in the header with task count
                 current_file_name = Path(self.current_file).name
-                task_count = len(self.task_api.list_tasks())
+                task_count = self.task_api.count_tasks()
                 console.print(f"\n[bold cyan]Thoughtful Task Manager[/bold cyan] - [yellow]File: {current_file_name} ({task_count} tasks)[/yellow]")
                 console.print("1. View Tasks")
                 console.print("2. Add Task")
@@ -417,8 +474,7 @@ class TaskManager:
                 choice = Prompt.ask("Select an option", choices=choices)
                 
                 if choice == "1":
-                    tasks = self.task_api.list_tasks()
-                    self.display_tasks(tasks)
+                    self.view_tasks()
                 
                 elif choice == "2":
                     self.show_priority_guide()
@@ -0,0 +1,161 @@
+"""
+Lazy task views for the Thoughtful Task Manager.
+
+A LazyTask wraps a task record exactly as decoded from a tasks file and
+computes each field the first time it is read: dates are parsed, titles
+validated and priorities normalized on access rather than on load. Code that
+only looks at a few fields, such as filtering by status, never pays for the
+rest. Assigning to any field first turns the view into a real Task.
+"""
+
+import sys
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .task import Task
+
+FIELD_NAMES = tuple(Task.__dataclass_fields__)
+
+def _title(record: Dict[str, Any]) -> str:
+    """Get and validate the title, defaulting it like Task.from_dicts."""
+    title = record["title"] if "title" in record else f"Task {record.get('id', 'Unknown')}"
+    if title:
+        Task.validate_title(title)
+    return title
+
+def _uuid(record: Dict[str, Any]) -> str:
+    """Get the uuid, generating one for records without."""
+    value = record.get("uuid")
+    return str(uuid.uuid4()) if value is None else value
+
+def _dependencies(record: Dict[str, Any]) -> List[str]:
+    """Get the dependencies, as a new empty list when the record has none."""
+    value = record.get("dependencies")
+    return [] if value is None else value
+
+def _interned(name: str, default: str) -> Callable[[Dict[str, Any]], Any]:
+    """Build the getter of a field whose string values are interned."""
+    def compute(record: Dict[str, Any]) -> Any:
+        value = record.get(name, default)
+        return sys.intern(value) if type(value) is str else value
+    return compute
+
+def _priority(record: Dict[str, Any]) -> int:
+    """Get the priority as an int between 1 and 5."""
+    value = record.get("priority", 1)
+    if type(value) is not int or not 1 <= value <= 5:
+        value = Task.normalize_priority(value)
+    return value
+
+def _created_date(record: Dict[str, Any]) -> datetime:
+    """Parse the creation date, accepting "created_at" and defaulting to now."""
+    value = record["created_at"] if "created_at" in record else record.get("created_date")
+    if type(value) is str:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return datetime.now()
+    return datetime.now() if value is None else value
+
+def _due_date(record: Dict[str, Any]) -> Optional[datetime]:
+    """Parse the due date; unparseable dates become None."""
+    value = record.get("due_date")
+    if value and type(value) is str:
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value
+
+# How each field is computed from a raw record, mirroring Task.from_dicts
+_COMPUTE: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+    "title": _title,
+    "description": lambda record: record.get("description", "No description provided"),
+    "id": lambda record: record.get("id"),
+    "uuid": _uuid,
+    "dependencies": _dependencies,
+    "status": _interned("status", "pending"),
+    "priority": _priority,
+    "created_date": _created_date,
+    "due_date": _due_date,
+    "model": _interned("model", "unknown"),
+    "source": _interned("source", "human"),
+}
+
+def _field(name: str) -> property:
+    """Build the property serving one Task field."""
+    compute = _COMPUTE[name]
+
+    def getter(self: "LazyTask") -> Any:
+        # Values are computed once per view and cached
+        if self._task is not None:
+            return getattr(self._task, name)
+        values = self._values
+        if name not in values:
+            values[name] = compute(self._record)
+        return values[name]
+
+    def setter(self: "LazyTask", value: Any) -> None:
+        setattr(self.materialize(), name, value)
+
+    return property(getter, setter, doc=f"The task's {name}, computed on first access.")
+
+class LazyTask:
+    """Read-only view of a raw task record that becomes a Task when changed."""
+
+    __slots__ = ("_record", "_values", "_task")
+
+    def __init__(self, record: Dict[str, Any]):
+        """
+        Wrap a decoded task record.
+
+        Args:
+            record: The record, which is read but never modified
+        """
+        self._record = record
+        self._values: Dict[str, Any] = {}
+        self._task: Optional[Task] = None
+
+    @classmethod
+    def from_dicts(cls, records: Iterable[Dict[str, Any]]) -> List["LazyTask"]:
+        """Wrap many decoded records without computing any field."""
+        return list(map(cls, records))
+
+    @property
+    def is_materialized(self) -> bool:
+        """Whether the view has been turned into a real Task."""
+        return self._task is not None
+
+    def materialize(self) -> Task:
+        """
+        Get the real Task behind the view, building it on first use.
+
+        Fields already read keep their values, so a generated uuid or a
+        defaulted creation date does not change.
+        """
+        if self._task is None:
+            self._task = Task(**{name: getattr(self, name) for name in FIELD_NAMES})
+            self._record = self._values = None
+        return self._task
+
+    def to_dict(self) -> dict:
+        """Convert task to dictionary format."""
+        if self._task is not None:
+            return self._task.to_dict()
+        return Task.to_dict(self)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (Task, LazyTask)):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in FIELD_NAMES)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        if self._task is not None:
+            return repr(self._task)
+        return f"LazyTask({self._record!r})"
+
+for _name in FIELD_NAMES:
+    setattr(LazyTask, _name, _field(_name))
@@ -4,10 +4,11 @@ Task model for the Thoughtful Task Manager.
 
 from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
+import sys
 import uuid
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a single task in the system."""
     title: str
@@ -35,35 +36,57 @@ class Task:
         """Initialize default values and validate after dataclass initialization."""
         if self.dependencies is None:
             self.dependencies = []
+        # Status, model and source take a few values repeated across every
+        # task; interning makes all tasks share one string per value
+        if type(self.status) is str:
+            self.status = sys.intern(self.status)
+        if type(self.model) is str:
+            self.model = sys.intern(self.model)
+        if type(self.source) is str:
+            self.source = sys.intern(self.source)
         if self.created_date is None:
             self.created_date = datetime.now()
         if self.uuid is None:
             self.uuid = str(uuid.uuid4())
         
-        # Title validation
         if self.title:
-            # Check if title is purely numeric
-            if self.title.isdigit():
-                raise ValueError("Task title cannot be purely numeric")
-            
-            # Check minimum length
-            if len(self.title) < 5:
-                raise ValueError("Task title must be at least 5 characters long")
+            self.validate_title(self.title)
+        if type(self.priority) is not int or not 1 <= self.priority <= 5:
+            self.priority = self.normalize_priority(self.priority)
+    
+    @staticmethod
+    def validate_title(title: str) -> None:
+        """
+        Check a task title.
+        
+        Raises:
+            ValueError: If the title is purely numeric or shorter than 5 characters
+        """
+        # Check if title is purely numeric
+        if title.isdigit():
+            raise ValueError("Task title cannot be purely numeric")
         
-        # Validate priority
-        if isinstance(self.priority, str):
+        # Check minimum length
+        if len(title) < 5:
+            raise ValueError("Task title must be at least 5 characters long")
+    
+    @classmethod
+    def normalize_priority(cls, priority: Any) -> int:
+        """Convert a priority name or number to an int between 1 and 5."""
+        if isinstance(priority, str):
             # Try to convert string priority to int
-            if self.priority.lower() in self.PRIORITY_MAP:
-                self.priority = self.PRIORITY_MAP[self.priority.lower()]
+            if priority.lower() in cls.PRIORITY_MAP:
+                priority = cls.PRIORITY_MAP[priority.lower()]
             else:
                 try:
-                    self.priority = int(self.priority)
+                    priority = int(priority)
                 except ValueError:
-                    self.priority = 3  # Default to medium priority
+                    priority = 3  # Default to medium priority
         
         # Clamp priority to valid range (1-5)
-        if not isinstance(self.priority, int) or self.priority < 1 or self.priority > 5:
-            self.priority = max(1, min(5, self.priority if isinstance(self.priority, int) else 3))
+        if not isinstance(priority, int) or priority < 1 or priority > 5:
+            priority = max(1, min(5, priority if isinstance(priority, int) else 3))
+        return priority
     
     def to_dict(self) -> dict:
         """Convert task to dictionary format."""
@@ -72,7 +95,7 @@ class Task:
             "uuid": self.uuid,
             "title": self.title,
             "description": self.description,
-            "dependencies": self.dependencies,
+            "dependencies": list(self.dependencies) if self.dependencies else [],
             "status": self.status,
             "priority": self.priority,
             "created_date": self.created_date.isoformat(),
@@ -84,52 +107,87 @@ class Task:
     @classmethod
     def from_dict(cls, data: dict) -> 'Task':
         """Create a Task instance from dictionary data."""
-        # Create a copy to avoid modifying the original
-        task_data = data.copy()
-        
-        # Ensure required fields exist
-        if "title" not in task_data:
-            task_data["title"] = f"Task {task_data.get('id', 'Unknown')}"
-        
-        if "description" not in task_data:
-            task_data["description"] = "No description provided"
-        
-        # Map field names
-        if "created_at" in task_data:
-            task_data["created_date"] = task_data.pop("created_at")
-        if "updated_at" in task_data:
-            task_data.pop("updated_at")  # Remove as we don't have this field
-        
-        # Handle non-standard fields by removing them
-        standard_fields = {"id", "uuid", "title", "description", "dependencies", "status", 
-                          "priority", "created_date", "due_date", "model", "source"}
-        
-        # Store any extra fields in a safe way
-        extra_fields = {k: v for k, v in task_data.items() 
-                       if k not in standard_fields and k not in ["tags", "notes"]}
-        
-        # Remove non-standard fields
-        for field in list(task_data.keys()):
-            if field not in standard_fields:
-                task_data.pop(field)
+        return cls.from_dicts((data,))[0]
+    
+    @classmethod
+    def from_dicts(cls, records: Iterable[dict]) -> List['Task']:
+        """
+        Create Task instances from many dictionaries at once.
         
-        # Convert date strings to datetime objects
-        if "created_date" in task_data and isinstance(task_data["created_date"], str):
-            try:
-                task_data["created_date"] = datetime.fromisoformat(task_data["created_date"])
-            except ValueError:
-                # Handle different date formats
-                task_data["created_date"] = datetime.now()
+        Records are read without being copied or modified. Missing titles and
+        descriptions get defaults, "created_at" is accepted for created_date,
+        and fields the Task does not have (such as "updated_at") are ignored.
+        Dates that fail to parse fall back to now (created) or None (due).
         
-        if "due_date" in task_data and task_data["due_date"] and isinstance(task_data["due_date"], str):
-            try:
-                task_data["due_date"] = datetime.fromisoformat(task_data["due_date"])
-            except ValueError:
-                # If we can't parse the date, set it to None
-                task_data["due_date"] = None
+        Args:
+            records: Task dictionaries, e.g. as decoded from a tasks file
+            
+        Returns:
+            The tasks, in the order of the records
+        """
+        parse_date = datetime.fromisoformat
+        # Defaults looked up once per batch rather than once per record
+        status, priority, model, source = (_FIELD_DEFAULTS[name] for name in ("status", "priority", "model", "source"))
+        # Due dates repeat across tasks; parsing each distinct string once
+        # also makes equal due dates share one datetime object
+        due_dates: Dict[str, Optional[datetime]] = {}
+        tasks = []
+        append = tasks.append
         
-        # Ensure we have valid fields for Task initialization
-        valid_fields = [f.name for f in fields(cls)]
-        task_data = {k: v for k, v in task_data.items() if k in valid_fields}
+        for record in records:
+            get = record.get
+            title = record["title"] if "title" in record else f"Task {get('id', 'Unknown')}"
+            
+            created = record["created_at"] if "created_at" in record else get("created_date")
+            if type(created) is str:
+                try:
+                    created = parse_date(created)
+                except ValueError:
+                    created = datetime.now()
+            
+            due = get("due_date")
+            if due and type(due) is str:
+                parsed = due_dates.get(due, due)
+                if parsed is due:
+                    try:
+                        parsed = parse_date(due)
+                    except ValueError:
+                        parsed = None
+                    due_dates[due] = parsed
+                due = parsed
+            
+            append(cls(
+                title=title,
+                description=get("description", "No description provided"),
+                id=get("id"),
+                uuid=get("uuid"),
+                dependencies=get("dependencies"),
+                status=get("status", status),
+                priority=get("priority", priority),
+                created_date=created,
+                due_date=due,
+                model=get("model", model),
+                source=get("source", source),
+            ))
+        return tasks
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, list]) -> List['Task']:
+        """
+        Rebuild tasks from one list of values per field.
         
-        return cls(**task_data)
+        Unlike from_dict, no parsing, defaulting or validation is done, so the
+        values must come from existing Task objects (e.g. a binary snapshot).
+        """
+        count = len(columns["title"])
+        tasks = list(map(object.__new__, [cls] * count))
+        # Filling one field at a time keeps the inner loop in C
+        for f in fields(cls):
+            if len(columns[f.name]) != count:
+                raise ValueError(f"Column {f.name} has the wrong length")
+            for task, value in zip(tasks, columns[f.name]):
+                setattr(task, f.name, value)
+        return tasks
+
+# Defaults of the Task fields, looked up once instead of on every decode
+_FIELD_DEFAULTS = {f.name: f.default for f in fields(Task)}
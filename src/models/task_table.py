@@ -0,0 +1,315 @@
+"""
+Columnar task tables for reporting.
+
+A TaskTable holds tasks one column per field instead of one object per task:
+priorities, status codes and the created and due timestamps are NumPy
+arrays, and ids, uuids and titles are parallel object arrays. Filters,
+group-bys and aggregates work on whole columns, so histograms, percentiles,
+overdue counts and age distributions over many tasks need no Python loop per
+task. TaskTable needs the optional ``numpy`` package.
+"""
+
+from datetime import datetime
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .task import Task
+
+# Timestamps keep the microseconds of the datetimes they come from
+TIMESTAMP_DTYPE = "datetime64[us]"
+
+# Statuses with a fixed code. Other statuses get the next free codes, in the
+# order they first appear in a table.
+STATUSES = ("pending", "in_progress", "completed")
+
+# Columns by the name of the Task field they hold
+COLUMNS = {
+    "id": "ids",
+    "uuid": "uuids",
+    "title": "titles",
+    "priority": "priorities",
+    "status": "status_codes",
+    "created_date": "created",
+    "due_date": "due",
+}
+
+def _require_numpy() -> None:
+    """Fail clearly when a TaskTable is needed but NumPy is not installed."""
+    if np is None:
+        raise ImportError("TaskTable requires the 'numpy' package")
+
+def _python_value(value: Any) -> Any:
+    """Convert a NumPy scalar to the matching Python value."""
+    return value.item() if isinstance(value, np.generic) else value
+
+class TaskTable:
+    """Tasks stored column by column in NumPy arrays."""
+
+    def __init__(self, ids: "np.ndarray", uuids: "np.ndarray", titles: "np.ndarray",
+                 priorities: "np.ndarray", status_codes: "np.ndarray", statuses: Tuple[str, ...],
+                 created: "np.ndarray", due: "np.ndarray"):
+        """
+        Initialize a table from its columns, which must all have the same length.
+
+        Args:
+            ids: Task ids (object array, None where unset)
+            uuids: Task uuids (object array)
+            titles: Task titles (object array)
+            priorities: Priorities from 1 to 5
+            status_codes: Index of each task's status in statuses
+            statuses: Status names by code
+            created: Creation timestamps
+            due: Due timestamps, NaT where a task has no due date
+
+        Raises:
+            ImportError: If NumPy is not installed
+            ValueError: If the columns differ in length
+        """
+        _require_numpy()
+        self.ids = ids
+        self.uuids = uuids
+        self.titles = titles
+        self.priorities = priorities
+        self.status_codes = status_codes
+        self.statuses = tuple(statuses)
+        self.created = created
+        self.due = due
+        lengths = {len(getattr(self, column)) for column in COLUMNS.values()}
+        if len(lengths) > 1:
+            raise ValueError("TaskTable columns must all have the same length")
+
+    @classmethod
+    def from_tasks(cls, tasks: Sequence[Task]) -> "TaskTable":
+        """
+        Build a table from tasks, e.g. as returned by FileHandler.load_tasks().
+
+        Args:
+            tasks: Task objects or LazyTask views
+
+        Returns:
+            A table with one row per task, in the same order
+
+        Raises:
+            ImportError: If NumPy is not installed
+        """
+        _require_numpy()
+        count = len(tasks)
+
+        def objects(field: str) -> "np.ndarray":
+            # Filled element-wise, so values that are sequences stay single objects
+            column = np.empty(count, dtype=object)
+            column[:] = list(map(attrgetter(field), tasks))
+            return column
+
+        codes: Dict[str, int] = {status: code for code, status in enumerate(STATUSES)}
+        status_codes = np.fromiter(
+            (codes.setdefault(status, len(codes)) for status in map(attrgetter("status"), tasks)),
+            dtype=np.int16, count=count)
+
+        return cls(
+            ids=objects("id"),
+            uuids=objects("uuid"),
+            titles=objects("title"),
+            priorities=np.fromiter(map(attrgetter("priority"), tasks), dtype=np.int8, count=count),
+            status_codes=status_codes,
+            statuses=tuple(codes),
+            created=np.array(list(map(attrgetter("created_date"), tasks)), dtype=TIMESTAMP_DTYPE),
+            due=np.array(list(map(attrgetter("due_date"), tasks)), dtype=TIMESTAMP_DTYPE),
+        )
+
+    def __len__(self) -> int:
+        return len(self.uuids)
+
+    def __repr__(self) -> str:
+        return f"TaskTable({len(self)} tasks)"
+
+    def column(self, name: str) -> "np.ndarray":
+        """
+        Get a column by Task field name.
+
+        The "status" column holds status names; the codes are status_codes.
+
+        Raises:
+            KeyError: If the field has no column
+        """
+        if name == "status":
+            return np.array(self.statuses, dtype=object)[self.status_codes]
+        if name not in COLUMNS:
+            raise KeyError(f"TaskTable has no column {name!r}; columns are {', '.join(COLUMNS)}")
+        return getattr(self, COLUMNS[name])
+
+    def _status_code(self, status: str) -> int:
+        """Get the code of a status, or -1 if no task in the table has it."""
+        return self.statuses.index(status) if status in self.statuses else -1
+
+    def _values(self, values: Union[str, "np.ndarray"]) -> "np.ndarray":
+        """Resolve a column name or check an array of one value per task."""
+        if isinstance(values, str):
+            return self.column(values)
+        values = np.asarray(values)
+        if len(values) != len(self):
+            raise ValueError(f"Expected {len(self)} values, got {len(values)}")
+        return values
+
+    def take(self, rows: Union["np.ndarray", Sequence[int]]) -> "TaskTable":
+        """
+        Get a table of some rows.
+
+        Args:
+            rows: Boolean mask with one entry per task, or row indexes
+        """
+        rows = np.asarray(rows)
+        return TaskTable(
+            ids=self.ids[rows],
+            uuids=self.uuids[rows],
+            titles=self.titles[rows],
+            priorities=self.priorities[rows],
+            status_codes=self.status_codes[rows],
+            statuses=self.statuses,
+            created=self.created[rows],
+            due=self.due[rows],
+        )
+
+    def filter(self, mask: Optional["np.ndarray"] = None, **criteria) -> "TaskTable":
+        """
+        Select the tasks matching a mask and field criteria.
+
+        Args:
+            mask: Optional boolean array with one entry per task
+            **criteria: Field/value pairs, e.g. status="pending". A list,
+                tuple or set of values matches any of them.
+
+        Returns:
+            A table of the matching tasks, in order
+        """
+        selected = np.ones(len(self), dtype=bool) if mask is None else np.asarray(mask, dtype=bool).copy()
+        for name, value in criteria.items():
+            many = isinstance(value, (list, tuple, set, frozenset))
+            if name == "status":
+                # Compare codes rather than strings
+                column = self.status_codes
+                value = [self._status_code(v) for v in value] if many else self._status_code(value)
+            else:
+                column = self.column(name)
+            selected &= np.isin(column, list(value)) if many else column == value
+        return self.take(selected)
+
+    def _groups(self, by: Union[str, "np.ndarray"]) -> Tuple[list, "np.ndarray"]:
+        """Get the distinct keys of a column, sorted, and each task's group number."""
+        if isinstance(by, str) and by == "status":
+            codes, groups = np.unique(self.status_codes, return_inverse=True)
+            return [self.statuses[code] for code in codes], groups
+        keys, groups = np.unique(self._values(by), return_inverse=True)
+        return keys.tolist(), groups
+
+    def group_by(self, by: Union[str, "np.ndarray"]) -> Dict[Any, "TaskTable"]:
+        """
+        Split the table by the values of a column.
+
+        Args:
+            by: Field name or array of one key per task
+
+        Returns:
+            A table per distinct key, in key order
+        """
+        keys, groups = self._groups(by)
+        order = np.argsort(groups, kind="stable")
+        bounds = np.cumsum(np.bincount(groups, minlength=len(keys)))[:-1]
+        return {key: self.take(rows) for key, rows in zip(keys, np.split(order, bounds))}
+
+    def aggregate(self, values: Union[str, "np.ndarray"], func: Union[str, Callable] = "count",
+                  by: Optional[Union[str, "np.ndarray"]] = None) -> Any:
+        """
+        Reduce a column, over the whole table or per group.
+
+        Counts, sums and means per group are computed in a single pass with
+        np.bincount; other reductions run once per group, not once per task.
+
+        Args:
+            values: Field name or array of one value per task
+            func: "count", "sum", "mean", "min", "max", "median", or a function
+                reducing an array to a value
+            by: Optional field name or array of one key per task to group by
+
+        Returns:
+            The reduced value, or a dict of them by group key when grouping
+        """
+        column = self._values(values)
+        reducers = {"count": len, "sum": np.sum, "mean": np.mean, "min": np.min, "max": np.max,
+                    "median": np.median}
+        if not callable(func) and func not in reducers:
+            raise ValueError(f"Unknown aggregate: {func}")
+        reducer = func if callable(func) else reducers[func]
+        if by is None:
+            return _python_value(reducer(column))
+
+        keys, groups = self._groups(by)
+        counts = np.bincount(groups, minlength=len(keys))
+        if func == "count":
+            results = counts
+        elif func in ("sum", "mean") and column.dtype.kind in "biuf":
+            sums = np.bincount(groups, weights=column, minlength=len(keys))
+            if func == "mean":
+                results = sums / counts
+            else:
+                results = sums.astype(np.int64) if column.dtype.kind in "biu" else sums
+        else:
+            order = np.argsort(groups, kind="stable")
+            results = [reducer(group) for group in np.split(column[order], np.cumsum(counts)[:-1])]
+        return {key: _python_value(result) for key, result in zip(keys, results)}
+
+    def percentile(self, values: Union[str, "np.ndarray"], q: Union[float, Iterable[float]],
+                   by: Optional[Union[str, "np.ndarray"]] = None) -> Any:
+        """
+        Get percentiles of a numeric column, over the whole table or per group.
+
+        Args:
+            values: Field name or array of one value per task
+            q: Percentile or percentiles, from 0 to 100
+            by: Optional field name or array of one key per task to group by
+        """
+        if not isinstance(q, (int, float)):
+            q = list(q)
+        return self.aggregate(values, lambda group: np.percentile(group, q), by=by)
+
+    def histogram(self, values: Union[str, "np.ndarray"], bins: Union[int, Sequence[float]] = 10
+                  ) -> Tuple["np.ndarray", "np.ndarray"]:
+        """
+        Count tasks per bin of a numeric column, as np.histogram does.
+
+        Returns:
+            The counts and the bin edges
+        """
+        return np.histogram(self._values(values), bins=bins)
+
+    def ages(self, now: Optional[datetime] = None) -> "np.ndarray":
+        """
+        Get how long ago each task was created.
+
+        Args:
+            now: Reference time. Defaults to the current time.
+
+        Returns:
+            Ages in days, as floats
+        """
+        now = np.datetime64(now or datetime.now(), "us")
+        return (now - self.created) / np.timedelta64(1, "D")
+
+    def overdue(self, now: Optional[datetime] = None) -> "np.ndarray":
+        """
+        Flag the tasks that are past their due date and not completed.
+
+        Args:
+            now: Reference time. Defaults to the current time.
+
+        Returns:
+            A boolean mask with one entry per task; tasks without a due date are never overdue
+        """
+        now = np.datetime64(now or datetime.now(), "us")
+        # Comparisons with NaT are always false
+        return (self.due < now) & (self.status_codes != self._status_code("completed"))
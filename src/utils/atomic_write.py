@@ -0,0 +1,78 @@
+"""
+Crash-safe file replacement for the Thoughtful Task Manager.
+
+Files are written to a temporary file in the same directory, flushed to disk
+and then renamed over the target. A rename within one filesystem is atomic, so
+readers (and a restart after a crash) see either the old file or the new one,
+never a truncated mix of both.
+"""
+
+import itertools
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+_counter = itertools.count()
+
+def fsync_directory(directory: Path) -> None:
+    """
+    Flush a directory entry to disk so a completed rename survives a power loss.
+
+    Args:
+        directory: Directory containing the renamed file
+    """
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        # Not every platform allows opening directories
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+@contextmanager
+def atomic_open(path: Path, mode: str = 'w', fsync: bool = True, fsync_dir: bool = False) -> Iterator[IO]:
+    """
+    Open a file for writing that replaces the target only once fully written.
+
+    Args:
+        path: The file to replace
+        mode: 'w' for text or 'wb' for bytes
+        fsync: Whether to fsync the temporary file before renaming it
+        fsync_dir: Whether to fsync the directory after renaming
+
+    Yields:
+        A writable file object for the temporary file. If the block raises,
+        the temporary file is removed and the target is left untouched.
+    """
+    path = Path(path)
+    # Hidden, so a leftover temp file is never listed as a task file
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{next(_counter)}.tmp")
+
+    # os.open honours the umask like a plain open() would
+    fd = os.open(str(temp_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        # Keep the permissions of the file being replaced
+        try:
+            os.chmod(temp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if fsync_dir:
+        fsync_directory(path.parent)
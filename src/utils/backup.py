@@ -0,0 +1,273 @@
+"""
+Incremental, deduplicated backups of task files.
+
+Backups live in their own directory (``data/backups``) and are content
+addressed. A task file is backed up as an ordered list of chunks, each
+holding a run of consecutive task records; chunks are stored once under the
+hash of their contents in ``objects/`` and shared by every backup (of any
+task file) that contains them. A backup point is a small manifest in
+``<source name>/`` listing its chunks.
+
+Chunk boundaries are content defined: a chunk ends after any record whose
+hash falls on a fixed residue, so inserting, changing or deleting a task only
+changes the chunk around it and every other chunk is reused as is. Backing up
+a large file in which one task changed therefore writes one chunk and the
+manifest.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .atomic_write import atomic_open
+from .compression import EXTENSIONS, compress, read_bytes
+
+try:
+    import fcntl
+except ImportError:  # Windows has no advisory locks; backups are then unsynchronized
+    fcntl = None
+
+MANIFEST_VERSION = 1
+
+# Average number of records per chunk. Larger chunks mean smaller manifests
+# but more bytes rewritten per changed task.
+AVERAGE_CHUNK_RECORDS = 256
+
+# Default retention: one backup per hour for a day, one per day for a month
+KEEP_HOURLY = 24
+KEEP_DAILY = 30
+
+def _record_digest(data: bytes) -> bytes:
+    """Hash one encoded record."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def _is_boundary(digest: bytes) -> bool:
+    """Check whether a chunk ends after the record with this digest."""
+    return int.from_bytes(digest[:4], "big") % AVERAGE_CHUNK_RECORDS == 0
+
+def _encode_record(record: Any) -> bytes:
+    """Encode a record canonically, so equal tasks hash equally."""
+    return json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+class BackupStore:
+    """Content-addressed backup points for the task files of one data directory."""
+
+    def __init__(self, backup_dir: Path, compression: Optional[str] = "gzip", fsync: bool = True):
+        """
+        Initialize the backup store.
+
+        Args:
+            backup_dir: Directory holding the backups, created on first use
+            compression: "gzip", "zstd" or None, used for new chunks
+            fsync: Whether to fsync chunks and manifests as they are written
+        """
+        if compression not in EXTENSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.backup_dir = Path(backup_dir)
+        self.objects_dir = self.backup_dir / "objects"
+        self.compression = compression
+        self.fsync = fsync
+
+    def _lock(self):
+        """Open and lock the store, so pruning never races a running backup."""
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.backup_dir / ".lock"), os.O_RDWR | os.O_CREAT, 0o666)
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        return fd
+
+    def _object_path(self, chunk_id: str) -> Path:
+        """Get the file of a chunk."""
+        return self.objects_dir / chunk_id[:2] / chunk_id
+
+    def _source_dir(self, source: str) -> Path:
+        """Get the directory of the backup points of a task file."""
+        return self.backup_dir / source
+
+    def _write_chunk(self, data: bytes) -> str:
+        """Store an encoded chunk unless it already exists, returning its id."""
+        chunk_id = hashlib.sha256(data).hexdigest()
+        path = self._object_path(chunk_id)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with atomic_open(path, 'wb', fsync=self.fsync) as f:
+                f.write(compress(data, self.compression))
+        return chunk_id
+
+    def _chunks(self, records: Iterable[Any]) -> Iterator[Tuple[bytes, int]]:
+        """Group records into content-defined chunks, yielding each as a JSON list with its length."""
+        lines: List[bytes] = []
+        for record in records:
+            data = _encode_record(record)
+            lines.append(data)
+            if _is_boundary(_record_digest(data)):
+                yield b"[" + b",".join(lines) + b"]", len(lines)
+                lines = []
+        if lines:
+            yield b"[" + b",".join(lines) + b"]", len(lines)
+
+    def backup(self, source: str, records: Iterable[Any], source_hash: Optional[str] = None,
+               now: Optional[datetime] = None) -> str:
+        """
+        Record a backup point.
+
+        Args:
+            source: Name of the task file being backed up
+            records: The file's task records in order
+            source_hash: content_hash() of the file. If it matches the latest
+                backup point, that point is returned and nothing is written.
+            now: Time of the backup. Defaults to the current time.
+
+        Returns:
+            The id of the backup point
+        """
+        latest = self.list_backups(source)
+        if source_hash is not None and latest and latest[-1]["source_hash"] == source_hash:
+            return latest[-1]["id"]
+
+        now = now or datetime.now(timezone.utc)
+        fd = self._lock()
+        try:
+            count = 0
+            chunk_ids = []
+            for chunk, length in self._chunks(records):
+                chunk_ids.append(self._write_chunk(chunk))
+                count += length
+            # Ids sort chronologically; nudge the time if two backups share it
+            source_dir = self._source_dir(source)
+            source_dir.mkdir(parents=True, exist_ok=True)
+            while (source_dir / f"{now.strftime('%Y%m%dT%H%M%S%fZ')}.json").exists():
+                now += timedelta(microseconds=1)
+            backup_id = now.strftime('%Y%m%dT%H%M%S%fZ')
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "id": backup_id,
+                "source": source,
+                "created": now.isoformat(),
+                "source_hash": source_hash,
+                "count": count,
+                "chunks": chunk_ids,
+            }
+            with atomic_open(source_dir / f"{backup_id}.json", 'w', fsync=self.fsync) as f:
+                json.dump(manifest, f)
+        finally:
+            os.close(fd)
+        return backup_id
+
+    def list_backups(self, source: str) -> List[Dict[str, Any]]:
+        """
+        List the backup points of a task file.
+
+        Args:
+            source: Name of the task file
+
+        Returns:
+            Manifests of the backup points, oldest first
+        """
+        source_dir = self._source_dir(source)
+        if not source_dir.is_dir():
+            return []
+        manifests = []
+        for path in sorted(source_dir.glob("*.json")):
+            try:
+                with open(path, 'r') as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if manifest.get("version") == MANIFEST_VERSION:
+                manifests.append(manifest)
+        return manifests
+
+    def restore(self, source: str, backup_id: Optional[str] = None) -> List[Any]:
+        """
+        Read the task records of a backup point.
+
+        Args:
+            source: Name of the task file
+            backup_id: The backup point. Defaults to the latest one.
+
+        Returns:
+            The task records as they were backed up
+
+        Raises:
+            KeyError: If there is no such backup point
+        """
+        backups = self.list_backups(source)
+        if backup_id is None:
+            if not backups:
+                raise KeyError(f"No backups of {source}")
+            manifest = backups[-1]
+        else:
+            manifest = next((b for b in backups if b["id"] == backup_id), None)
+            if manifest is None:
+                raise KeyError(f"No backup {backup_id} of {source}")
+
+        records: List[Any] = []
+        for chunk_id in manifest["chunks"]:
+            records.extend(json.loads(read_bytes(self._object_path(chunk_id))))
+        return records
+
+    def prune(self, source: str, keep_hourly: int = KEEP_HOURLY, keep_daily: int = KEEP_DAILY,
+              now: Optional[datetime] = None) -> List[str]:
+        """
+        Apply the retention policy to a task file's backups and drop unused chunks.
+
+        Within the last keep_hourly hours the newest backup of every hour is
+        kept, within the last keep_daily days the newest backup of every day.
+        The latest backup is always kept.
+
+        Args:
+            source: Name of the task file
+            keep_hourly: Hours during which hourly backups are kept
+            keep_daily: Days during which daily backups are kept
+            now: Reference time. Defaults to the current time.
+
+        Returns:
+            The ids of the removed backup points
+        """
+        now = now or datetime.now(timezone.utc)
+        fd = self._lock()
+        try:
+            backups = self.list_backups(source)
+            keep = set()
+            if backups:
+                keep.add(backups[-1]["id"])
+            seen_buckets = set()
+            # Newest first, so the first backup seen in a bucket is the one kept
+            for manifest in reversed(backups):
+                created = datetime.fromisoformat(manifest["created"])
+                age = now - created
+                if age <= timedelta(hours=keep_hourly):
+                    bucket = ("hour", created.strftime("%Y%m%d%H"))
+                elif age <= timedelta(days=keep_daily):
+                    bucket = ("day", created.strftime("%Y%m%d"))
+                else:
+                    continue
+                if bucket not in seen_buckets:
+                    seen_buckets.add(bucket)
+                    keep.add(manifest["id"])
+
+            removed = [manifest["id"] for manifest in backups if manifest["id"] not in keep]
+            for backup_id in removed:
+                os.unlink(self._source_dir(source) / f"{backup_id}.json")
+            if removed:
+                self._collect_garbage()
+        finally:
+            os.close(fd)
+        return removed
+
+    def _collect_garbage(self) -> None:
+        """Delete chunks no backup point of any task file refers to. Called with the lock held."""
+        referenced = set()
+        for source_dir in self.backup_dir.iterdir():
+            if source_dir.is_dir() and source_dir != self.objects_dir:
+                for manifest in self.list_backups(source_dir.name):
+                    referenced.update(manifest["chunks"])
+        if not self.objects_dir.is_dir():
+            return
+        for path in self.objects_dir.glob("*/*"):
+            if path.name not in referenced and not path.name.startswith("."):
+                os.unlink(path)
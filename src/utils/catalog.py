@@ -0,0 +1,117 @@
+"""
+Per-directory catalog of task file metadata.
+
+The catalog is a small sidecar file (``.task_catalog.json``) that remembers,
+for each task file in a directory, facts that are expensive to recompute such
+as the number of tasks. Entries are keyed on the file's mtime and size, so a
+stale entry is detected with a single stat() call.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from .atomic_write import atomic_open
+
+class TaskCatalog:
+    """Sidecar index of task file metadata for one directory."""
+
+    FILE_NAME = ".task_catalog.json"
+    VERSION = 1
+
+    def __init__(self, directory: Path):
+        """
+        Initialize the catalog for a directory.
+
+        Args:
+            directory: Directory whose task files are catalogued
+        """
+        self.directory = Path(directory)
+        self.path = self.directory / self.FILE_NAME
+        self._entries: Optional[Dict[str, Dict[str, Any]]] = None
+        self._dirty = False
+
+    @property
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """Catalog entries by file name, loaded on first access."""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and data.get("version") == self.VERSION:
+                    self._entries = data.get("files", {})
+            except (OSError, ValueError):
+                pass
+        return self._entries
+
+    @staticmethod
+    def _stat_key(path: Path) -> Optional[Dict[str, int]]:
+        """Build the freshness key of a file."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return {"mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    def lookup(self, path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Get the entry for a file if it is still fresh.
+
+        Args:
+            path: Path of the task file
+
+        Returns:
+            The catalog entry, or None if the file is unknown or changed since
+        """
+        entry = self.entries.get(Path(path).name)
+        key = self._stat_key(path)
+        if entry is None or key is None:
+            return None
+        if entry.get("mtime_ns") != key["mtime_ns"] or entry.get("size") != key["size"]:
+            return None
+        return entry
+
+    def update(self, path: Path, **fields) -> Dict[str, Any]:
+        """
+        Record metadata for a file, stamped with its current mtime and size.
+
+        Args:
+            path: Path of the task file
+            **fields: Metadata to store, e.g. task_count=12
+
+        Returns:
+            The stored entry
+        """
+        entry = dict(fields)
+        entry.update(self._stat_key(path) or {})
+        self.entries[Path(path).name] = entry
+        self._dirty = True
+        return entry
+
+    def prune(self, names) -> None:
+        """
+        Drop entries for files that are no longer in the directory.
+
+        Args:
+            names: File names that still exist
+        """
+        keep = set(names)
+        for name in [n for n in self.entries if n not in keep]:
+            del self.entries[name]
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the catalog back to disk if it changed."""
+        if not self._dirty:
+            return
+
+        try:
+            # The catalog can always be rebuilt, so it is not worth an fsync
+            with atomic_open(self.path, 'w', fsync=False) as f:
+                json.dump({"version": self.VERSION, "files": self.entries}, f)
+            self._dirty = False
+        except OSError:
+            # The catalog is only an optimization; read-only directories still work
+            pass
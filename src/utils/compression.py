@@ -0,0 +1,106 @@
+"""
+Transparent compression for task files.
+
+Task files may be stored gzip-compressed (``.json.gz``) or zstd-compressed
+(``.json.zst``). The compression is detected from the file extension or, for
+files with a plain name, from the leading magic bytes. zstd support needs the
+optional ``zstandard`` package.
+"""
+
+import gzip
+import io
+from pathlib import Path
+from typing import BinaryIO, Optional, TextIO
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# Extensions of task files, by compression method
+EXTENSIONS = {None: ".json", "gzip": ".json.gz", "zstd": ".json.zst"}
+
+def _require_zstd() -> None:
+    """Fail clearly when zstd is needed but not installed."""
+    if zstandard is None:
+        raise ImportError("Reading or writing .json.zst task files requires the 'zstandard' package")
+
+def detect_compression(path: Path) -> Optional[str]:
+    """
+    Detect how a task file is compressed.
+
+    Args:
+        path: Path to the task file
+
+    Returns:
+        "gzip", "zstd", or None for plain JSON. Files that do not exist yet
+        are judged by their extension alone.
+    """
+    path = Path(path)
+    if path.suffix == ".gz":
+        return "gzip"
+    if path.suffix == ".zst":
+        return "zstd"
+    try:
+        with open(path, 'rb') as f:
+            magic = f.read(4)
+    except OSError:
+        return None
+    if magic.startswith(GZIP_MAGIC):
+        return "gzip"
+    if magic == ZSTD_MAGIC:
+        return "zstd"
+    return None
+
+def is_task_file_name(name: str) -> bool:
+    """Check whether a file name has one of the task file extensions."""
+    return not name.startswith(".") and name.endswith(tuple(EXTENSIONS.values()))
+
+def open_binary(path: Path) -> BinaryIO:
+    """
+    Open a task file for reading, decompressing it on the fly.
+
+    Args:
+        path: Path to the task file
+
+    Returns:
+        A binary stream of the uncompressed JSON
+    """
+    method = detect_compression(path)
+    if method == "gzip":
+        return gzip.open(path, 'rb')
+    if method == "zstd":
+        _require_zstd()
+        return zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+    return open(path, 'rb')
+
+def open_text(path: Path) -> TextIO:
+    """Open a task file for reading as UTF-8 text, decompressing it on the fly."""
+    return io.TextIOWrapper(open_binary(path), encoding="utf-8")
+
+def read_bytes(path: Path) -> bytes:
+    """Read the uncompressed contents of a task file."""
+    with open_binary(path) as f:
+        return f.read()
+
+def compress(data: bytes, method: Optional[str]) -> bytes:
+    """
+    Compress serialized task data.
+
+    Args:
+        data: Uncompressed JSON bytes
+        method: "gzip", "zstd", or None to leave the data as is
+
+    Returns:
+        The bytes to write to disk
+    """
+    if method == "gzip":
+        # A fixed mtime keeps the output deterministic for identical content
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if method == "zstd":
+        _require_zstd()
+        return zstandard.ZstdCompressor().compress(data)
+    return data
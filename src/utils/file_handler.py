@@ -2,59 +2,987 @@
 File handling utilities for the Thoughtful Task Manager.
 """
 
+import atexit
+import gc
+import hashlib
+import itertools
 import json
 import os
-from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+import re
+import threading
 import time
+import weakref
+from contextlib import contextmanager
+from operator import attrgetter, eq, itemgetter
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import jsonschema
 
+from ..models.lazy_task import LazyTask
 from ..models.task import Task
+from .atomic_write import atomic_open
+from .backup import BackupStore, KEEP_DAILY, KEEP_HOURLY
+from .catalog import TaskCatalog
+from .compression import compress, detect_compression, is_task_file_name, open_text, read_bytes
+from .journal import TaskJournal
+from .json_stream import iter_task_records, NotATaskListError
+from . import ndjson
+from .snapshot import TaskSnapshot, content_hash
+
+try:
+    import fcntl
+except ImportError:  # Windows has no advisory locks; writers are then unsynchronized
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+class JsonCodec:
+    """Encodes and decodes task files with the standard library json module."""
+    
+    name = "json"
+    
+    def dumps(self, data: Any, compact: bool = False) -> bytes:
+        """
+        Serialize data to UTF-8 JSON.
+        
+        Args:
+            data: The value to serialize
+            compact: Drop indentation and whitespace instead of indenting by 2
+        """
+        if compact:
+            return json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return json.dumps(data, indent=2).encode("utf-8")
+    
+    def loads(self, data: bytes) -> Any:
+        """
+        Deserialize UTF-8 JSON.
+        
+        Raises:
+            json.JSONDecodeError: If the data is not well-formed JSON
+        """
+        return json.loads(data)
+
+class OrjsonCodec(JsonCodec):
+    """Codec backed by orjson."""
+    
+    name = "orjson"
+    
+    def dumps(self, data: Any, compact: bool = False) -> bytes:
+        return orjson.dumps(data, option=0 if compact else orjson.OPT_INDENT_2)
+    
+    def loads(self, data: bytes) -> Any:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+
+class MsgspecCodec(JsonCodec):
+    """Codec backed by msgspec."""
+    
+    name = "msgspec"
+    
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+    
+    def dumps(self, data: Any, compact: bool = False) -> bytes:
+        encoded = self._encoder.encode(data)
+        return encoded if compact else msgspec.json.format(encoded, indent=2)
+    
+    def loads(self, data: bytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except msgspec.DecodeError as e:
+            raise json.JSONDecodeError(str(e), data.decode("utf-8", "replace"), 0) from e
+
+@contextmanager
+def gc_paused() -> Iterator[None]:
+    """
+    Suspend the cyclic garbage collector while decoding.
+    
+    Decoding a large file allocates hundreds of thousands of containers, none of
+    them garbage, and each allocation burst would otherwise trigger a collection.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+# Generations of cached task lists, unique across handlers
+_cache_generations = itertools.count(1)
+
+# Handlers keeping binary snapshots, whose snapshots are brought up to date at exit
+_snapshot_handlers: "weakref.WeakSet[FileHandler]" = weakref.WeakSet()
+
+@atexit.register
+def _write_snapshots_at_exit() -> None:
+    """Write the snapshots saves left stale, so the next start can load them."""
+    for handler in list(_snapshot_handlers):
+        handler.write_snapshots()
+
+# Reads every field of a Task (or LazyTask) in one call, C-level for Tasks
+_task_values = attrgetter(*Task.__dataclass_fields__)
+_DEPENDENCIES = tuple(Task.__dataclass_fields__).index("dependencies")
+
+# Stands in for a task with no cached fragment
+_NO_FRAGMENT = (None, None)
+
+def _saved_values(values: tuple) -> tuple:
+    """Copy a task's values for comparing them at the next save, including the dependencies list."""
+    dependencies = values[_DEPENDENCIES]
+    if dependencies is None:
+        return values
+    return values[:_DEPENDENCIES] + (list(dependencies),) + values[_DEPENDENCIES + 1:]
+
+# Codecs by name, fastest first
+CODECS = {
+    "orjson": OrjsonCodec if orjson is not None else None,
+    "msgspec": MsgspecCodec if msgspec is not None else None,
+    "json": JsonCodec,
+}
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Get a JSON codec by name.
+    
+    Args:
+        name: "orjson", "msgspec" or "json". Defaults to the fastest installed codec.
+        
+    Returns:
+        A codec instance
+        
+    Raises:
+        ValueError: If the codec is unknown or its library is not installed
+    """
+    if name is None:
+        return next(codec for codec in CODECS.values() if codec is not None)()
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    if CODECS[name] is None:
+        raise ValueError(f"JSON codec {name} is not installed")
+    return CODECS[name]()
+
+# Directory of the incremental backups, next to the task files
+BACKUP_DIR_NAME = "backups"
+
+# Full-copy backups written by earlier versions, e.g. tasks_backup_1700000000.json
+LEGACY_BACKUP_NAME = re.compile(r".+_backup_\d+\.")
+
+# Query values of these types match a field holding any of the values in them
+MULTI_VALUE_TYPES = (list, tuple, set, frozenset, range)
+
+class StaleVersionError(Exception):
+    """Raised when a tasks file was changed by another writer since it was loaded."""
+    pass
 
 class FileHandler:
     """Handles file operations for tasks."""
     
-    def __init__(self, data_dir: str = "data"):
-        """Initialize the file handler."""
+    # Fields that find_tasks can match on
+    QUERY_FIELDS = ("id", "uuid", "title", "status", "priority", "source")
+    
+    # Whether loaded tasks are kept in memory; see cached_tasks()
+    CACHES_TASKS = True
+    
+    def __init__(self, data_dir: str = "data", journal: bool = False, compact_threshold: int = 200,
+                 incremental_validation: bool = True, fsync: bool = True, fsync_dir: bool = False,
+                 group_commit: float = 0.0, codec: Optional[str] = None, compact: bool = False,
+                 snapshot: bool = False, lazy: bool = False):
+        """
+        Initialize the file handler.
+        
+        Args:
+            data_dir: Directory holding the task files.
+            journal: Record single-task mutations in an append-only journal
+                instead of rewriting the whole tasks file.
+            compact_threshold: Number of journal entries after which the
+                journal is compacted into the tasks file.
+            incremental_validation: Only validate tasks whose serialized form
+                changed since the last successful schema validation.
+            fsync: Flush each saved tasks file to disk before it replaces the old one.
+            fsync_dir: Also flush the directory after the replacing rename.
+            group_commit: Window in seconds during which consecutive saves are
+                merged into a single write. Saves then return before the data is
+                on disk; call flush() to force the pending write.
+            codec: JSON codec to use ("orjson", "msgspec" or "json"). Defaults
+                to the fastest one installed.
+            compact: Write tasks files without indentation, for files that are
+                only read by programs.
+            snapshot: Keep a binary snapshot next to the tasks file and load
+                it instead of the JSON while the JSON is unchanged.
+            lazy: Load tasks as LazyTask views that parse dates and validate
+                fields only when they are read.
+        """
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.tasks_file = self.data_dir / "tasks.json"
         self.schema_file = self.data_dir / "task_schema.json"
+        self.journal_enabled = journal
+        self.compact_threshold = compact_threshold
+        self._journals: Dict[Path, TaskJournal] = {}
+        self._stable_uuids: Dict[Path, bool] = {}
+        
+        # Decoded tasks per file, revalidated against the file's stat() signature,
+        # with the generation of each cached list
+        self._task_cache: Dict[Path, Tuple[Tuple, List[Task], int]] = {}
+        self.cache_generation = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Compiled schema validators, rebuilt when the schema file changes
+        self.incremental_validation = incremental_validation
+        self._schema_validators: Optional[Tuple] = None
+        self._validated_digests: set = set()
+        
+        self._catalogs: Dict[Path, TaskCatalog] = {}
+        self.codec = get_codec(codec)
+        self.compact = compact
+        self.snapshot_enabled = snapshot
+        self.lazy = lazy
+        # Task files saved since their binary snapshot was written
+        self._stale_snapshots: set = set()
+        if snapshot:
+            _snapshot_handlers.add(self)
+        
+        # Saves waiting for the group commit window to close, by file
+        self.fsync = fsync
+        self.fsync_dir = fsync_dir
+        self.group_commit = group_commit
+        self._pending_saves: Dict[Path, List[Task]] = {}
+        self._commit_lock = threading.RLock()
+        self._commit_timer: Optional[threading.Timer] = None
+        if group_commit > 0:
+            atexit.register(self.flush)
+        
+        # Inter-process write lock depth and the file version each load observed
+        self._lock_fds: Dict[Path, int] = {}
+        self._loaded_versions: Dict[Path, int] = {}
+        
+        # Lines in each NDJSON file, to decide when superseded lines are compacted
+        self._ndjson_lines: Dict[Path, int] = {}
+        self._compacting: set = set()
+        
+        # Encoded form of each task last written to a file, by file and id() of
+        # the task, with the field values it was encoded from
+        self._fragments: Dict[Path, Tuple[tuple, Dict[int, Tuple[tuple, bytes]]]] = {}
+        
+        # Throughput of the last decode of task records into Task objects
+        self.decode_stats: Dict[str, float] = {}
     
     def save_tasks(self, tasks: List[Task]) -> None:
-        """Save tasks to file."""
-        tasks_data = [task.to_dict() for task in tasks]
+        """
+        Save tasks to file.
         
-        # Validate against schema if available
-        if self.schema_file.exists():
-            self.validate_against_schema(tasks_data)
+        The file is replaced atomically, so an interrupted save leaves the
+        previous version intact. With group commit enabled the write is
+        deferred and merged with any further saves inside the window.
+        Tasks unchanged since the last save are not serialized again.
+        """
+        with self._commit_lock:
+            if self.group_commit > 0:
+                self._pending_saves[self.tasks_file] = list(tasks)
+                if self._commit_timer is None:
+                    self._commit_timer = threading.Timer(self.group_commit, self.flush)
+                    self._commit_timer.daemon = True
+                    self._commit_timer.start()
+                # The cache serves the pending state until it is written
+                self._update_cache(tasks)
+            else:
+                self._write_snapshot(self.tasks_file, tasks)
+        self._stable_uuids[self.tasks_file] = True
+    
+    def flush(self) -> None:
+        """Write any saves still waiting for the group commit window."""
+        with self._commit_lock:
+            if self._commit_timer is not None:
+                self._commit_timer.cancel()
+                self._commit_timer = None
+            pending, self._pending_saves = self._pending_saves, {}
+            for path, tasks in pending.items():
+                self._write_snapshot(path, tasks)
+    
+    def _fragment_layout(self, path: Path) -> Tuple[str, bool, bool]:
+        """Get what the encoded form of one task in a file depends on."""
+        return (self.codec.name, ndjson.is_ndjson(path), self.compact)
+    
+    def _encode_tasks(self, path: Path, tasks: List[Task]) -> Tuple[bytes, List[Tuple[int, tuple, bytes]]]:
+        """
+        Serialize tasks in the layout of a file, reusing the fragments of unchanged tasks.
+        
+        The encoded form of every task written to a file is kept together
+        with the field values it was encoded from. A task whose values still
+        compare equal is not converted or validated again; for those the
+        save is a lookup and a tuple comparison per task and joining cached
+        bytes, all done in C. The values are read before encoding, so a task
+        changed while it is encoded no longer matches at the next save.
+        
+        Returns:
+            The uncompressed file contents and the tasks encoded anew, as
+            (id, values, fragment), to pass to _keep_fragments() once written
+        """
+        layout = self._fragment_layout(path)
+        line_mode = layout[1]
+        cached_layout, cached = self._fragments.get(path, (None, {}))
+        if cached_layout != layout:
+            cached = {}
+        
+        # One tuple of values per task, none of them garbage
+        with gc_paused():
+            ids = list(map(id, tasks))
+            values = list(map(_task_values, tasks))
+            entries = list(map(cached.get, ids, itertools.repeat(_NO_FRAGMENT)))
+            unchanged = list(map(eq, values, map(itemgetter(0), entries)))
+            fragments = list(map(itemgetter(1), entries))
+        changed = []
+        records = []
+        position = -1
+        for _ in range(unchanged.count(False)):
+            position = unchanged.index(False, position + 1)
+            task = tasks[position]
+            # Copied before encoding: a list changed in place later must not match
+            saved = _saved_values(values[position])
+            record = task.to_dict()
+            if line_mode:
+                fragment = self._dump_line(record) + b"\n"
+            elif self.compact:
+                fragment = self.codec.dumps(record, compact=True)
+            else:
+                # Nest the record one level deep, as inside an indented list
+                fragment = self.codec.dumps(record).replace(b"\n", b"\n  ")
+            fragments[position] = fragment
+            changed.append((ids[position], saved, fragment))
+            records.append(record)
+        
+        if records and self.schema_file.exists():
+            is_valid, _ = self.validate_against_schema(records, partial=len(records) < len(tasks))
+            if is_valid and len(self._validated_digests) > 2 * len(tasks):
+                # Drop the digests of replaced records once they outnumber the current ones
+                self._validated_digests = {self._task_digest(task.to_dict()) for task in tasks}
+        
+        if line_mode:
+            return b"".join(fragments), changed
+        if not fragments:
+            return b"[]", changed
+        if self.compact:
+            return b"[" + b",".join(fragments) + b"]", changed
+        return b"[\n  " + b",\n  ".join(fragments) + b"\n]", changed
+    
+    def _keep_fragments(self, path: Path, tasks: List[Task], changed: List[Tuple[int, tuple, bytes]]) -> None:
+        """Remember the fragments of freshly written tasks for the next save."""
+        layout = self._fragment_layout(path)
+        cached_layout, cached = self._fragments.get(path, (None, {}))
+        if cached_layout != layout:
+            cached = {}
+        for task_id, values, fragment in changed:
+            cached[task_id] = (values, fragment)
+        if len(cached) > 2 * len(tasks):
+            # Drop the fragments of removed tasks once they outnumber the current ones
+            cached = {task_id: cached[task_id] for task_id in map(id, tasks) if task_id in cached}
+        self._fragments[path] = (layout, cached)
+    
+    def _write_snapshot(self, path: Path, tasks: List[Task]) -> None:
+        """Atomically replace a tasks file and fold its journal into it."""
+        with self.locked(path):
+            encoded, changed = self._encode_tasks(path, tasks)
+            # Files keep their layout: NDJSON stays line-delimited, compressed files stay compressed
+            if ndjson.is_ndjson(path):
+                with atomic_open(path, 'wb', fsync=self.fsync, fsync_dir=self.fsync_dir) as f:
+                    f.write(encoded)
+                self._ndjson_lines[path] = len(tasks)
+            else:
+                with atomic_open(path, 'wb', fsync=self.fsync, fsync_dir=self.fsync_dir) as f:
+                    f.write(compress(encoded, detect_compression(path)))
+                if self.snapshot_enabled:
+                    # Marshalling every task would cost more than the save itself
+                    self._stale_snapshots.add(path)
             
-        with open(self.tasks_file, 'w') as f:
-            json.dump(tasks_data, f, indent=2)
+            # The snapshot now holds every mutation, so the journal can go
+            if path not in self._journals:
+                self._journals[path] = TaskJournal(path)
+            self._journals[path].clear()
+            self._bump_version(path)
+        
+        self._keep_fragments(path, tasks, changed)
+        if path == self.tasks_file:
+            self._update_cache(tasks)
+        else:
+            self._task_cache.pop(path, None)
+    
+    def write_snapshots(self) -> None:
+        """
+        Write the binary snapshot of the current tasks file if saves made it stale.
+        
+        Saves leave the snapshot behind rather than rewrite it each time; it
+        is rewritten at exit, or when the file is next decoded. It is only
+        written while the cached tasks are exactly what the file holds.
+        """
+        path = self.tasks_file
+        if path not in self._stale_snapshots:
+            return
+        self._stale_snapshots.discard(path)
+        cached = self._task_cache.get(path)
+        if cached is None or cached[0] != self._cache_signature() or self.get_journal().exists():
+            return
+        # Tasks changed in place since the save would need encoding anew
+        encoded, changed = self._encode_tasks(path, cached[1])
+        if not changed:
+            TaskSnapshot(path).write(cached[1], content_hash(encoded), self._schema_version())
     
     def load_tasks(self) -> List[Task]:
-        """Load tasks from file."""
-        if not self.tasks_file.exists():
+        """
+        Load tasks from file.
+        
+        Decoded tasks are cached in memory and reused as long as the file (and
+        its journal) keep the same mtime, size and inode. The returned list is a
+        copy, but the Task objects in it are shared with the cache.
+        """
+        return list(self.cached_tasks()[1])
+    
+    def cached_tasks(self) -> Tuple[Optional[int], List[Task]]:
+        """
+        Load tasks like load_tasks(), without copying the cached list.
+        
+        Returns:
+            A tuple of (generation, tasks) where:
+            - generation: A number identifying the cached list. It changes
+              whenever the list is replaced, i.e. re-read from disk or written
+              through this handler, and is never reused, so callers can keep
+              data derived from the tasks (such as indexes) per generation.
+              None if the handler does not cache tasks.
+            - tasks: The cached list itself. It may only be changed in order
+              to persist it right away with persist_create, persist_update
+              or persist_delete, which cache it as the new list.
+        """
+        signature = self._cache_signature()
+        cached = self._task_cache.get(self.tasks_file)
+        if cached is not None and cached[0] == signature:
+            self.cache_hits += 1
+            return cached[2], cached[1]
+        
+        self.cache_misses += 1
+        if self.tasks_file in self._pending_saves:
+            self.flush()
+        # Read the version first: a write racing with the read can then only
+        # make the version look older than the data, which forces a retry
+        self._loaded_versions[self.tasks_file] = self.file_version()
+        tasks = self._read_tasks()
+        self._cache_tasks(signature, tasks)
+        return self.cache_generation, tasks
+    
+    def cache_info(self) -> Dict[str, int]:
+        """
+        Get task cache statistics.
+        
+        Returns:
+            A dictionary with the cache hit and miss counts and the number of cached files
+        """
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "files": len(self._task_cache)}
+    
+    def clear_cache(self) -> None:
+        """Drop all cached tasks so the next load reads from disk."""
+        self._task_cache.clear()
+    
+    def _cache_signature(self) -> Tuple:
+        """Build the stat() signature of the current tasks file and its journal."""
+        signature = []
+        for path in (self.tasks_file, self.get_journal().path):
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+    
+    def _update_cache(self, tasks: List[Task]) -> None:
+        """Store tasks just written through this handler so they are not re-read."""
+        cached = self._task_cache.get(self.tasks_file)
+        # The cached list itself was written when tasks changed in place; it needs no copy
+        self._cache_tasks(self._cache_signature(), tasks if cached is not None and tasks is cached[1] else list(tasks))
+    
+    def _cache_tasks(self, signature: Tuple, tasks: List[Task]) -> None:
+        """Cache the tasks of the current file under a new generation."""
+        self.cache_generation = next(_cache_generations)
+        self._task_cache[self.tasks_file] = (signature, tasks, self.cache_generation)
+    
+    def _read_tasks(self) -> List[Task]:
+        """Read and decode tasks from the current file, replaying its journal."""
+        journal = self.get_journal()
+        if not self.tasks_file.exists() and not journal.exists():
             return []
         
-        with open(self.tasks_file, 'r') as f:
-            data = json.load(f)
+        snapshot = None
+        if self.tasks_file.exists() and ndjson.is_ndjson(self.tasks_file):
+            with open(self.tasks_file, 'r', encoding="utf-8") as f, gc_paused():
+                lines = list(ndjson.iter_lines(f))
+            self._ndjson_lines[self.tasks_file] = len(lines)
+            tasks_data = ndjson.resolve(lines)
+        elif self.tasks_file.exists():
+            raw = read_bytes(self.tasks_file)
+            
+            # A fresh binary snapshot spares decoding JSON and parsing dates
+            if self.snapshot_enabled and not journal.exists():
+                snapshot = TaskSnapshot(self.tasks_file)
+                source_hash = content_hash(raw)
+                with gc_paused():
+                    tasks = snapshot.load(source_hash, self._schema_version())
+                if tasks is not None:
+                    self._stable_uuids[self.tasks_file] = all(task.uuid for task in tasks)
+                    return tasks
+            
+            # An empty file holds no tasks, e.g. an NDJSON file whose tasks were all deleted
+            with gc_paused():
+                data = self.codec.loads(raw) if raw.strip() else []
+            del raw
+            
+            # Handle both formats: direct list of tasks or {"tasks": [...]}
+            tasks_data = data.get("tasks", data) if isinstance(data, dict) else data
+        else:
+            tasks_data = []
+        
+        # Journal entries are keyed on uuid, so they can only be appended
+        # safely while every snapshot record carries a persistent uuid
+        self._stable_uuids[self.tasks_file] = all(
+            isinstance(task_data, dict) and task_data.get("uuid") for task_data in tasks_data
+        )
         
-        # Handle both formats: direct list of tasks or {"tasks": [...]}
-        tasks_data = data.get("tasks", data) if isinstance(data, dict) else data
+        # Recover mutations recorded after the last snapshot
+        if journal.exists():
+            tasks_data = journal.replay(tasks_data)
         
         # Validate against schema if available
         if self.schema_file.exists():
             self.validate_against_schema(tasks_data)
+        
+        tasks = self._decode_tasks(tasks_data)
+        
+        # Records without a uuid get a new one on every load, so they cannot be
+        # snapshotted; writing a snapshot of lazy views would parse every field
+        if snapshot is not None and self._stable_uuids[self.tasks_file] and not self.lazy:
+            snapshot.write(tasks, source_hash, self._schema_version())
+        return tasks
+    
+    def _decode_tasks(self, tasks_data: List[Dict[str, Any]]) -> List[Task]:
+        """Build Task objects (or lazy views) from decoded records, recording the throughput in decode_stats."""
+        start = time.perf_counter()
+        with gc_paused():
+            tasks = (LazyTask if self.lazy else Task).from_dicts(tasks_data)
+        elapsed = time.perf_counter() - start
+        self.decode_stats = {
+            "tasks": len(tasks),
+            "seconds": elapsed,
+            "tasks_per_sec": len(tasks) / elapsed if elapsed > 0 else 0.0,
+        }
+        return tasks
+    
+    def _schema_version(self) -> Optional[int]:
+        """Get the mtime of the schema file, or None if there is no schema."""
+        try:
+            return os.stat(self.schema_file).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def iter_task_records(self, file_path: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream raw task records from a task file one at a time.
+        
+        The bare list layout and the {"tasks": [...]} layout are streamed and
+        the file's journal is applied on the fly, so memory use is bounded by
+        the largest record rather than the file size. NDJSON files are
+        resolved in memory first.
+        
+        Args:
+            file_path: File to read. Defaults to the current tasks file.
+            
+        Yields:
+            Task dictionaries in file order
+        """
+        path = Path(file_path) if file_path else self.tasks_file
+        journal = self.get_journal() if path == self.tasks_file else TaskJournal(path)
+        
+        if journal.exists():
+            yield from journal.overlay(self._iter_file_records(path))
+        else:
+            yield from self._iter_file_records(path)
+    
+    def _iter_file_records(self, path: Path) -> Iterator[Any]:
+        """Yield the task records stored in a file, in any supported layout."""
+        if not path.exists():
+            return
+        if ndjson.is_ndjson(path):
+            # Later lines can supersede earlier ones, so the lines are resolved first
+            with open(path, 'r', encoding="utf-8") as f:
+                yield from ndjson.resolve(ndjson.iter_lines(f))
+            return
+        with open_text(path) as f:
+            yield from iter_task_records(f)
+    
+    def read_records(self, file_path: Optional[str] = None) -> Any:
+        """
+        Read the raw contents of a task file, with its journal applied.
+        
+        Records are not converted to Task objects, so fields the model does
+        not know survive a read_records()/write_records() round trip. Hold
+        locked() around both to keep other writers out in between.
+        
+        Args:
+            file_path: File to read. Defaults to the current tasks file.
+        
+        Returns:
+            The decoded data: a list of task records or a {"tasks": [...]}
+            dict, or an empty list if the file does not exist or is empty
+        
+        Raises:
+            json.JSONDecodeError: If the file is not valid JSON
+        """
+        path = Path(file_path) if file_path else self.tasks_file
+        if ndjson.is_ndjson(path):
+            return list(self._iter_file_records(path))
+        raw = read_bytes(path) if path.exists() else b""
+        data = json.loads(raw) if raw.strip() else []
+        
+        journal = self.get_journal() if path == self.tasks_file else TaskJournal(path)
+        if journal.exists():
+            records = data["tasks"] if isinstance(data, dict) and "tasks" in data else data
+            records[:] = journal.replay(records)
+        return data
+    
+    def write_records(self, data: Any, file_path: Optional[str] = None) -> None:
+        """
+        Replace a task file with raw task data read by read_records().
+        
+        The data is written as it is, keeping unknown fields and the
+        {"tasks": [...]} layout, and the file's journal is cleared since
+        read_records() applied it. The file version is incremented.
+        
+        Args:
+            data: A list of task records or a {"tasks": [...]} dict
+            file_path: File to write. Defaults to the current tasks file.
+        """
+        path = Path(file_path) if file_path else self.tasks_file
+        with self.locked(path):
+            if ndjson.is_ndjson(path):
+                encoded = ndjson.encode_lines(data, self._dump_line)
+                self._ndjson_lines[path] = len(data)
+            else:
+                encoded = compress(json.dumps(data, indent=2).encode("utf-8"), detect_compression(path))
+            with atomic_open(path, 'wb', fsync=self.fsync, fsync_dir=self.fsync_dir) as f:
+                f.write(encoded)
+            
+            if path not in self._journals:
+                self._journals[path] = TaskJournal(path)
+            self._journals[path].clear()
+            self._bump_version(path)
+        
+        # Cached tasks and fragments describe the replaced contents
+        self._task_cache.pop(path, None)
+        self._fragments.pop(path, None)
+    
+    def iter_tasks(self, file_path: Optional[str] = None) -> Iterator[Task]:
+        """
+        Stream tasks from a task file one at a time.
+        
+        Unlike load_tasks, the whole file is never decoded at once, which
+        keeps counting, filtering and exporting very large files in bounded
+        memory. Already cached tasks are yielded without touching the disk.
+        
+        Args:
+            file_path: File to read. Defaults to the current tasks file.
+            
+        Yields:
+            Task objects in file order
+        """
+        path = Path(file_path) if file_path else self.tasks_file
+        if path == self.tasks_file:
+            cached = self._task_cache.get(path)
+            if cached is not None and cached[0] == self._cache_signature():
+                self.cache_hits += 1
+                yield from list(cached[1])
+                return
+        
+        for task_data in self.iter_task_records(file_path):
+            yield Task.from_dict(task_data)
+    
+    def find_tasks(self, **criteria) -> List[Task]:
+        """
+        Find tasks whose fields equal all of the given values.
+        
+        Args:
+            **criteria: Field/value pairs to match, e.g. status="pending".
+                A list, tuple, set or range matches any of its values, e.g.
+                priority=[4, 5]. Supported fields are listed in QUERY_FIELDS.
+                
+        Returns:
+            The matching tasks, in file order
+        """
+        unknown = set(criteria) - set(self.QUERY_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot query tasks by: {', '.join(sorted(unknown))}")
+        
+        allowed = {field: set(value) if isinstance(value, MULTI_VALUE_TYPES) else {value}
+                   for field, value in criteria.items()}
+        return [task for task in self.load_tasks()
+                if all(getattr(task, field) in values for field, values in allowed.items())]
+    
+    def get_journal(self) -> TaskJournal:
+        """Get the mutation journal for the current tasks file."""
+        if self.tasks_file not in self._journals:
+            self._journals[self.tasks_file] = TaskJournal(self.tasks_file)
+        return self._journals[self.tasks_file]
+    
+    def persist_create(self, tasks: List[Task], task: Task) -> None:
+        """
+        Persist a newly created task.
+        
+        Args:
+            tasks: The full task list, already containing the new task
+            task: The task that was created
+        """
+        self._persist_mutation(tasks, {"op": "create", "task": task.to_dict()})
+    
+    def persist_update(self, tasks: List[Task], task: Task) -> None:
+        """
+        Persist changes made to a single task.
+        
+        Args:
+            tasks: The full task list, already containing the updated task
+            task: The task that was updated
+        """
+        self._persist_mutation(tasks, {"op": "update", "task": task.to_dict()})
+    
+    def persist_delete(self, tasks: List[Task], removed: List[Task]) -> None:
+        """
+        Persist the removal of one or more tasks.
+        
+        Args:
+            tasks: The full task list, without the removed tasks
+            removed: The tasks that were deleted
+        """
+        self._persist_mutation(tasks, {"op": "delete", "uuids": [task.uuid for task in removed]})
+    
+    def persist_batch(self, tasks: List[Task], changed: List[Task], removed: List[Task]) -> None:
+        """
+        Persist many created, updated and removed tasks with a single save.
+        
+        The tasks file is rewritten once, which also folds in the journal.
+        This implementation only uses the full list: save_tasks() finds the
+        changed tasks itself and serializes and validates only those.
+        Handlers storing tasks by row or shard use changed and removed.
+        
+        Args:
+            tasks: The full task list, with every change applied
+            changed: The tasks that were created or updated; unused here
+            removed: The tasks that were deleted; unused here
+            
+        Raises:
+            StaleVersionError: If another writer changed the file since it was loaded
+        """
+        with self.locked():
+            self._check_version()
+            self.save_tasks(tasks)
+    
+    def compact_journal(self) -> None:
+        """Fold the journal into the tasks file and remove it."""
+        # Hold the lock so entries appended by other processes are not dropped
+        with self.locked():
+            if self.get_journal().exists():
+                self.save_tasks(self.load_tasks())
+    
+    def _persist_mutation(self, tasks: List[Task], entry: Dict[str, Any]) -> None:
+        """
+        Append a mutation to the journal, or rewrite the file when journaling is off.
+        
+        Raises:
+            StaleVersionError: If another writer changed the file since it was loaded
+        """
+        with self.locked():
+            self._check_version()
+            
+            journal = self.get_journal()
+            stable_uuids = self._stable_uuids.get(self.tasks_file, not self.tasks_file.exists())
+            
+            # NDJSON files record the change themselves as appended lines
+            if (stable_uuids and self.tasks_file not in self._pending_saves
+                    and ndjson.is_ndjson(self.tasks_file)):
+                if "task" in entry and self.schema_file.exists():
+                    self.validate_against_schema([entry["task"]])
+                lines = [entry["task"]] if "task" in entry else [ndjson.tombstone(u) for u in entry["uuids"]]
+                self.append_records(lines)
+                self._stable_uuids[self.tasks_file] = True
+                self._update_cache(tasks)
+                self._maybe_compact_ndjson(len(tasks))
+                return
+            
+            if (not self.journal_enabled or not stable_uuids or self.tasks_file in self._pending_saves
+                    or journal.entry_count + 1 >= self.compact_threshold):
+                self.save_tasks(tasks)
+                return
+            
+            # Validate the changed record against schema if available
+            if "task" in entry and self.schema_file.exists():
+                self.validate_against_schema([entry["task"]])
             
-        return [Task.from_dict(task_data) for task_data in tasks_data]
+            journal.append(entry)
+            self._bump_version(self.tasks_file)
+            self._update_cache(tasks)
     
-    def validate_against_schema(self, tasks_data: List[Dict[str, Any]]) -> Tuple[bool, str]:
+    def append_records(self, records: List[Dict[str, Any]], file_path: Optional[str] = None) -> None:
+        """
+        Append raw lines to an NDJSON tasks file with a single write.
+        
+        Appending never conflicts with other writers, so no version check is
+        made; the file version is still incremented.
+        
+        Args:
+            records: Task records (or tombstones) to append
+            file_path: The NDJSON file. Defaults to the current tasks file.
+        """
+        path = Path(file_path) if file_path else self.tasks_file
+        with self.locked(path):
+            if not path.exists():
+                self._ndjson_lines[path] = 0
+            ndjson.append_lines(path, ndjson.encode_lines(records, self._dump_line), fsync=self.fsync)
+            if path in self._ndjson_lines:
+                self._ndjson_lines[path] += len(records)
+            self._bump_version(path)
+    
+    def _dump_line(self, record: Dict[str, Any]) -> bytes:
+        """Serialize one NDJSON line."""
+        return self.codec.dumps(record, compact=True)
+    
+    def _maybe_compact_ndjson(self, live_count: int) -> None:
+        """Compact the current NDJSON file in the background once most of its lines are superseded."""
+        path = self.tasks_file
+        superseded = self._ndjson_lines.get(path, 0) - live_count
+        if superseded >= self.compact_threshold and superseded > live_count and path not in self._compacting:
+            self._compacting.add(path)
+            threading.Thread(target=self.compact_ndjson, args=(path,), daemon=True).start()
+    
+    def compact_ndjson(self, file_path: Optional[str] = None) -> None:
+        """
+        Rewrite an NDJSON file with a single line per live task.
+        
+        Args:
+            file_path: The NDJSON file. Defaults to the current tasks file.
+        """
+        path = Path(file_path) if file_path else self.tasks_file
+        try:
+            with self.locked(path):
+                if not ndjson.is_ndjson(path):
+                    return
+                # Cached tasks stay valid, since compaction does not change them
+                cached = self._task_cache.get(path) if path == self.tasks_file else None
+                fresh = cached is not None and cached[0] == self._cache_signature()
+                
+                with open(path, 'r', encoding="utf-8") as f:
+                    records = ndjson.resolve(ndjson.iter_lines(f))
+                with atomic_open(path, 'wb', fsync=self.fsync) as f:
+                    f.write(ndjson.encode_lines(records, self._dump_line))
+                self._ndjson_lines[path] = len(records)
+                
+                if fresh:
+                    self._task_cache[path] = (self._cache_signature(),) + cached[1:]
+        finally:
+            self._compacting.discard(path)
+    
+    @contextmanager
+    def locked(self, path: Optional[Path] = None) -> Iterator[None]:
+        """
+        Hold the exclusive inter-process write lock of a tasks file.
+        
+        The lock is an advisory fcntl lock on a ``.lock`` file next to the tasks
+        file, since saves replace the tasks file itself. Only writers take it;
+        readers rely on saves being atomic renames. The lock is reentrant
+        within this handler.
+        
+        Args:
+            path: The tasks file to lock. Defaults to the current tasks file.
+        """
+        path = Path(path) if path else self.tasks_file
+        with self._commit_lock:
+            if path in self._lock_fds:
+                yield
+                return
+            
+            fd = os.open(str(self._lock_path(path)), os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                self._lock_fds[path] = fd
+                yield
+            finally:
+                self._lock_fds.pop(path, None)
+                # Closing the descriptor releases the lock
+                os.close(fd)
+    
+    @staticmethod
+    def _lock_path(path: Path) -> Path:
+        """Get the lock file of a tasks file."""
+        return path.with_name(path.name + ".lock")
+    
+    @staticmethod
+    def _version_path(path: Path) -> Path:
+        """Get the version file of a tasks file."""
+        return path.with_name(path.name + ".version")
+    
+    def file_version(self, path: Optional[Path] = None) -> int:
+        """
+        Get the current version of a tasks file.
+        
+        Every write through a FileHandler, in any process, increments the version.
+        
+        Args:
+            path: The tasks file. Defaults to the current tasks file.
+            
+        Returns:
+            The version number, 0 if the file was never written with versioning
+        """
+        path = Path(path) if path else self.tasks_file
+        try:
+            return int(self._version_path(path).read_text())
+        except (OSError, ValueError):
+            return 0
+    
+    @property
+    def loaded_version(self) -> Optional[int]:
+        """The version of the current tasks file observed by the last load, if any."""
+        return self._loaded_versions.get(self.tasks_file)
+    
+    def _check_version(self) -> None:
+        """Ensure the current tasks file was not changed since it was loaded."""
+        loaded = self._loaded_versions.get(self.tasks_file)
+        current = self.file_version()
+        if loaded is not None and loaded != current:
+            # The cached tasks are outdated as well
+            self._task_cache.pop(self.tasks_file, None)
+            raise StaleVersionError(
+                f"{self.tasks_file} changed from version {loaded} to {current} since it was loaded"
+            )
+    
+    def _bump_version(self, path: Path) -> None:
+        """Increment the version of a tasks file. Must be called with the lock held."""
+        version = self.file_version(path) + 1
+        with atomic_open(self._version_path(path), 'w', fsync=self.fsync) as f:
+            f.write(str(version))
+        self._loaded_versions[path] = version
+    
+    def validate_against_schema(self, tasks_data: List[Dict[str, Any]], partial: bool = False) -> Tuple[bool, str]:
         """
         Validate tasks data against the JSON schema.
         
         Args:
             tasks_data: List of task dictionaries to validate
+            partial: tasks_data holds only the records changed since the last
+                validation. Constraints on the list as a whole are then not
+                checked, and earlier records stay known as valid.
             
         Returns:
             A tuple of (is_valid, message) where:
@@ -65,24 +993,135 @@ class FileHandler:
             return True, "No schema file found for validation"
         
         try:
-            with open(self.schema_file, 'r') as f:
-                schema = json.load(f)
+            validator, array_validator, item_validator = self._get_schema_validators()
             
-            jsonschema.validate(instance=tasks_data, schema=schema)
+            if self.incremental_validation and item_validator is not None:
+                # Check the list itself, then only the records not seen before
+                if not partial:
+                    array_validator.validate(tasks_data)
+                validated = set()
+                try:
+                    for task_data in tasks_data:
+                        digest = self._task_digest(task_data)
+                        if digest not in self._validated_digests:
+                            item_validator.validate(task_data)
+                        validated.add(digest)
+                except jsonschema.exceptions.ValidationError:
+                    self._validated_digests |= validated
+                    raise
+                self._validated_digests = self._validated_digests | validated if partial else validated
+            else:
+                validator.validate(tasks_data)
             return True, "Tasks data is valid according to the schema"
         except jsonschema.exceptions.ValidationError as e:
             return False, f"Schema validation error: {str(e)}"
         except Exception as e:
             return False, f"Error during schema validation: {str(e)}"
     
-    def backup_tasks(self) -> None:
-        """Create a backup of the tasks file."""
-        if not self.tasks_file.exists():
-            return
+    def _get_schema_validators(self) -> Tuple[Any, Any, Any]:
+        """
+        Get the compiled schema validators, rebuilding them if the schema file changed.
+        
+        Returns:
+            A tuple of (validator, array_validator, item_validator) where the
+            last two are None unless the schema validates each list item with
+            a self-contained "items" schema
+        """
+        key = (self.schema_file, self.schema_file.stat().st_mtime_ns)
+        if self._schema_validators is None or self._schema_validators[0] != key:
+            with open(self.schema_file, 'r') as f:
+                schema = json.load(f)
+            
+            validator_cls = jsonschema.validators.validator_for(schema)
+            validator_cls.check_schema(schema)
+            array_validator = item_validator = None
+            
+            # Items using $ref need the full schema to resolve, so they are
+            # always validated as part of the whole list
+            items = schema.get("items") if isinstance(schema, dict) else None
+            if isinstance(items, dict) and '"$ref"' not in json.dumps(items):
+                array_validator = validator_cls({k: v for k, v in schema.items() if k != "items"})
+                item_validator = validator_cls(items)
+            
+            self._schema_validators = (key, validator_cls(schema), array_validator, item_validator)
+            self._validated_digests = set()
+        
+        return self._schema_validators[1:]
+    
+    @staticmethod
+    def _task_digest(task_data: Any) -> bytes:
+        """Hash the serialized form of a task record."""
+        serialized = json.dumps(task_data, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.blake2b(serialized.encode("utf-8"), digest_size=16).digest()
+    
+    def get_backup_store(self, compression: Optional[str] = "gzip") -> BackupStore:
+        """Get the incremental backup store of the directory holding the tasks file."""
+        return BackupStore(self.tasks_file.parent / BACKUP_DIR_NAME, compression=compression, fsync=self.fsync)
+    
+    def backup_tasks(self, compression: Optional[str] = "gzip") -> Optional[str]:
+        """
+        Record an incremental backup point of the tasks file.
+        
+        Only the chunks of tasks that changed since earlier backups are
+        written; if the file is unchanged since its latest backup, no new
+        point is recorded.
+        
+        Args:
+            compression: "gzip", "zstd" or None, used for newly stored chunks.
+            
+        Returns:
+            The id of the backup point, or None if there is no tasks file
+        """
+        self.flush()
+        with self.locked():
+            if not self.tasks_file.exists():
+                return None
+            # Journaled changes are not in the file's bytes, so such files are always chunked
+            if self.tasks_file.is_file() and not self.get_journal().exists():
+                source_hash = content_hash(read_bytes(self.tasks_file))
+            else:
+                source_hash = None
+            return self.get_backup_store(compression).backup(
+                self.tasks_file.name, self.iter_task_records(str(self.tasks_file)), source_hash)
+    
+    def list_backups(self) -> List[Dict[str, Any]]:
+        """List the backup points of the tasks file, oldest first."""
+        return self.get_backup_store().list_backups(self.tasks_file.name)
+    
+    def restore_backup(self, backup_id: Optional[str] = None) -> List[Task]:
+        """
+        Replace the tasks with those of a backup point.
         
-        backup_file = self.data_dir / f"tasks_backup_{int(time.time())}.json"
-        import shutil
-        shutil.copy2(self.tasks_file, backup_file)
+        The current tasks are backed up first, so a restore can be undone.
+        
+        Args:
+            backup_id: The backup point. Defaults to the latest one.
+            
+        Returns:
+            The restored tasks
+            
+        Raises:
+            KeyError: If there is no such backup point
+        """
+        records = self.get_backup_store().restore(self.tasks_file.name, backup_id)
+        tasks = Task.from_dicts(records)
+        with self.locked():
+            self.backup_tasks()
+            self.save_tasks(tasks)
+        return tasks
+    
+    def prune_backups(self, keep_hourly: int = KEEP_HOURLY, keep_daily: int = KEEP_DAILY) -> List[str]:
+        """
+        Apply the backup retention policy to the tasks file's backups.
+        
+        Args:
+            keep_hourly: Hours during which one backup per hour is kept.
+            keep_daily: Days during which one backup per day is kept.
+            
+        Returns:
+            The ids of the removed backup points
+        """
+        return self.get_backup_store().prune(self.tasks_file.name, keep_hourly, keep_daily)
     
     def list_task_files(self, directory: Optional[str] = None) -> tuple[List[Path], int]:
         """
@@ -103,10 +1142,78 @@ class FileHandler:
             search_dir.mkdir(parents=True, exist_ok=True)
             return [], 0
         
-        # Find all JSON files in the directory
-        json_files = sorted([f for f in search_dir.glob("*.json")])
+        # Find all JSON files in the directory, compressed or not
+        # Hidden files such as the task catalog are not task files
+        json_files = sorted([
+            f for f in search_dir.iterdir()
+            if f.is_file() and not f.name.startswith(".")
+            and (is_task_file_name(f.name) or f.suffix in ndjson.EXTENSIONS)
+            and not LEGACY_BACKUP_NAME.match(f.name)
+        ])
+        
+        # Bring the catalog up to date, re-reading only files that changed
+        catalog = self.get_catalog(search_dir)
+        for json_file in json_files:
+            entry = catalog.lookup(json_file)
+            if entry is None or "content_hash" not in entry:
+                self._catalog_file(catalog, json_file)
+        catalog.prune([f.name for f in json_files])
+        catalog.save()
+        
         return json_files, len(json_files)
     
+    def get_file_info(self, file_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get the catalog entry of a task file, refreshing it if the file changed.
+        
+        Args:
+            file_path: Path to the task file. Defaults to the current tasks file.
+            
+        Returns:
+            A dictionary with task_count, total_records, statuses (a histogram
+            of valid tasks per status), content_hash, mtime_ns, size, valid and
+            schema_valid (None when there is no schema)
+        """
+        path = Path(file_path) if file_path else self.tasks_file
+        catalog = self.get_catalog(path.parent)
+        entry = catalog.lookup(path)
+        if entry is None or "content_hash" not in entry:
+            entry = self._catalog_file(catalog, path)
+            catalog.save()
+        return entry
+    
+    def _catalog_file(self, catalog: TaskCatalog, path: Path) -> Dict[str, Any]:
+        """Recompute and store the catalog entry of a single file."""
+        if not path.exists():
+            return {"task_count": 0, "total_records": 0, "statuses": {}, "content_hash": None,
+                    "valid": False, "schema_valid": None}
+        
+        hasher = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(block)
+        content_hash = hasher.hexdigest()
+        
+        # A touched but unchanged file keeps its metadata
+        previous = catalog.entries.get(path.name)
+        if previous and previous.get("content_hash") == content_hash:
+            return catalog.update(path, **{k: v for k, v in previous.items() if k not in ("mtime_ns", "size")})
+        
+        statuses: Dict[str, int] = {}
+        records: Optional[List[Any]] = [] if self.schema_file.exists() else None
+        is_valid, _, task_count, total = self._validate_task_file(str(path), statuses=statuses, records=records)
+        schema_valid = self.validate_against_schema(records)[0] if is_valid and records is not None else None
+        
+        return catalog.update(
+            path,
+            task_count=task_count if is_valid else 0,
+            total_records=total,
+            statuses=statuses,
+            content_hash=content_hash,
+            valid=is_valid,
+            schema_valid=schema_valid
+        )
+    
     def validate_task_file(self, file_path: str) -> tuple[bool, str, int]:
         """
         Validate if a file contains valid task data.
@@ -120,50 +1227,66 @@ class FileHandler:
             - message: A message explaining the validation result
             - task_count: Number of tasks in the file if valid, 0 otherwise
         """
+        return self._validate_task_file(file_path)[:3]
+    
+    def _validate_task_file(self, file_path: str, statuses: Optional[Dict[str, int]] = None,
+                            records: Optional[List[Any]] = None) -> Tuple[bool, str, int, int]:
+        """
+        Validate a task file, optionally collecting a status histogram and the raw records.
+        
+        Args:
+            file_path: Path to the file to validate.
+            statuses: Dictionary to fill with the number of valid tasks per status.
+            records: List to fill with every raw task record.
+            
+        Returns:
+            The (is_valid, message, task_count) tuple of validate_task_file,
+            followed by the total number of records read
+        """
         path = Path(file_path)
         
         # Check if file exists
         if not path.exists():
-            return False, f"File does not exist: {file_path}", 0
+            return False, f"File does not exist: {file_path}", 0, 0
         
+        total_count = 0
         try:
-            # Try to load the file as JSON
-            with open(path, 'r') as f:
-                data = json.load(f)
-            
-            # Check if it's a list or a dict with a 'tasks' key
-            tasks_data = data.get("tasks", data) if isinstance(data, dict) else data
-            
-            # Verify it's a list
-            if not isinstance(tasks_data, list):
-                return False, f"File does not contain a list of tasks: {file_path}", 0
-            
-            # If the list is empty, it's still valid but has 0 tasks
-            if not tasks_data:
-                return True, f"File contains an empty task list: {file_path}", 0
-            
-            # Count the number of valid tasks
+            # Stream the records so large files are checked in bounded memory
             valid_task_count = 0
-            for task in tasks_data:
+            if not path.stat().st_size:
+                return True, f"File contains an empty task list: {file_path}", 0, 0
+            for task in self._iter_file_records(path):
+                total_count += 1
+                if records is not None:
+                    records.append(task)
                 # Check if it has the minimum required fields
                 if isinstance(task, dict) and ('title' in task or 'id' in task):
                     valid_task_count += 1
+                    if statuses is not None:
+                        status = str(task.get("status", "pending"))
+                        statuses[status] = statuses.get(status, 0) + 1
+            
+            # If the list is empty, it's still valid but has 0 tasks
+            if total_count == 0:
+                return True, f"File contains an empty task list: {file_path}", 0, 0
             
             # If no valid tasks were found, return an error
             if valid_task_count == 0:
-                return False, f"No valid tasks found in file: {file_path}", 0
+                return False, f"No valid tasks found in file: {file_path}", 0, total_count
             
             # If some tasks are valid but not all, provide a warning
-            if valid_task_count < len(tasks_data):
-                return True, f"File contains {valid_task_count} valid tasks (out of {len(tasks_data)}): {file_path}", valid_task_count
+            if valid_task_count < total_count:
+                return True, f"File contains {valid_task_count} valid tasks (out of {total_count}): {file_path}", valid_task_count, total_count
             
             # All tasks are valid
-            return True, f"File contains {valid_task_count} valid tasks: {file_path}", valid_task_count
+            return True, f"File contains {valid_task_count} valid tasks: {file_path}", valid_task_count, total_count
             
+        except NotATaskListError:
+            return False, f"File does not contain a list of tasks: {file_path}", 0, total_count
         except json.JSONDecodeError:
-            return False, f"File contains invalid JSON: {file_path}", 0
-        except (IOError, KeyError, TypeError) as e:
-            return False, f"Error validating file: {file_path} - {str(e)}", 0
+            return False, f"File contains invalid JSON: {file_path}", 0, total_count
+        except (IOError, EOFError, KeyError, TypeError, ImportError) as e:
+            return False, f"Error validating file: {file_path} - {str(e)}", 0, total_count
     
     def get_task_count(self, file_path: str) -> int:
         """
@@ -175,5 +1298,21 @@ class FileHandler:
         Returns:
             Number of tasks in the file, or 0 if the file is invalid.
         """
-        is_valid, _, task_count = self.validate_task_file(file_path)
-        return task_count if is_valid else 0
+        # Counts come from a validated catalog entry, so a malformed file
+        # is validated once and then counted as 0 until it changes
+        return self.get_file_info(file_path)["task_count"]
+    
+    def get_catalog(self, directory: Optional[Path] = None) -> TaskCatalog:
+        """
+        Get the task file catalog for a directory.
+        
+        Args:
+            directory: Directory of the catalog. Defaults to self.data_dir.
+            
+        Returns:
+            The catalog, shared between calls for the same directory
+        """
+        directory = Path(directory) if directory else self.data_dir
+        if directory not in self._catalogs:
+            self._catalogs[directory] = TaskCatalog(directory)
+        return self._catalogs[directory]
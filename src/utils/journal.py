@@ -0,0 +1,150 @@
+"""
+Append-only mutation journal for the Thoughtful Task Manager.
+
+The journal lives next to a tasks file (``tasks.json.journal``) and records
+every create, update and delete as one JSON line. Loading a tasks file replays
+its journal on top of the snapshot, so the state after a crash is exactly the
+state after the last fully written line.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Optional
+
+class TaskJournal:
+    """Write-ahead journal of task mutations for a single tasks file."""
+
+    SUFFIX = ".journal"
+
+    def __init__(self, tasks_file: Path, fsync: bool = True):
+        """
+        Initialize the journal for a tasks file.
+
+        Args:
+            tasks_file: Path to the snapshot file the journal belongs to.
+            fsync: Whether to fsync the journal after every appended entry.
+        """
+        self.tasks_file = Path(tasks_file)
+        self.path = self.tasks_file.with_name(self.tasks_file.name + self.SUFFIX)
+        self.fsync = fsync
+        self._entry_count = None
+
+    @property
+    def entry_count(self) -> int:
+        """Number of entries currently in the journal."""
+        if self._entry_count is None:
+            self._entry_count = sum(1 for _ in self.read_entries())
+        return self._entry_count
+
+    def exists(self) -> bool:
+        """Check whether the journal file exists."""
+        return self.path.exists()
+
+    def append(self, entry: Dict[str, Any]) -> None:
+        """
+        Append a single mutation entry to the journal.
+
+        Args:
+            entry: The mutation record, e.g. {"op": "update", "task": {...}}
+        """
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with open(self.path, 'a+b') as f:
+            # Start on a fresh line if a previous write was torn mid-line
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(line.encode("utf-8"))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._entry_count = self.entry_count + 1
+
+    def read_entries(self) -> Iterator[Dict[str, Any]]:
+        """
+        Read all complete entries from the journal.
+
+        Lines that cannot be decoded (e.g. a write torn by a crash) are skipped,
+        since the mutation they describe was never acknowledged.
+        """
+        if not self.path.exists():
+            return
+
+        with open(self.path, 'r', encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict) and "op" in entry:
+                    yield entry
+
+    def replay(self, tasks_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Apply the journal on top of snapshot task records.
+
+        Entries are keyed on the task uuid and are idempotent, so replaying a
+        journal that was already folded into the snapshot is harmless.
+
+        Args:
+            tasks_data: Task dictionaries loaded from the snapshot
+
+        Returns:
+            The task dictionaries reflecting every journaled mutation
+        """
+        return list(self.overlay(tasks_data))
+
+    def overlay(self, records: Iterable[Any]) -> Iterator[Any]:
+        """
+        Lazily apply the journal to a stream of snapshot task records.
+
+        Only the journal is held in memory; snapshot records are passed
+        through, replaced or dropped one at a time, and tasks created after
+        the snapshot are yielded once the snapshot is exhausted.
+
+        Args:
+            records: Task dictionaries in snapshot order
+
+        Yields:
+            The task dictionaries reflecting every journaled mutation
+        """
+        # Reduce the journal to the final record (or None if deleted) per uuid
+        final: Dict[str, Optional[Dict[str, Any]]] = {}
+        unkeyed: List[Dict[str, Any]] = []
+        for entry in self.read_entries():
+            op = entry["op"]
+            if op in ("create", "update"):
+                task = entry.get("task") or {}
+                if task.get("uuid"):
+                    final[task["uuid"]] = task
+                else:
+                    unkeyed.append(task)
+            elif op == "delete":
+                for task_uuid in entry.get("uuids", []):
+                    final[task_uuid] = None
+
+        # Only the first snapshot record carrying a uuid is affected
+        seen = set()
+        for record in records:
+            task_uuid = record.get("uuid") if isinstance(record, dict) else None
+            if task_uuid in final and task_uuid not in seen:
+                seen.add(task_uuid)
+                if final[task_uuid] is not None:
+                    yield final[task_uuid]
+            else:
+                yield record
+
+        for task_uuid, task in final.items():
+            if task_uuid not in seen and task is not None:
+                yield task
+        yield from unkeyed
+
+    def clear(self) -> None:
+        """Remove the journal once its entries are part of the snapshot."""
+        if self.path.exists():
+            self.path.unlink()
+        self._entry_count = 0
@@ -0,0 +1,156 @@
+"""
+Streaming JSON reader for task files.
+
+Task files are either a bare list of tasks or an object with a "tasks" list.
+The reader walks the file in fixed-size chunks and decodes one task record at
+a time, so memory use stays bounded by the size of a single record rather
+than the size of the file.
+"""
+
+import json
+from typing import Any, Iterator, TextIO
+
+WHITESPACE = " \t\n\r"
+
+class NotATaskListError(ValueError):
+    """Raised when a well-formed JSON document does not hold a list of tasks."""
+    pass
+
+class _ChunkReader:
+    """Buffered cursor over a text stream that decodes one JSON value at a time."""
+
+    def __init__(self, fp: TextIO, chunk_size: int):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Read another chunk, dropping everything already consumed."""
+        if self._eof:
+            return False
+        chunk = self._fp.read(self._chunk_size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        """Build a decode error pointing at the current position."""
+        return json.JSONDecodeError(message, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        """Consume the given structural character."""
+        if self.peek() != char:
+            raise self.error(f"Expecting '{char}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number or literal ending at the buffer edge may continue in the next chunk
+            if end == len(self._buf) and not self._eof and not isinstance(obj, (dict, list, str)):
+                self._fill()
+                continue
+            self._pos = end
+            return obj
+
+    def items(self) -> Iterator[Any]:
+        """Yield the elements of the array starting at the cursor."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            char = self.peek()
+            self._pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                self._pos -= 1
+                raise self.error("Expecting ',' delimiter")
+
+    def end(self) -> None:
+        """Ensure nothing but whitespace follows the document."""
+        if self.peek():
+            raise self.error("Extra data")
+
+def iter_task_records(fp: TextIO, chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """
+    Yield task records one at a time from a task file.
+
+    Args:
+        fp: Text stream positioned at the start of the document
+        chunk_size: Number of characters to read at a time
+
+    Yields:
+        Each element of the task list, as decoded by the json module
+
+    Raises:
+        json.JSONDecodeError: If the document is not well-formed JSON
+        NotATaskListError: If the document does not contain a list of tasks
+    """
+    reader = _ChunkReader(fp, chunk_size)
+    first = reader.peek()
+
+    if first == "[":
+        yield from reader.items()
+        reader.end()
+        return
+
+    if first != "{":
+        reader.value()
+        reader.end()
+        raise NotATaskListError("Document is not a list of tasks")
+
+    # Walk the object's keys and stream the "tasks" value when it is reached
+    reader.expect("{")
+    found_tasks = False
+    if reader.peek() == "}":
+        reader.expect("}")
+    else:
+        while True:
+            key = reader.value()
+            if not isinstance(key, str):
+                raise reader.error("Expecting property name enclosed in double quotes")
+            reader.expect(":")
+            if key == "tasks" and reader.peek() == "[":
+                found_tasks = True
+                yield from reader.items()
+            elif key == "tasks":
+                reader.value()
+                raise NotATaskListError("The 'tasks' value is not a list")
+            else:
+                reader.value()
+
+            if reader.peek() == ",":
+                reader.expect(",")
+                continue
+            reader.expect("}")
+            break
+    reader.end()
+
+    if not found_tasks:
+        raise NotATaskListError("Document has no 'tasks' list")
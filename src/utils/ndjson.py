@@ -0,0 +1,143 @@
+"""
+Line-delimited (NDJSON) task files.
+
+Besides a JSON list and a {"tasks": [...]} object, a task file may hold one
+JSON object per line. Creating a task appends its record; updating it
+appends the new version, which supersedes earlier lines with the same uuid;
+deleting it appends a tombstone line ``{"$deleted": "<uuid>"}``. Every change
+is therefore a single append, and the file is compacted (rewritten with one
+line per live task) once superseded lines pile up.
+
+NDJSON files are recognized by a ``.ndjson`` or ``.jsonl`` extension, or by a
+first line that is a complete JSON object other than a {"tasks": [...]} wrapper.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+TOMBSTONE_KEY = "$deleted"
+EXTENSIONS = (".ndjson", ".jsonl")
+
+# Bytes read when sniffing a file's first line
+SNIFF_BYTES = 64 * 1024
+
+def is_ndjson(path: Path) -> bool:
+    """
+    Check whether a task file uses the line-delimited layout.
+
+    Args:
+        path: Path to the task file
+
+    Returns:
+        True for NDJSON files, False for JSON documents and missing files
+        without an NDJSON extension
+    """
+    path = Path(path)
+    if path.suffix in EXTENSIONS:
+        return True
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        return False
+
+    first_line = head.lstrip().split(b"\n", 1)[0].strip()
+    if not first_line.startswith(b"{"):
+        return False
+    try:
+        record = json.loads(first_line)
+    except ValueError:
+        # An opening brace alone, or a record longer than the sniffed bytes
+        return False
+    return isinstance(record, dict) and not isinstance(record.get("tasks"), list)
+
+def tombstone(task_uuid: str) -> Dict[str, str]:
+    """Build the line that deletes a task."""
+    return {TOMBSTONE_KEY: task_uuid}
+
+def iter_lines(fp: TextIO) -> Iterator[Dict[str, Any]]:
+    """
+    Decode the objects of an NDJSON stream.
+
+    Lines that cannot be decoded are skipped: a crash can only tear the line
+    being appended, whose change was never acknowledged.
+    """
+    for line in fp:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(record, dict):
+            yield record
+
+def resolve(lines: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Reduce NDJSON lines to the live task records.
+
+    Each task keeps the position of its first line and the contents of its
+    last one; tombstoned tasks are dropped. Records without a uuid cannot be
+    superseded and are kept as written.
+
+    Args:
+        lines: Decoded lines in file order
+
+    Returns:
+        The live task records in order
+    """
+    slots: List[Any] = []
+    latest: Dict[str, Optional[Dict[str, Any]]] = {}
+    for record in lines:
+        if TOMBSTONE_KEY in record:
+            if record[TOMBSTONE_KEY] in latest:
+                latest[record[TOMBSTONE_KEY]] = None
+            continue
+        task_uuid = record.get("uuid")
+        if not task_uuid:
+            slots.append(record)
+            continue
+        if task_uuid not in latest:
+            slots.append(task_uuid)
+        latest[task_uuid] = record
+
+    return [latest[slot] if isinstance(slot, str) else slot
+            for slot in slots
+            if not isinstance(slot, str) or latest[slot] is not None]
+
+def encode_lines(records: Iterable[Dict[str, Any]], dumps) -> bytes:
+    """
+    Serialize records as NDJSON.
+
+    Args:
+        records: Objects to write, one per line
+        dumps: Function serializing one object to compact JSON bytes
+    """
+    return b"".join(dumps(record) + b"\n" for record in records)
+
+def append_lines(path: Path, data: bytes, fsync: bool = True) -> None:
+    """
+    Append encoded lines to an NDJSON file with a single write.
+
+    Args:
+        path: The NDJSON file, created if missing
+        data: Complete lines, each ending in a newline
+        fsync: Whether to fsync the file after writing
+    """
+    fd = os.open(str(path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        # Start on a fresh line if a previous append was torn mid-line
+        size = os.fstat(fd).st_size
+        if size:
+            with open(path, 'rb') as f:
+                f.seek(size - 1)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+        os.write(fd, data)
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,285 @@
+"""
+Sharded task storage for the Thoughtful Task Manager.
+
+A sharded store is a directory (``tasks.shards``) holding a manifest and N
+JSON task files. Every task lives in the shard chosen by a hash of its uuid,
+so a single-task mutation rewrites one shard instead of the whole task list,
+and shards are decoded in parallel on load.
+"""
+
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+from ..models.task import Task
+from .atomic_write import atomic_open
+from .file_handler import FileHandler, get_codec, gc_paused
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+def shard_index(task_uuid: str, shard_count: int) -> int:
+    """
+    Get the shard a task belongs to.
+
+    Args:
+        task_uuid: The task's uuid
+        shard_count: Number of shards in the store
+
+    Returns:
+        The shard number, stable across processes and Python versions
+    """
+    digest = hashlib.blake2b(task_uuid.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % shard_count
+
+def _digest(data: bytes) -> bytes:
+    """Fingerprint the encoded contents of a shard."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+def _load_shard(path: str, codec_name: str) -> Tuple[Optional[bytes], List[Task]]:
+    """Decode one shard file. Module-level so process pools can run it."""
+    if not os.path.exists(path):
+        return None, []
+    with open(path, 'rb') as f:
+        data = f.read()
+    with gc_paused():
+        records = get_codec(codec_name).loads(data) if data.strip() else []
+        return _digest(data), Task.from_dicts(records)
+
+class ShardedFileHandler(FileHandler):
+    """Stores tasks in a directory of hash-partitioned shard files."""
+
+    def __init__(self, data_dir: str = "data", store_name: str = "tasks.shards", shard_count: int = 16,
+                 workers: Optional[int] = None, executor: str = "thread", **kwargs):
+        """
+        Initialize the sharded handler.
+
+        Args:
+            data_dir: Directory holding the store and the schema.
+            store_name: Name of the store directory inside data_dir.
+            shard_count: Number of shards for a new store. An existing store
+                keeps the count recorded in its manifest.
+            workers: Maximum number of shards decoded at once. Defaults to
+                the executor's default.
+            executor: "thread" or "process". Process pools decode shards on
+                several cores but skip schema validation on load.
+            **kwargs: Further FileHandler options such as codec or fsync.
+        """
+        super().__init__(data_dir, **kwargs)
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor: {executor}")
+        self.tasks_file = self.data_dir / store_name
+        self.default_shard_count = shard_count
+        self.workers = workers
+        self.executor = executor
+        # Tasks per shard, holding the same objects as the task cache, and
+        # the fingerprint of each shard file as last read or written
+        self._shards: Dict[Path, List[List[Task]]] = {}
+        self._shard_digests: Dict[Path, List[Optional[bytes]]] = {}
+
+    @property
+    def manifest_file(self) -> Path:
+        """Path of the current store's manifest."""
+        return self.tasks_file / MANIFEST_NAME
+
+    def _read_manifest(self, store: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+        """Read a store's manifest, or None if the store does not exist."""
+        store = Path(store) if store else self.tasks_file
+        try:
+            with open(store / MANIFEST_NAME, 'r') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return manifest if manifest.get("version") == MANIFEST_VERSION else None
+
+    def _ensure_manifest(self) -> Dict[str, Any]:
+        """Get the current store's manifest, creating an empty store if needed."""
+        manifest = self._read_manifest()
+        if manifest is None:
+            manifest = {
+                "version": MANIFEST_VERSION,
+                "shard_count": self.default_shard_count,
+                "shards": [f"shard-{i:03d}.json" for i in range(self.default_shard_count)],
+            }
+            self.tasks_file.mkdir(parents=True, exist_ok=True)
+            with atomic_open(self.manifest_file, 'w', fsync=self.fsync) as f:
+                json.dump(manifest, f, indent=2)
+        return manifest
+
+    def _shard_paths(self, store: Optional[Path] = None) -> List[Path]:
+        """Paths of a store's shard files, in shard order."""
+        store = Path(store) if store else self.tasks_file
+        manifest = self._read_manifest(store)
+        return [store / name for name in manifest["shards"]] if manifest else []
+
+    def _cache_signature(self) -> Tuple:
+        """Build the stat() signature of the manifest and every shard."""
+        signature = []
+        for path in [self.manifest_file] + self._shard_paths():
+            try:
+                st = os.stat(path)
+                signature.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _read_tasks(self) -> List[Task]:
+        """Decode all shards in parallel and merge them into one list."""
+        paths = self._shard_paths()
+        if not paths:
+            # Partitioned on first write, once the manifest exists
+            self._shards.pop(self.tasks_file, None)
+            return []
+
+        pool_class = ProcessPoolExecutor if self.executor == "process" else ThreadPoolExecutor
+        with pool_class(max_workers=self.workers) as pool:
+            loaded = list(pool.map(_load_shard, [str(p) for p in paths], [self.codec.name] * len(paths)))
+        self._shard_digests[self.tasks_file] = [digest for digest, _ in loaded]
+        shards = [shard for _, shard in loaded]
+
+        if self.executor == "thread" and self.schema_file.exists():
+            self.validate_against_schema([task.to_dict() for shard in shards for task in shard])
+
+        self._shards[self.tasks_file] = shards
+        self._stable_uuids[self.tasks_file] = True
+        # Shards do not keep a global order, so tasks are listed in creation order
+        tasks = [task for shard in shards for task in shard]
+        tasks.sort(key=lambda task: task.created_date.timestamp())
+        return tasks
+
+    def _current_shards(self) -> List[List[Task]]:
+        """Get the per-shard task lists matching the cached tasks."""
+        self.load_tasks()
+        if self.tasks_file not in self._shards:
+            # The store is new; partition the cached tasks once
+            self._shards[self.tasks_file] = self._partition(self._task_cache[self.tasks_file][1])
+        return self._shards[self.tasks_file]
+
+    def _partition(self, tasks: List[Task]) -> List[List[Task]]:
+        """Split tasks into shards by uuid."""
+        shard_count = self._ensure_manifest()["shard_count"]
+        shards: List[List[Task]] = [[] for _ in range(shard_count)]
+        for task in tasks:
+            shards[shard_index(task.uuid, shard_count)].append(task)
+        return shards
+
+    def _write_shards(self, shards: List[List[Task]], indexes) -> None:
+        """
+        Rewrite the given shards if their encoded contents changed.
+        Must be called with the store lock held.
+        """
+        paths = self._shard_paths()
+        digests = self._shard_digests.setdefault(self.tasks_file, [None] * len(paths))
+        for i in sorted(set(indexes)):
+            if not shards[i] and not paths[i].exists():
+                # Empty shards are only written once they have held tasks
+                continue
+            tasks_data = [task.to_dict() for task in shards[i]]
+            encoded = self.codec.dumps(tasks_data, compact=self.compact)
+            digest = _digest(encoded)
+            if digest == digests[i] and paths[i].exists():
+                continue
+            if self.schema_file.exists():
+                self.validate_against_schema(tasks_data)
+            with atomic_open(paths[i], 'wb', fsync=self.fsync, fsync_dir=self.fsync_dir) as f:
+                f.write(encoded)
+            digests[i] = digest
+
+    def save_tasks(self, tasks: List[Task]) -> None:
+        """Replace the stored tasks, rewriting only shards whose contents changed."""
+        with self.locked():
+            shards = self._partition(tasks)
+            self._write_shards(shards, range(len(shards)))
+            self._bump_version(self.tasks_file)
+            self._shards[self.tasks_file] = shards
+            self._update_cache(tasks)
+
+    def persist_create(self, tasks: List[Task], task: Task) -> None:
+        """Write the new task to its shard."""
+        self._persist_shard_change(tasks, [task], [], created=True)
+
+    def persist_update(self, tasks: List[Task], task: Task) -> None:
+        """Rewrite the shard holding the updated task."""
+        self._persist_shard_change(tasks, [task], [])
+
+    def persist_delete(self, tasks: List[Task], removed: List[Task]) -> None:
+        """Rewrite the shards that held the removed tasks."""
+        self._persist_shard_change(tasks, [], removed)
+
+    def persist_batch(self, tasks: List[Task], changed: List[Task], removed: List[Task]) -> None:
+        """Rewrite the shards holding any of the changed or removed tasks."""
+        self._persist_shard_change(tasks, changed, removed)
+
+    def _persist_shard_change(self, tasks: List[Task], changed: List[Task], removed: List[Task],
+                              created: bool = False) -> None:
+        """
+        Apply created, updated and removed tasks to their shards.
+
+        A changed task missing from the shard of its uuid is new, or its uuid
+        changed; unless all changed tasks are known to be new, the shards are
+        searched for it, so it does not stay in the shard of its old uuid.
+
+        Raises:
+            StaleVersionError: If another writer changed the store since it was loaded
+        """
+        with self.locked():
+            self._check_version()
+            shards = self._current_shards()
+            shard_count = len(shards)
+            touched = []
+
+            for task in removed:
+                i = shard_index(task.uuid, shard_count)
+                shards[i] = [t for t in shards[i] if t.uuid != task.uuid]
+                touched.append(i)
+            moved = set()
+            for task in changed:
+                i = shard_index(task.uuid, shard_count)
+                position = next((n for n, t in enumerate(shards[i]) if t.uuid == task.uuid), None)
+                if position is None:
+                    moved.add(id(task))
+                else:
+                    shards[i][position] = task
+                touched.append(i)
+            if moved and not created:
+                # Shards hold the cached objects, so a task is found by identity
+                # even though its old uuid is gone
+                for i, shard in enumerate(shards):
+                    kept = [t for t in shard if id(t) not in moved]
+                    if len(kept) != len(shard):
+                        shards[i] = kept
+                        touched.append(i)
+            for task in changed:
+                if id(task) in moved:
+                    shards[shard_index(task.uuid, shard_count)].append(task)
+
+            self._write_shards(shards, touched)
+            self._bump_version(self.tasks_file)
+            self._update_cache(tasks)
+
+    def _iter_file_records(self, path: Path) -> Iterator[Any]:
+        """Yield the records of every shard of a store, or of a plain task file."""
+        if self._read_manifest(path) is None:
+            yield from super()._iter_file_records(path)
+            return
+        for shard_path in self._shard_paths(path):
+            yield from super()._iter_file_records(shard_path)
+
+    def get_file_info(self, file_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get metadata about a task file or store.
+
+        Stores are summarized from their shards; plain files go through the
+        directory catalog.
+        """
+        path = Path(file_path) if file_path else self.tasks_file
+        if not path.is_dir():
+            return super().get_file_info(str(path))
+
+        statuses: Dict[str, int] = {}
+        is_valid, _, task_count, total = self._validate_task_file(str(path), statuses=statuses)
+        return {"task_count": task_count, "total_records": total, "statuses": statuses,
+                "content_hash": None, "valid": is_valid, "schema_valid": None}
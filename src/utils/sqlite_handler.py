@@ -0,0 +1,314 @@
+"""
+SQLite storage backend for the Thoughtful Task Manager.
+"""
+
+import json
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+from ..models.task import Task
+from .file_handler import MULTI_VALUE_TYPES, FileHandler
+from .snapshot import content_hash
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT,
+    uuid TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT,
+    priority INTEGER,
+    created_date TEXT,
+    due_date TEXT,
+    model TEXT,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_id ON tasks(id);
+CREATE INDEX IF NOT EXISTS idx_tasks_uuid ON tasks(uuid);
+CREATE INDEX IF NOT EXISTS idx_tasks_title ON tasks(title);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority);
+CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date);
+CREATE INDEX IF NOT EXISTS idx_tasks_source ON tasks(source);
+CREATE TABLE IF NOT EXISTS task_dependencies (
+    task_seq INTEGER NOT NULL REFERENCES tasks(seq) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    dependency TEXT NOT NULL,
+    PRIMARY KEY (task_seq, position)
+);
+CREATE INDEX IF NOT EXISTS idx_task_dependencies_dependency ON task_dependencies(dependency);
+"""
+
+TASK_COLUMNS = ("id", "uuid", "title", "description", "status", "priority",
+                "created_date", "due_date", "model", "source")
+
+class SqliteFileHandler(FileHandler):
+    """Stores tasks in an indexed SQLite database instead of a JSON file."""
+
+    # Queries go to the database's own indexes
+    CACHES_TASKS = False
+
+    def __init__(self, data_dir: str = "data", db_name: str = "tasks.db"):
+        """
+        Initialize the SQLite handler.
+
+        Args:
+            data_dir: Directory holding the database and JSON task files.
+            db_name: File name of the database inside data_dir.
+        """
+        super().__init__(data_dir)
+        self.tasks_file = self.data_dir / db_name
+        self._initialized_dbs = set()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the current database, creating the schema if needed."""
+        conn = sqlite3.connect(str(self.tasks_file))
+        conn.execute("PRAGMA foreign_keys = ON")
+        if self.tasks_file not in self._initialized_dbs:
+            conn.executescript(SCHEMA)
+            self._initialized_dbs.add(self.tasks_file)
+        return conn
+
+    def save_tasks(self, tasks: List[Task]) -> None:
+        """Replace the stored tasks with the given list."""
+        tasks_data = [task.to_dict() for task in tasks]
+
+        # Validate against schema if available
+        if self.schema_file.exists():
+            self.validate_against_schema(tasks_data)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM tasks")
+            for task_data in tasks_data:
+                self._insert(conn, task_data)
+
+    def load_tasks(self) -> List[Task]:
+        """Load all tasks from the database."""
+        if not self.tasks_file.exists():
+            return []
+        return self._select()
+
+    def cached_tasks(self) -> Tuple[Optional[int], List[Task]]:
+        """Load all tasks. Nothing is cached, so there is no generation."""
+        return None, self.load_tasks()
+
+    def find_tasks(self, **criteria) -> List[Task]:
+        """
+        Find tasks whose fields equal all of the given values using indexed queries.
+
+        Args:
+            **criteria: Field/value pairs to match, e.g. status="pending".
+                A list, tuple, set or range matches any of its values.
+
+        Returns:
+            The matching tasks, in insertion order
+        """
+        unknown = set(criteria) - set(self.QUERY_FIELDS)
+        if unknown:
+            raise ValueError(f"Cannot query tasks by: {', '.join(sorted(unknown))}")
+        if not self.tasks_file.exists():
+            return []
+
+        conditions, params = [], []
+        for field, value in criteria.items():
+            if isinstance(value, MULTI_VALUE_TYPES):
+                values = list(value)
+                conditions.append(f"{field} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+            else:
+                conditions.append(f"{field} = ?")
+                params.append(value)
+        return self._select(" AND ".join(conditions), tuple(params))
+
+    def persist_create(self, tasks: List[Task], task: Task) -> None:
+        """Insert a newly created task."""
+        with closing(self._connect()) as conn, conn:
+            self._insert(conn, task.to_dict())
+
+    def persist_update(self, tasks: List[Task], task: Task) -> None:
+        """
+        Update the stored row of a single task.
+
+        Raises:
+            ValueError: If no row has the task's uuid, e.g. because it was changed
+        """
+        with closing(self._connect()) as conn, conn:
+            if not self._update(conn, task.to_dict()):
+                raise ValueError(f"No stored task has uuid {task.uuid}")
+
+    def persist_delete(self, tasks: List[Task], removed: List[Task]) -> None:
+        """Delete the rows of the removed tasks."""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM tasks WHERE uuid = ?", [(task.uuid,) for task in removed])
+
+    def persist_batch(self, tasks: List[Task], changed: List[Task], removed: List[Task]) -> None:
+        """Insert, update and delete the rows of many tasks in one transaction."""
+        with closing(self._connect()) as conn, conn:
+            conn.executemany("DELETE FROM tasks WHERE uuid = ?", [(task.uuid,) for task in removed])
+            for task in changed:
+                task_data = task.to_dict()
+                if not self._update(conn, task_data):
+                    self._insert(conn, task_data)
+
+    def _update(self, conn: sqlite3.Connection, task_data: Dict[str, Any]) -> bool:
+        """Update the rows of a task and its dependencies; returns whether it had any."""
+        assignments = ", ".join(f"{column} = ?" for column in TASK_COLUMNS)
+        conn.execute(
+            f"UPDATE tasks SET {assignments} WHERE uuid = ?",
+            tuple(task_data[column] for column in TASK_COLUMNS) + (task_data["uuid"],)
+        )
+        seqs = [row[0] for row in conn.execute("SELECT seq FROM tasks WHERE uuid = ?", (task_data["uuid"],))]
+        for seq in seqs:
+            conn.execute("DELETE FROM task_dependencies WHERE task_seq = ?", (seq,))
+            self._insert_dependencies(conn, seq, task_data["dependencies"])
+        return bool(seqs)
+
+    def validate_task_file(self, file_path: str) -> tuple[bool, str, int]:
+        """
+        Validate if a file contains valid task data.
+
+        SQLite databases are checked for the tasks table; any other file is
+        validated as a JSON task file.
+        """
+        path = Path(file_path)
+        if path.suffix != ".db":
+            return super().validate_task_file(file_path)
+
+        if not path.exists():
+            return False, f"File does not exist: {file_path}", 0
+
+        try:
+            with closing(sqlite3.connect(str(path))) as conn:
+                task_count = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+        except sqlite3.DatabaseError as e:
+            return False, f"Error validating file: {file_path} - {str(e)}", 0
+
+        if task_count == 0:
+            return True, f"File contains an empty task list: {file_path}", 0
+        return True, f"File contains {task_count} valid tasks: {file_path}", task_count
+
+    def get_file_info(self, file_path: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get metadata about a task file.
+
+        SQLite databases answer directly from their indexes; any other file
+        goes through the directory catalog.
+        """
+        path = Path(file_path) if file_path else self.tasks_file
+        if path.suffix != ".db":
+            return super().get_file_info(str(path))
+
+        is_valid, _, task_count = self.validate_task_file(str(path))
+        statuses = {}
+        if is_valid and task_count:
+            with closing(sqlite3.connect(str(path))) as conn:
+                statuses = dict(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"))
+        return {"task_count": task_count, "total_records": task_count, "statuses": statuses,
+                "content_hash": None, "valid": is_valid, "schema_valid": None}
+
+    def backup_tasks(self, compression: Optional[str] = "gzip") -> Optional[str]:
+        """
+        Record an incremental backup point of the stored tasks.
+
+        The rows are backed up as task records in the backups directory, like
+        a JSON tasks file, so list_backups(), restore_backup() and
+        prune_backups() apply to them too.
+
+        Args:
+            compression: "gzip", "zstd" or None, used for newly stored chunks.
+
+        Returns:
+            The id of the backup point, or None if there is no database
+        """
+        with self.locked():
+            if not self.tasks_file.exists():
+                return None
+            records = [task.to_dict() for task in self.load_tasks()]
+            # A database's bytes change without its tasks changing, so the records are hashed
+            source_hash = content_hash(json.dumps(records, sort_keys=True).encode("utf-8"))
+            return self.get_backup_store(compression).backup(self.tasks_file.name, records, source_hash)
+
+    def import_json(self, *json_files: str) -> int:
+        """
+        Replace the stored tasks with the contents of one or more JSON task files.
+
+        Args:
+            *json_files: Paths to JSON files in either supported layout
+
+        Returns:
+            Number of tasks imported
+        """
+        # Stream each file straight into the table instead of loading it whole
+        count = 0
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM tasks")
+            for json_file in json_files:
+                for task in self._json_handler(json_file).iter_tasks():
+                    self._insert(conn, task.to_dict())
+                    count += 1
+        return count
+
+    def export_json(self, json_file: str) -> int:
+        """
+        Write the stored tasks to a JSON task file.
+
+        Args:
+            json_file: Path of the JSON file to write
+
+        Returns:
+            Number of tasks exported
+        """
+        tasks = self.load_tasks()
+        self._json_handler(json_file).save_tasks(tasks)
+        return len(tasks)
+
+    def _json_handler(self, json_file: str) -> FileHandler:
+        """Create a plain FileHandler for a JSON file sharing this handler's schema."""
+        handler = FileHandler(str(self.data_dir))
+        handler.tasks_file = Path(json_file)
+        return handler
+
+    def _insert(self, conn: sqlite3.Connection, task_data: Dict[str, Any]) -> None:
+        """Insert a single task row and its dependencies."""
+        placeholders = ", ".join("?" for _ in TASK_COLUMNS)
+        cursor = conn.execute(
+            f"INSERT INTO tasks ({', '.join(TASK_COLUMNS)}) VALUES ({placeholders})",
+            tuple(task_data[column] for column in TASK_COLUMNS)
+        )
+        self._insert_dependencies(conn, cursor.lastrowid, task_data["dependencies"])
+
+    def _insert_dependencies(self, conn: sqlite3.Connection, seq: int, dependencies: List[str]) -> None:
+        """Insert the dependency rows of a task."""
+        conn.executemany(
+            "INSERT INTO task_dependencies (task_seq, position, dependency) VALUES (?, ?, ?)",
+            [(seq, position, dependency) for position, dependency in enumerate(dependencies or [])]
+        )
+
+    def _select(self, where: Optional[str] = None, params: Tuple = ()) -> List[Task]:
+        """Select tasks, optionally filtered by a WHERE clause, and build Task objects."""
+        query = f"SELECT seq, {', '.join(TASK_COLUMNS)} FROM tasks"
+        if where:
+            query += f" WHERE {where}"
+        query += " ORDER BY seq"
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+            if not rows:
+                return []
+
+            dependencies: Dict[int, List[str]] = {}
+            dep_query = "SELECT task_seq, dependency FROM task_dependencies"
+            if where:
+                dep_query += f" WHERE task_seq IN (SELECT seq FROM tasks WHERE {where})"
+            for seq, dependency in conn.execute(dep_query + " ORDER BY task_seq, position", params):
+                dependencies.setdefault(seq, []).append(dependency)
+
+        records = []
+        for row in rows:
+            task_data = dict(zip(TASK_COLUMNS, row[1:]))
+            task_data["dependencies"] = dependencies.get(row[0], [])
+            records.append(task_data)
+        return Task.from_dicts(records)
@@ -0,0 +1,134 @@
+"""
+Unit tests for incremental, deduplicated backups.
+"""
+
+from datetime import datetime, timedelta, timezone
+import pytest
+from src.api.task_api import TaskAPI
+from src.models.task import Task
+from src.utils.backup import BackupStore
+from src.utils.file_handler import FileHandler
+from src.utils.sqlite_handler import SqliteFileHandler
+
+@pytest.fixture
+def file_handler(tmp_path):
+    """Create a FileHandler with a temporary data directory."""
+    return FileHandler(data_dir=str(tmp_path))
+
+def _tasks(count):
+    """Build tasks with distinct titles."""
+    return [Task(title=f"Task {i}", description=f"Description {i}") for i in range(count)]
+
+def _object_sizes(file_handler):
+    """Map every stored chunk to its size in bytes."""
+    objects = file_handler.data_dir / "backups" / "objects"
+    return {path.name: path.stat().st_size for path in objects.glob("*/*")}
+
+def test_restore_any_point(file_handler):
+    """Test that every backup point restores the tasks as they were."""
+    tasks = _tasks(3)
+    file_handler.save_tasks(tasks)
+    first = file_handler.backup_tasks()
+    
+    tasks[1].status = "completed"
+    file_handler.save_tasks(tasks)
+    second = file_handler.backup_tasks()
+    
+    assert [b["id"] for b in file_handler.list_backups()] == [first, second]
+    restored = file_handler.restore_backup(first)
+    assert [task.status for task in restored] == ["pending"] * 3
+    assert [task.status for task in file_handler.load_tasks()] == ["pending"] * 3
+    
+    file_handler.restore_backup(second)
+    assert file_handler.load_tasks()[1].status == "completed"
+
+def test_unchanged_file_is_not_backed_up_again(file_handler):
+    """Test that a backup of an unchanged file reuses the latest point."""
+    file_handler.save_tasks(_tasks(3))
+    first = file_handler.backup_tasks()
+    
+    assert file_handler.backup_tasks() == first
+    assert len(file_handler.list_backups()) == 1
+
+def test_one_change_stores_one_chunk(file_handler):
+    """Test that changing one task of a large file stores a single new chunk."""
+    tasks = _tasks(3000)
+    file_handler.save_tasks(tasks)
+    file_handler.backup_tasks()
+    before = _object_sizes(file_handler)
+    assert len(before) > 1
+    
+    tasks[1500].status = "completed"
+    file_handler.save_tasks(tasks)
+    file_handler.backup_tasks()
+    
+    added = {name: size for name, size in _object_sizes(file_handler).items() if name not in before}
+    assert len(added) == 1
+    assert sum(added.values()) < file_handler.tasks_file.stat().st_size / 10
+
+def test_prune_keeps_hourly_then_daily(tmp_path):
+    """Test the retention policy and that unreferenced chunks are removed."""
+    store = BackupStore(tmp_path / "backups", fsync=False)
+    now = datetime(2026, 3, 31, 12, 0, tzinfo=timezone.utc)
+    
+    # Four backups per day for 40 days, each with different content
+    ids = []
+    for hours in range(0, 40 * 24, 6):
+        created = now - timedelta(hours=hours)
+        ids.append(store.backup("tasks.json", [{"title": f"Task {hours}"}], now=created))
+    
+    removed = store.prune("tasks.json", now=now)
+    kept = store.list_backups("tasks.json")
+    kept_times = [datetime.fromisoformat(b["created"]) for b in kept]
+    
+    # Every backup of the last day, then one per day for the rest of the month
+    assert len([t for t in kept_times if now - t <= timedelta(days=1)]) == 5
+    assert all(now - t <= timedelta(days=30) for t in kept_times)
+    older = [t for t in kept_times if now - t > timedelta(days=1)]
+    assert len({t.date() for t in older}) == len(older) == 30
+    assert len(removed) + len(kept) == len(ids)
+    
+    objects = {path.name for path in (tmp_path / "backups" / "objects").glob("*/*")}
+    assert objects == {chunk for b in kept for chunk in b["chunks"]}
+
+def test_backups_are_not_task_files(file_handler):
+    """Test that old full-copy backups and the backup directory are not listed as task files."""
+    file_handler.save_tasks(_tasks(1))
+    file_handler.backup_tasks()
+    (file_handler.data_dir / "tasks_backup_1700000000.json").write_text("[]")
+    (file_handler.data_dir / "tasks_backup_1700000000.json.gz").write_bytes(b"")
+    
+    files, count = file_handler.list_task_files()
+    assert [f.name for f in files] == ["tasks.json"]
+
+def test_task_api_backup_round_trip(tmp_path):
+    """Test backing up and restoring through the NDJSON layout."""
+    task_api = TaskAPI(data_file=str(tmp_path / "tasks.ndjson"))
+    task_api.create_task("First Task", "One")
+    file_handler = task_api._file_handler
+    backup_id = file_handler.backup_tasks()
+    
+    task_api.delete_task("First Task")
+    file_handler.restore_backup(backup_id)
+    assert [task["title"] for task in task_api.list_tasks()] == ["First Task"]
+    # The state before the restore was backed up too
+    assert len(file_handler.list_backups()) == 2
+
+def test_sqlite_backups_use_the_store(tmp_path):
+    """Test that SQLite databases are backed up incrementally and pruned like task files."""
+    handler = SqliteFileHandler(data_dir=str(tmp_path))
+    handler.save_tasks(_tasks(3))
+    first = handler.backup_tasks()
+    assert handler.backup_tasks() == first
+    assert not list(tmp_path.glob("*_backup_*"))
+    
+    tasks = handler.load_tasks()
+    tasks[0].status = "completed"
+    handler.save_tasks(tasks)
+    handler.backup_tasks()
+    handler.restore_backup(first)
+    assert [task.status for task in handler.load_tasks()] == ["pending"] * 3
+    
+    # The state before the restore matched the latest backup, so it was reused
+    assert len(handler.list_backups()) == 2
+    assert handler.prune_backups(keep_hourly=0, keep_daily=0) == [first]
@@ -0,0 +1,131 @@
+"""
+Unit tests for bulk mutations and deferred writes in TaskAPI.
+"""
+
+import pytest
+from src.api.task_api import TaskAPI
+from src.utils.sqlite_handler import SqliteFileHandler
+
+@pytest.fixture(params=[False, True], ids=["save", "journal"])
+def task_api(tmp_path, request):
+    """TaskAPI over a fresh tasks file, with and without journaling."""
+    return TaskAPI(data_file=str(tmp_path / "tasks.json"), journal=request.param)
+
+def test_create_many_saves_once(task_api):
+    """Test that a bulk create writes once and reports each task."""
+    handler = task_api._file_handler
+    task_api.create_task("Daily standup", "Existing")
+    version = handler.file_version()
+
+    results = task_api.create_many([
+        {"title": "Daily standup", "description": "Copy", "priority": 4},
+        {"title": "123", "description": "Numeric title"},
+        {"title": "Write report", "description": "New", "source": "ai"},
+    ])
+
+    assert handler.file_version() == version + 1
+    assert [r["task"]["title"] if r["task"] else None for r in results] == \
+        ["Daily standup (1)", None, "Write report"]
+    assert "numeric" in results[1]["error"]
+    assert results[2]["task"]["source"] == "ai"
+    reloaded = TaskAPI(data_file=str(handler.tasks_file))
+    assert [t["title"] for t in reloaded.list_tasks()] == ["Daily standup", "Daily standup (1)", "Write report"]
+
+def test_update_and_delete_many(task_api):
+    """Test bulk updates and deletes, including items that match no task."""
+    task_api.create_many([{"title": f"Bulk task {i}", "description": ""} for i in range(4)])
+
+    updated = task_api.update_many([("Bulk task 0", {"status": "completed"}),
+                                    ("Missing task", {"status": "completed"}),
+                                    ("Bulk task 1", {"colour": "red"})])
+    assert updated[0]["task"]["status"] == "completed"
+    assert updated[1] == {"task": None, "error": "Task not found: Missing task"}
+    assert "colour" in updated[2]["error"]
+
+    deleted = task_api.delete_many(["Bulk task 2", "Bulk task 2", "Bulk task 3"])
+    assert [r["deleted"] for r in deleted] == [True, False, True]
+
+    reloaded = TaskAPI(data_file=str(task_api._file_handler.tasks_file))
+    assert {t["title"]: t["status"] for t in reloaded.list_tasks()} == \
+        {"Bulk task 0": "completed", "Bulk task 1": "pending"}
+
+def test_batch_defers_writes(task_api):
+    """Test that writes wait for the end of the block and reads see them earlier."""
+    handler = task_api._file_handler
+    task_api.create_task("First Task", "One")
+    version = handler.file_version()
+
+    with task_api.batch():
+        task_api.create_task("Second Task", "Two")
+        task_api.update_task("First Task", priority=5)
+        task_api.create_task("Scratch Task", "Gone before saving")
+        task_api.delete_task("Scratch Task")
+        assert handler.file_version() == version
+        assert task_api.get_task("Second Task")["description"] == "Two"
+
+    assert handler.file_version() == version + 1
+    tasks = {t["title"]: t for t in TaskAPI(data_file=str(handler.tasks_file)).list_tasks()}
+    assert set(tasks) == {"First Task", "Second Task"}
+    assert tasks["First Task"]["priority"] == 5
+
+def test_failed_batch_writes_nothing(task_api):
+    """Test that an exception in the block discards its changes."""
+    task_api.create_task("First Task", "One")
+
+    with pytest.raises(RuntimeError):
+        with task_api.batch():
+            task_api.update_task("First Task", status="completed")
+            task_api.create_task("Second Task", "Two")
+            raise RuntimeError("abort")
+
+    assert [(t["title"], t["status"]) for t in task_api.list_tasks()] == [("First Task", "pending")]
+
+def test_batch_reapplies_after_external_write(task_api):
+    """Test that a batch is applied again on top of tasks written meanwhile."""
+    task_api.create_task("First Task", "One")
+    other = TaskAPI(data_file=str(task_api._file_handler.tasks_file))
+
+    with task_api.batch():
+        task_api.update_task("First Task", status="completed")
+        other.create_task("Other Task", "Written elsewhere")
+        task_api.create_task("Second Task", "Two")
+
+    tasks = {t["title"]: t for t in other.list_tasks()}
+    assert set(tasks) == {"First Task", "Other Task", "Second Task"}
+    assert tasks["First Task"]["status"] == "completed"
+
+def test_bulk_mutations_on_sqlite(tmp_path):
+    """Test that SQLite applies a batch as row changes in one transaction."""
+    task_api = TaskAPI(file_handler=SqliteFileHandler(data_dir=str(tmp_path)))
+    task_api.create_task("First Task", "One")
+
+    with task_api.batch():
+        task_api.create_many([{"title": "Second Task", "description": "Two"},
+                              {"title": "Third Task", "description": "Three"}])
+        task_api.update_task("First Task", priority=3)
+        task_api.delete_task("Third Task")
+
+    assert [(t["title"], t["priority"]) for t in task_api.list_tasks()] == \
+        [("First Task", 3), ("Second Task", 1)]
+
+def test_bulk_results_match_reapplied_batch(task_api):
+    """Test that bulk results describe the tasks saved after a batch is applied again."""
+    task_api.create_task("Alpha task", "One")
+    path = str(task_api._file_handler.tasks_file)
+    other = TaskAPI(data_file=path)
+
+    def created_meanwhile(items, title):
+        # Another writer saves a task with the same title while the batch is open
+        yield from items
+        other.create_task(title, "Written elsewhere")
+
+    created = task_api.create_many(created_meanwhile([{"title": "Bravo task", "description": "Two"}],
+                                                     "Bravo task"))
+    updated = task_api.update_many(created_meanwhile([("Alpha task", {"title": "Charlie task"})],
+                                                     "Charlie task"))
+
+    saved = {t["uuid"]: t for t in TaskAPI(data_file=path).list_tasks()}
+    assert created[0]["task"]["title"] == "Bravo task (1)"
+    assert updated[0]["task"]["title"] == "Charlie task (1)"
+    assert created[0]["task"] == saved[created[0]["task"]["uuid"]]
+    assert updated[0]["task"] == saved[updated[0]["task"]["uuid"]]
@@ -0,0 +1,81 @@
+"""
+Unit tests for compressed task files.
+"""
+
+import gzip
+import json
+import pytest
+from src.utils.compression import detect_compression
+from src.utils.file_handler import FileHandler
+from src.models.task import Task
+
+TASKS = [
+    {"id": "task-001", "title": "Compressed Task 1", "description": "One", "status": "pending"},
+    {"id": "task-002", "title": "Compressed Task 2", "description": "Two", "status": "completed"},
+]
+
+@pytest.fixture
+def file_handler(tmp_path):
+    """Create a FileHandler with a temporary data directory."""
+    return FileHandler(data_dir=str(tmp_path))
+
+def test_detect_compression(tmp_path):
+    """Test detection by extension and by magic bytes."""
+    disguised = tmp_path / "disguised.json"
+    disguised.write_bytes(gzip.compress(b"[]"))
+    plain = tmp_path / "plain.json"
+    plain.write_text("[]")
+    
+    assert detect_compression(tmp_path / "new.json.gz") == "gzip"
+    assert detect_compression(tmp_path / "new.json.zst") == "zstd"
+    assert detect_compression(disguised) == "gzip"
+    assert detect_compression(plain) is None
+
+def test_load_and_save_keep_gzip(file_handler, tmp_path):
+    """Test that a gzip task file is read transparently and saved compressed."""
+    path = tmp_path / "archive.json.gz"
+    path.write_bytes(gzip.compress(json.dumps(TASKS).encode()))
+    file_handler.tasks_file = path
+    
+    tasks = file_handler.load_tasks()
+    assert [task.title for task in tasks] == ["Compressed Task 1", "Compressed Task 2"]
+    
+    tasks.append(Task(title="Compressed Task 3", description="Three"))
+    file_handler.save_tasks(tasks)
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+    assert len(json.loads(gzip.decompress(path.read_bytes()))) == 3
+    assert [t["id"] for t in file_handler.iter_task_records()][:2] == ["task-001", "task-002"]
+
+def test_list_and_validate_compressed_files(file_handler, tmp_path):
+    """Test that compressed task files are listed and validated like plain ones."""
+    (tmp_path / "plain.json").write_text(json.dumps(TASKS))
+    (tmp_path / "archive.json.gz").write_bytes(gzip.compress(json.dumps({"tasks": TASKS}).encode()))
+    (tmp_path / "notes.txt.gz").write_bytes(gzip.compress(b"not tasks"))
+    
+    files, count = file_handler.list_task_files()
+    assert [f.name for f in files] == ["archive.json.gz", "plain.json"]
+    assert file_handler.validate_task_file(str(tmp_path / "archive.json.gz"))[0:3:2] == (True, 2)
+    assert file_handler.get_task_count(str(tmp_path / "archive.json.gz")) == 2
+    assert file_handler.get_file_info(str(tmp_path / "archive.json.gz"))["statuses"] == {
+        "pending": 1, "completed": 1
+    }
+
+def test_corrupt_gzip_is_reported(file_handler, tmp_path):
+    """Test that a damaged compressed file fails validation instead of raising."""
+    path = tmp_path / "broken.json.gz"
+    path.write_bytes(gzip.compress(json.dumps(TASKS).encode())[:20])
+    
+    is_valid, message, count = file_handler.validate_task_file(str(path))
+    assert not is_valid
+    assert count == 0
+
+def test_backup_is_compressed_by_default(file_handler):
+    """Test that backup chunks are stored as gzip unless asked otherwise."""
+    file_handler.save_tasks([Task.from_dict(task) for task in TASKS])
+    file_handler.backup_tasks()
+    
+    chunks = list((file_handler.data_dir / "backups" / "objects").glob("*/*"))
+    assert len(chunks) == 1
+    assert detect_compression(chunks[0]) == "gzip"
+    assert [record["title"] for record in json.loads(gzip.decompress(chunks[0].read_bytes()))] == \
+        [task["title"] for task in TASKS]
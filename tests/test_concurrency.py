@@ -0,0 +1,121 @@
+"""
+Unit tests for inter-process locking and optimistic concurrency.
+"""
+
+import json
+import multiprocessing
+import runpy
+import pytest
+from pathlib import Path
+from create_task import create_task, add_task_to_file
+from src.api.task_api import TaskAPI
+from src.utils.file_handler import FileHandler, StaleVersionError
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+@pytest.fixture
+def tasks_file(tmp_path):
+    """Path of a shared tasks file."""
+    return tmp_path / "tasks.json"
+
+def _add_tasks(tasks_file, worker, count):
+    """Add tasks from a separate process with the create_task.py script."""
+    for i in range(count):
+        add_task_to_file(create_task(f"Script {worker} task {i}", "Added concurrently"), str(tasks_file))
+
+def _create_tasks(tasks_file, worker, count, journal):
+    """Create tasks from a separate process."""
+    task_api = TaskAPI(data_file=str(tasks_file), journal=journal)
+    for i in range(count):
+        task_api.create_task(f"Worker {worker} task {i}", "Created concurrently")
+
+def test_version_increases_with_every_write(tasks_file):
+    """Test that saves and journaled mutations bump the file version."""
+    task_api = TaskAPI(data_file=str(tasks_file), journal=True)
+    handler = task_api._file_handler
+    assert handler.file_version() == 0
+    
+    task_api.create_task("First Task", "One")
+    task_api.update_task("First Task", status="completed")
+    task_api.delete_task("First Task")
+    assert handler.file_version() == 3
+    assert handler.loaded_version == 3
+
+def test_stale_mutation_is_rejected(tasks_file):
+    """Test that persisting on top of a file changed by another writer fails."""
+    first = FileHandler(data_dir=str(tasks_file.parent))
+    second = FileHandler(data_dir=str(tasks_file.parent))
+    TaskAPI(file_handler=first).create_task("Shared Task", "Seed")
+    
+    tasks = first.load_tasks()
+    TaskAPI(file_handler=second).create_task("Other Task", "Written elsewhere")
+    
+    with pytest.raises(StaleVersionError):
+        first.persist_update(tasks, tasks[0])
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_mutation_retries_against_fresh_state(tasks_file, journal):
+    """Test that TaskAPI re-applies a mutation after another writer got in first."""
+    task_api = TaskAPI(data_file=str(tasks_file), journal=journal)
+    other_api = TaskAPI(data_file=str(tasks_file), journal=journal)
+    task_api.create_task("First Task", "One")
+    task_api.list_tasks()
+    
+    other_api.create_task("Second Task", "Two")
+    task_api.update_task("First Task", status="completed")
+    
+    tasks = {t["title"]: t for t in TaskAPI(data_file=str(tasks_file)).list_tasks()}
+    assert set(tasks) == {"First Task", "Second Task"}
+    assert tasks["First Task"]["status"] == "completed"
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_concurrent_processes_do_not_lose_writes(tasks_file, journal):
+    """Test that tasks created by several processes at once are all kept."""
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_create_tasks, args=(tasks_file, w, 50, journal)) for w in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+    
+    assert len(TaskAPI(data_file=str(tasks_file)).list_tasks()) == 200
+
+def test_script_and_api_writers_do_not_lose_writes(tasks_file):
+    """Test that create_task.py takes the write lock and bumps the file version."""
+    task_api = TaskAPI(data_file=str(tasks_file))
+    task_api.create_task("First Task", "One")
+    version = task_api._file_handler.file_version()
+    add_task_to_file(create_task("Script Task", "Added by the script"), str(tasks_file))
+    assert task_api._file_handler.file_version() == version + 1
+    
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_add_tasks, args=(tasks_file, 0, 10)),
+               ctx.Process(target=_create_tasks, args=(tasks_file, 1, 10, False))]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+    
+    assert len(TaskAPI(data_file=str(tasks_file)).list_tasks()) == 22
+
+def test_scripts_keep_raw_records(tmp_path, monkeypatch):
+    """Test that create_task.py and update_tasks.py rewrite records without normalizing them."""
+    tasks_file = tmp_path / "data" / "tasks.json"
+    tasks_file.parent.mkdir()
+    record = {"id": "t1", "title": "Tiny", "tags": ["home"], "notes": "Keep me"}
+    tasks_file.write_text(json.dumps({"tasks": [record], "owner": "me"}))
+    
+    assert add_task_to_file(create_task("Script Task", "Added by the script"), str(tasks_file)) == 2
+    data = json.loads(tasks_file.read_text())
+    assert data["owner"] == "me"
+    assert data["tasks"][0] == record
+    assert data["tasks"][1]["title"] == "Script Task"
+    
+    version = FileHandler(data_dir=str(tasks_file.parent)).file_version()
+    monkeypatch.chdir(tmp_path)
+    runpy.run_path(str(SCRIPTS_DIR / "update_tasks.py"))
+    data = json.loads(tasks_file.read_text())
+    assert data["tasks"][0] == dict(record, uuid=data["tasks"][0]["uuid"], model="unknown", source="human")
+    assert FileHandler(data_dir=str(tasks_file.parent)).file_version() == version + 1
@@ -3,9 +3,11 @@ Unit tests for the FileHandler.
 """
 
 import json
+import os
 import pytest
+import time
 from pathlib import Path
-from src.utils.file_handler import FileHandler
+from src.utils.file_handler import FileHandler, CODECS, get_codec
 from src.models.task import Task
 
 @pytest.fixture
@@ -134,3 +136,240 @@ def test_save_and_load_tasks(file_handler):
     assert loaded_tasks[0].title == "Test Task 1"
     assert loaded_tasks[1].id == "task-002"
     assert loaded_tasks[1].title == "Test Task 2"
+
+def test_load_tasks_uses_cache(file_handler):
+    """Test that repeated loads of an unchanged file are served from the cache."""
+    file_handler.save_tasks([Task(id="task-001", title="Test Task 1", description="Test Description 1")])
+    
+    first = file_handler.load_tasks()
+    second = file_handler.load_tasks()
+    
+    # Writes through the handler populate the cache, so neither load re-reads the file
+    assert file_handler.cache_info()["hits"] == 2
+    assert file_handler.cache_info()["misses"] == 0
+    assert first is not second
+    assert first[0] is second[0]
+
+def test_load_tasks_revalidates_cache(file_handler):
+    """Test that an external change to the file invalidates the cache."""
+    file_handler.save_tasks([Task(id="task-001", title="Test Task 1", description="Test Description 1")])
+    
+    # Rewrite the file behind the handler's back with a different size
+    with open(file_handler.tasks_file, 'w') as f:
+        json.dump([
+            {"id": "task-001", "title": "Test Task 1", "description": "Test Description 1"},
+            {"id": "task-002", "title": "Test Task 2", "description": "Test Description 2"}
+        ], f)
+    
+    tasks = file_handler.load_tasks()
+    assert len(tasks) == 2
+    assert file_handler.cache_info()["misses"] == 1
+
+@pytest.fixture
+def schema_handler(file_handler):
+    """Create a FileHandler with a task schema in its data directory."""
+    schema = {
+        "$schema": "http://json-schema.org/draft-07/schema#",
+        "type": "array",
+        "items": {
+            "type": "object",
+            "required": ["id", "title"],
+            "properties": {
+                "title": {"type": "string"},
+                "priority": {"type": "integer", "minimum": 1, "maximum": 5}
+            }
+        }
+    }
+    with open(file_handler.schema_file, 'w') as f:
+        json.dump(schema, f)
+    return file_handler
+
+def test_validate_against_schema_reuses_validator(schema_handler):
+    """Test that the compiled validator is only rebuilt when the schema changes."""
+    tasks_data = [{"id": "task-001", "title": "Test Task 1", "priority": 3}]
+    assert schema_handler.validate_against_schema(tasks_data)[0]
+    validators = schema_handler._schema_validators
+    
+    assert schema_handler.validate_against_schema(tasks_data)[0]
+    assert schema_handler._schema_validators is validators
+    
+    # Touching the schema file forces a rebuild
+    stat = schema_handler.schema_file.stat()
+    os.utime(schema_handler.schema_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert schema_handler.validate_against_schema(tasks_data)[0]
+    assert schema_handler._schema_validators is not validators
+
+def test_incremental_validation_skips_unchanged_tasks(schema_handler):
+    """Test that only changed tasks are validated again."""
+    tasks_data = [{"id": f"task-{i:03d}", "title": f"Test Task {i}", "priority": 3} for i in range(5)]
+    assert schema_handler.validate_against_schema(tasks_data)[0]
+    
+    # Record which records reach the item validator
+    key, validator, array_validator, item_validator = schema_handler._schema_validators
+    validated = []
+    
+    class RecordingValidator:
+        def validate(self, data):
+            validated.append(data)
+            item_validator.validate(data)
+    
+    schema_handler._schema_validators = (key, validator, array_validator, RecordingValidator())
+    
+    tasks_data[2] = dict(tasks_data[2], priority=4)
+    assert schema_handler.validate_against_schema(tasks_data)[0]
+    assert validated == [tasks_data[2]]
+
+def test_validated_digests_stay_bounded(schema_handler):
+    """Test that repeated partial saves do not keep the digests of replaced records."""
+    tasks = [Task(title=f"Test Task {i}", description="", priority=1) for i in range(5)]
+    schema_handler.save_tasks(tasks)
+    for i in range(40):
+        tasks[i % 5].description = f"Edit {i}"
+        schema_handler.save_tasks(tasks)
+        assert len(schema_handler._validated_digests) <= 2 * len(tasks)
+    
+    current = {schema_handler._task_digest(task.to_dict()) for task in tasks}
+    assert current <= schema_handler._validated_digests
+
+def test_incremental_validation_reports_errors(schema_handler):
+    """Test that invalid records are still rejected in incremental mode."""
+    tasks_data = [{"id": "task-001", "title": "Test Task 1", "priority": 3}]
+    assert schema_handler.validate_against_schema(tasks_data)[0]
+    
+    tasks_data.append({"id": "task-002", "title": "Test Task 2", "priority": 9})
+    is_valid, message = schema_handler.validate_against_schema(tasks_data)
+    assert not is_valid
+    assert "Schema validation error" in message
+
+def test_interrupted_save_keeps_previous_file(file_handler, monkeypatch):
+    """Test that a save failing midway leaves the old tasks file intact."""
+    file_handler.save_tasks([Task(title="Original Task", description="")])
+    before = file_handler.tasks_file.read_text()
+    
+    def failing_dumps(*args, **kwargs):
+        raise KeyboardInterrupt
+    monkeypatch.setattr(file_handler.codec, "dumps", failing_dumps)
+    
+    with pytest.raises(KeyboardInterrupt):
+        file_handler.save_tasks([Task(title="Replacement Task", description="")])
+    
+    assert file_handler.tasks_file.read_text() == before
+    # No temporary files are left behind
+    assert not [p.name for p in file_handler.data_dir.iterdir() if p.name.endswith(".tmp")]
+
+def test_group_commit_merges_saves(temp_data_dir, monkeypatch):
+    """Test that saves inside the group commit window result in one write."""
+    handler = FileHandler(data_dir=str(temp_data_dir), group_commit=60)
+    writes = []
+    original = FileHandler._write_snapshot
+    def recording(self, path, tasks):
+        writes.append(len(tasks))
+        original(self, path, tasks)
+    monkeypatch.setattr(FileHandler, "_write_snapshot", recording)
+    
+    tasks = []
+    for i in range(5):
+        tasks.append(Task(title=f"Grouped Task {i}", description=""))
+        handler.save_tasks(tasks)
+    
+    # Pending saves are served from memory but not yet written
+    assert writes == []
+    assert not handler.tasks_file.exists()
+    assert len(handler.load_tasks()) == 5
+    
+    handler.flush()
+    assert writes == [5]
+    assert len(FileHandler(data_dir=str(temp_data_dir)).load_tasks()) == 5
+
+def test_group_commit_writes_after_window(temp_data_dir):
+    """Test that a pending save is written once the window closes."""
+    handler = FileHandler(data_dir=str(temp_data_dir), group_commit=0.01)
+    handler.save_tasks([Task(title="Eventually Saved", description="")])
+    
+    deadline = time.time() + 5
+    while not handler.tasks_file.exists() and time.time() < deadline:
+        time.sleep(0.01)
+    assert [t.title for t in FileHandler(data_dir=str(temp_data_dir)).load_tasks()] == ["Eventually Saved"]
+
+@pytest.mark.parametrize("codec", [name for name, codec in CODECS.items() if codec is not None])
+@pytest.mark.parametrize("compact", [False, True])
+def test_codecs_round_trip(temp_data_dir, codec, compact):
+    """Test that every installed codec writes files the stdlib reads back identically."""
+    handler = FileHandler(data_dir=str(temp_data_dir), codec=codec, compact=compact)
+    tasks = [
+        Task(title="Café meeting ☕", description="Unicode text", dependencies=["task-001"]),
+        Task(title="Second Task", description='Quotes " and \\ backslashes', priority=5),
+    ]
+    handler.save_tasks(tasks)
+    
+    raw = handler.tasks_file.read_bytes()
+    assert json.loads(raw) == [task.to_dict() for task in tasks]
+    # Joined per-task fragments match encoding the whole list at once
+    assert raw == get_codec(codec).dumps([task.to_dict() for task in tasks], compact=compact)
+    assert (b"\n" in raw) != compact
+    if not compact:
+        # Indented output keeps the layout the fast task counter relies on
+        assert raw.startswith(b"[\n  {\n    ")
+    
+    reloaded = FileHandler(data_dir=str(temp_data_dir), codec=codec).load_tasks()
+    assert [task.to_dict() for task in reloaded] == [task.to_dict() for task in tasks]
+
+@pytest.mark.parametrize("file_name", ["tasks.json", "tasks.ndjson"])
+def test_save_reencodes_only_changed_tasks(temp_data_dir, monkeypatch, file_name):
+    """Test that a save serializes the tasks changed since the last one and reuses the rest."""
+    handler = FileHandler(data_dir=str(temp_data_dir))
+    handler.tasks_file = handler.data_dir / file_name
+    tasks = [Task(title=f"Tracked Task {i}", description="Dirty") for i in range(5)]
+    tasks[4].dependencies = ["Tracked Task 0"]
+    handler.save_tasks(tasks)
+    
+    encoded = []
+    original = Task.to_dict
+    def recording(self):
+        encoded.append(self.title)
+        return original(self)
+    monkeypatch.setattr(Task, "to_dict", recording)
+    
+    tasks[1].status = "completed"
+    tasks[3].dependencies = ["Tracked Task 1"]
+    tasks[4].dependencies.append("Tracked Task 2")
+    tasks.append(Task(title="Tracked Task 5", description="Dirty"))
+    del tasks[0]
+    handler.save_tasks(tasks)
+    assert encoded == ["Tracked Task 1", "Tracked Task 3", "Tracked Task 4", "Tracked Task 5"]
+    
+    reloaded = FileHandler(data_dir=str(temp_data_dir))
+    reloaded.tasks_file = handler.tasks_file
+    assert [task.to_dict() for task in reloaded.load_tasks()] == [original(task) for task in tasks]
+
+def test_save_reencodes_task_changed_while_encoding(temp_data_dir, monkeypatch):
+    """Test that a task changed while it was being encoded is not taken as saved."""
+    handler = FileHandler(data_dir=str(temp_data_dir))
+    tasks = [Task(title="Racing Task", description="Changed mid-save")]
+    original = Task.to_dict
+    def changing(self):
+        record = original(self)
+        # Another thread changes the task once its record is built
+        self.status = "completed"
+        return record
+    monkeypatch.setattr(Task, "to_dict", changing)
+    handler.save_tasks(tasks)
+    monkeypatch.setattr(Task, "to_dict", original)
+    
+    handler.save_tasks(tasks)
+    assert json.loads(handler.tasks_file.read_text())[0]["status"] == "completed"
+
+def test_unknown_codec_is_rejected():
+    """Test that asking for an unknown codec fails clearly."""
+    with pytest.raises(ValueError):
+        get_codec("yaml")
+
+def test_load_reports_decode_throughput(temp_data_dir):
+    """Test that loading records how many tasks were decoded and how fast."""
+    tasks = [Task(title=f"Decoded Task {i}", description="Decode") for i in range(3)]
+    FileHandler(data_dir=str(temp_data_dir)).save_tasks(tasks)
+    file_handler = FileHandler(data_dir=str(temp_data_dir))
+    file_handler.load_tasks()
+    
+    assert file_handler.decode_stats["tasks"] == 3
+    assert file_handler.decode_stats["tasks_per_sec"] > 0
@@ -0,0 +1,119 @@
+"""
+Unit tests for the append-only task journal.
+"""
+
+import json
+import pytest
+from src.utils.file_handler import FileHandler
+from src.api.task_api import TaskAPI
+from src.models.task import Task
+
+@pytest.fixture
+def journaled_handler(tmp_path):
+    """Create a FileHandler with journaling enabled."""
+    return FileHandler(data_dir=str(tmp_path), journal=True)
+
+@pytest.fixture
+def task_api(tmp_path):
+    """Create a journaled TaskAPI backed by a temporary file."""
+    return TaskAPI(data_file=str(tmp_path / "tasks.json"), journal=True)
+
+def test_update_appends_single_journal_line(journaled_handler):
+    """Test that a single-task update appends one line and leaves the snapshot untouched."""
+    tasks = [Task(title="Test Task 1", description="One"), Task(title="Test Task 2", description="Two")]
+    journaled_handler.save_tasks(tasks)
+    snapshot = journaled_handler.tasks_file.read_text()
+
+    tasks[0].status = "completed"
+    journaled_handler.persist_update(tasks, tasks[0])
+
+    journal = journaled_handler.get_journal()
+    assert journaled_handler.tasks_file.read_text() == snapshot
+    assert len(journal.path.read_text().splitlines()) == 1
+    assert journal.entry_count == 1
+
+def test_replay_recovers_state(task_api, tmp_path):
+    """Test that a fresh handler replays create, update and delete entries."""
+    task_api.create_task("First Task", "Keep me")
+    task_api.create_task("Second Task", "Delete me")
+    task_api.update_task("First Task", status="completed")
+    task_api.delete_task("Second Task")
+
+    # A new API instance simulates a restart after a crash
+    restarted = TaskAPI(data_file=str(tmp_path / "tasks.json"))
+    tasks = restarted.list_tasks()
+
+    assert [task["title"] for task in tasks] == ["First Task"]
+    assert tasks[0]["status"] == "completed"
+
+def test_uuid_cannot_be_updated(task_api, tmp_path):
+    """Test that changing a uuid is rejected, since journal entries are keyed on it."""
+    task_api.create_task("First Task", "One")
+    task_api.create_task("Second Task", "Two")
+    uuid = task_api.get_task("First Task")["uuid"]
+
+    assert task_api.update_task("First Task", uuid="new-uuid") is None
+    assert task_api.update_many([("First Task", {"uuid": "new-uuid"})])[0]["error"] == \
+        "Task uuid cannot be changed"
+
+    restarted = TaskAPI(data_file=str(tmp_path / "tasks.json"))
+    assert [task["uuid"] for task in restarted.list_tasks() if task["title"] == "First Task"] == [uuid]
+    assert len(restarted.list_tasks()) == 2
+
+def test_torn_journal_line_is_ignored(task_api, tmp_path):
+    """Test that a partially written trailing entry does not break loading."""
+    task_api.create_task("First Task", "Keep me")
+    task_api.create_task("Second Task", "Keep me too")
+    journal = task_api._file_handler.get_journal()
+
+    with open(journal.path, 'a') as f:
+        f.write('{"op": "delete", "uui')
+
+    restarted = TaskAPI(data_file=str(tmp_path / "tasks.json"))
+    assert len(restarted.list_tasks()) == 2
+
+    # Appending after a torn line must still produce a readable journal
+    restarted_journaled = TaskAPI(data_file=str(tmp_path / "tasks.json"), journal=True)
+    restarted_journaled.create_task("Third Task", "After the crash")
+    assert len(TaskAPI(data_file=str(tmp_path / "tasks.json")).list_tasks()) == 3
+
+def test_compaction_folds_journal_into_snapshot(tmp_path):
+    """Test that reaching the threshold rewrites the snapshot and clears the journal."""
+    handler = FileHandler(data_dir=str(tmp_path), journal=True, compact_threshold=3)
+    tasks = []
+    for i in range(3):
+        task = Task(title=f"Test Task {i}", description="Compaction")
+        tasks.append(task)
+        handler.persist_create(tasks, task)
+
+    assert not handler.get_journal().exists()
+    with open(handler.tasks_file, 'r') as f:
+        assert len(json.load(f)) == 3
+
+def test_replay_is_idempotent_after_interrupted_compaction(journaled_handler):
+    """Test that a journal already folded into the snapshot replays to the same state."""
+    tasks = [Task(title="Test Task 1", description="One")]
+    journaled_handler.save_tasks(tasks)
+    task = Task(title="Test Task 2", description="Two")
+    tasks.append(task)
+    journaled_handler.persist_create(tasks, task)
+
+    # Simulate a crash after the snapshot was written but before the journal was removed
+    with open(journaled_handler.tasks_file, 'w') as f:
+        json.dump([t.to_dict() for t in tasks], f)
+
+    loaded = journaled_handler.load_tasks()
+    assert [t.title for t in loaded] == ["Test Task 1", "Test Task 2"]
+
+def test_snapshot_without_uuids_is_rewritten(journaled_handler):
+    """Test that mutations on a snapshot lacking uuids compact instead of journaling."""
+    with open(journaled_handler.tasks_file, 'w') as f:
+        json.dump([{"id": "task-001", "title": "Test Task 1", "description": "No uuid"}], f)
+
+    tasks = journaled_handler.load_tasks()
+    tasks[0].status = "completed"
+    journaled_handler.persist_update(tasks, tasks[0])
+
+    assert not journaled_handler.get_journal().exists()
+    with open(journaled_handler.tasks_file, 'r') as f:
+        assert json.load(f)[0]["uuid"] == tasks[0].uuid
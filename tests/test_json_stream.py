@@ -0,0 +1,58 @@
+"""
+Unit tests for the streaming task file reader.
+"""
+
+import io
+import json
+import pytest
+from src.utils.json_stream import iter_task_records, NotATaskListError
+from src.utils.file_handler import FileHandler
+from src.models.task import Task
+
+TASKS = [
+    {"id": "task-001", "title": "Test Task 1", "description": "Braces } and ] inside", "priority": 3},
+    {"id": "task-002", "title": "Test Task 2", "description": "Unicode é and \"quotes\"", "priority": 12345},
+]
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 64 * 1024])
+def test_iter_bare_list(chunk_size):
+    """Test streaming a bare list with chunk sizes that split tokens."""
+    document = json.dumps(TASKS, indent=2)
+    assert list(iter_task_records(io.StringIO(document), chunk_size)) == TASKS
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64 * 1024])
+def test_iter_tasks_key(chunk_size):
+    """Test streaming the {"tasks": [...]} layout with surrounding keys."""
+    document = json.dumps({"version": 10, "tasks": TASKS, "meta": {"owner": "me"}})
+    assert list(iter_task_records(io.StringIO(document), chunk_size)) == TASKS
+
+def test_iter_empty_list():
+    """Test that an empty list yields nothing."""
+    assert list(iter_task_records(io.StringIO("  [ ]  "))) == []
+
+@pytest.mark.parametrize("document", ['{"name": "x"}', '"tasks"', '{"tasks": 5}'])
+def test_iter_not_a_task_list(document):
+    """Test that well-formed documents without a task list are rejected."""
+    with pytest.raises(NotATaskListError):
+        list(iter_task_records(io.StringIO(document)))
+
+@pytest.mark.parametrize("document", ['', '[{"id": 1}', '[{"id": 1} {"id": 2}]', '[] []'])
+def test_iter_malformed(document):
+    """Test that malformed documents raise JSONDecodeError."""
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_task_records(io.StringIO(document), 4))
+
+def test_file_handler_iter_tasks_applies_journal(tmp_path):
+    """Test that FileHandler.iter_tasks streams tasks including journaled changes."""
+    handler = FileHandler(data_dir=str(tmp_path), journal=True)
+    tasks = [Task(title=f"Test Task {i}", description="Stream") for i in range(3)]
+    handler.save_tasks(tasks)
+    
+    tasks[1].status = "completed"
+    handler.persist_update(tasks, tasks[1])
+    removed = tasks.pop(0)
+    handler.persist_delete(tasks, [removed])
+    
+    # A fresh handler has no cache, so this reads from disk
+    streamed = list(FileHandler(data_dir=str(tmp_path)).iter_tasks())
+    assert [(t.title, t.status) for t in streamed] == [("Test Task 1", "completed"), ("Test Task 2", "pending")]
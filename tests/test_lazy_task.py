@@ -0,0 +1,73 @@
+"""
+Unit tests for lazy task views.
+"""
+
+import json
+import pytest
+from datetime import datetime
+from src.api.task_api import TaskAPI
+from src.models.lazy_task import LazyTask
+from src.models.task import Task
+from src.utils.file_handler import FileHandler
+
+RECORDS = [
+    {"uuid": "uuid-1", "title": "First Task", "description": "One", "status": "pending",
+     "priority": "high", "created_date": "2025-01-01T09:00:00", "due_date": "2025-02-01T00:00:00"},
+    {"uuid": "uuid-2", "id": "task-002", "status": "completed", "created_at": "2025-01-02T09:00:00",
+     "updated_at": "2025-01-03T09:00:00", "due_date": "not a date", "tags": ["extra"]},
+    {"uuid": "uuid-3", "title": "Third Task", "description": "Three", "dependencies": ["First Task"],
+     "priority": 9, "created_date": "2025-01-03T09:00:00", "model": "llama3.2", "source": "ai"},
+]
+
+@pytest.fixture
+def lazy_handler(tmp_path):
+    """Create a lazy FileHandler over a tasks file holding RECORDS."""
+    (tmp_path / "tasks.json").write_text(json.dumps(RECORDS))
+    return FileHandler(data_dir=str(tmp_path), lazy=True)
+
+def test_views_match_tasks():
+    """Test that views expose the same fields and dicts as decoded Tasks."""
+    views = LazyTask.from_dicts(RECORDS)
+    tasks = Task.from_dicts(RECORDS)
+    
+    assert [view.to_dict() for view in views] == [task.to_dict() for task in tasks]
+    assert views == tasks
+    assert not any(view.is_materialized for view in views)
+
+def test_filtering_by_status_parses_no_dates(lazy_handler):
+    """Test that reading only the status leaves dates unparsed."""
+    tasks = lazy_handler.find_tasks(status="completed")
+    
+    assert [task.title for task in tasks] == ["Task task-002"]
+    assert all("created_date" not in task._values and "due_date" not in task._values
+               for task in lazy_handler.load_tasks())
+
+def test_mutation_materializes(tmp_path):
+    """Test that changing a view turns it into a Task and persists the change."""
+    (tmp_path / "tasks.json").write_text(json.dumps(RECORDS))
+    task_api = TaskAPI(data_file=str(tmp_path / "tasks.json"), lazy=True)
+    
+    task_api.update_task("First Task", status="completed")
+    
+    first = task_api._file_handler.load_tasks()[0]
+    assert first.is_materialized
+    assert first.created_date == datetime(2025, 1, 1, 9, 0)
+    assert not task_api._file_handler.load_tasks()[1].is_materialized
+    assert json.loads((tmp_path / "tasks.json").read_text())[0]["status"] == "completed"
+
+def test_generated_values_are_stable():
+    """Test that a uuid generated for a record without one survives materialization."""
+    view = LazyTask({"title": "No uuid here"})
+    task_uuid = view.uuid
+    assert not view.is_materialized
+    
+    view.priority = 4
+    assert view.is_materialized
+    assert view.uuid == task_uuid
+
+def test_validation_happens_on_access():
+    """Test that an invalid title is reported when read rather than when loaded."""
+    view = LazyTask({"title": "12345"})
+    assert view.status == "pending"
+    with pytest.raises(ValueError):
+        view.title
@@ -0,0 +1,122 @@
+"""
+Unit tests for line-delimited (NDJSON) task files.
+"""
+
+import json
+import time
+import pytest
+from src.api.task_api import TaskAPI
+from src.utils.file_handler import FileHandler
+from src.utils.ndjson import is_ndjson, resolve, tombstone
+from create_task import create_task, add_task_to_file
+
+@pytest.fixture
+def ndjson_file(tmp_path):
+    """Path of an NDJSON tasks file."""
+    return tmp_path / "tasks.ndjson"
+
+def _lines(path):
+    """Decode every line of an NDJSON file."""
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def test_detection(tmp_path):
+    """Test that NDJSON is told apart from the list and {"tasks": [...]} layouts."""
+    cases = {
+        "lines.json": '{"title": "First Task"}\n{"title": "Second Task"}\n',
+        "list.json": json.dumps([{"title": "First Task"}], indent=2),
+        "compact_list.json": json.dumps([{"title": "First Task"}]),
+        "wrapped.json": json.dumps({"tasks": [{"title": "First Task"}]}),
+        "wrapped_indented.json": json.dumps({"tasks": [{"title": "First Task"}]}, indent=2),
+    }
+    for name, content in cases.items():
+        (tmp_path / name).write_text(content)
+    
+    assert is_ndjson(tmp_path / "lines.json")
+    assert is_ndjson(tmp_path / "missing.ndjson")
+    assert not any(is_ndjson(tmp_path / name) for name in cases if name != "lines.json")
+
+def test_resolve_supersedes_and_deletes():
+    """Test that later lines replace earlier ones and tombstones remove tasks."""
+    lines = [
+        {"uuid": "a", "title": "Task A v1"},
+        {"uuid": "b", "title": "Task B"},
+        {"title": "No uuid"},
+        {"uuid": "a", "title": "Task A v2"},
+        tombstone("b"),
+    ]
+    assert resolve(lines) == [{"uuid": "a", "title": "Task A v2"}, {"title": "No uuid"}]
+
+def test_task_api_appends_lines(ndjson_file):
+    """Test that creates, updates and deletes each append to the file."""
+    task_api = TaskAPI(data_file=str(ndjson_file))
+    task_api.create_task("First Task", "One")
+    task_api.create_task("Second Task", "Two")
+    before = ndjson_file.read_bytes()
+    
+    task_api.update_task("First Task", status="completed")
+    task_api.delete_task("Second Task")
+    
+    after = ndjson_file.read_bytes()
+    assert after.startswith(before)
+    assert len(_lines(ndjson_file)) == 4
+    assert "$deleted" in _lines(ndjson_file)[-1]
+    
+    tasks = TaskAPI(data_file=str(ndjson_file)).list_tasks()
+    assert [(t["title"], t["status"]) for t in tasks] == [("First Task", "completed")]
+
+def test_uuid_update_appends_nothing(ndjson_file):
+    """Test that a uuid change, which a new line could not supersede the old one with, is rejected."""
+    task_api = TaskAPI(data_file=str(ndjson_file))
+    task_api.create_task("First Task", "One")
+    before = ndjson_file.read_bytes()
+    
+    assert task_api.update_task("First Task", uuid="new-uuid") is None
+    assert ndjson_file.read_bytes() == before
+    assert len(TaskAPI(data_file=str(ndjson_file)).list_tasks()) == 1
+
+def test_background_compaction(tmp_path, ndjson_file):
+    """Test that superseded lines are compacted away without changing the tasks."""
+    handler = FileHandler(data_dir=str(tmp_path), compact_threshold=5)
+    task_api = TaskAPI(data_file=str(ndjson_file), file_handler=handler)
+    task_api.create_task("Only Task", "Updated often")
+    # Five superseded lines reach the threshold
+    for priority in [2, 3, 4, 5, 4]:
+        task_api.update_task("Only Task", priority=priority)
+    
+    deadline = time.time() + 5
+    while len(ndjson_file.read_text().splitlines()) > 1 and time.time() < deadline:
+        time.sleep(0.01)
+    
+    assert len(_lines(ndjson_file)) == 1
+    assert _lines(ndjson_file)[0]["priority"] == 4
+    assert TaskAPI(data_file=str(ndjson_file)).get_task("Only Task")["priority"] == 4
+
+def test_save_keeps_ndjson_layout(tmp_path):
+    """Test that a full save of a line-delimited .json file stays line-delimited."""
+    path = tmp_path / "tasks.json"
+    path.write_text('{"id": "task-001", "uuid": "u1", "title": "First Task"}\n')
+    handler = FileHandler(data_dir=str(tmp_path))
+    
+    handler.save_tasks(handler.load_tasks())
+    assert is_ndjson(path)
+    assert _lines(path)[0]["uuid"] == "u1"
+
+def test_listing_and_validation(tmp_path, ndjson_file):
+    """Test that NDJSON files are listed and validated with their live task count."""
+    ndjson_file.write_text('{"uuid": "a", "title": "Task A"}\n{"uuid": "b", "title": "Task B"}\n'
+                           + json.dumps(tombstone("a")) + "\n")
+    handler = FileHandler(data_dir=str(tmp_path))
+    
+    files, count = handler.list_task_files()
+    assert [f.name for f in files] == ["tasks.ndjson"]
+    assert handler.validate_task_file(str(ndjson_file)) == (
+        True, f"File contains 1 valid tasks: {ndjson_file}", 1
+    )
+
+def test_create_task_script_appends(ndjson_file):
+    """Test that create_task.py appends a single line to NDJSON files without reading them."""
+    assert add_task_to_file(create_task("First Task", "One"), str(ndjson_file)) is None
+    before = ndjson_file.read_bytes()
+    assert add_task_to_file(create_task("Second Task", "Two"), str(ndjson_file)) is None
+    assert ndjson_file.read_bytes().startswith(before)
+    assert len(_lines(ndjson_file)) == 2
@@ -0,0 +1,104 @@
+"""
+Unit tests for sharded task storage.
+"""
+
+import json
+import pytest
+from src.api.task_api import TaskAPI
+from src.utils.sharded_handler import ShardedFileHandler, shard_index
+
+@pytest.fixture
+def sharded_api(tmp_path):
+    """TaskAPI on a four-shard store."""
+    return TaskAPI(file_handler=ShardedFileHandler(data_dir=str(tmp_path), shard_count=4))
+
+def _shard_bytes(store):
+    """Contents of every shard file, by name."""
+    return {path.name: path.read_bytes() for path in store.glob("shard-*.json")}
+
+def test_round_trip(sharded_api, tmp_path):
+    """Test that a store reads back as one list in creation order."""
+    for i in range(10):
+        sharded_api.create_task(f"Task {i}", f"Description {i}")
+
+    reopened = ShardedFileHandler(data_dir=str(tmp_path), shard_count=8)
+    tasks = reopened.load_tasks()
+    assert [task.title for task in tasks] == [f"Task {i}" for i in range(10)]
+    # The manifest keeps the shard count the store was created with
+    assert json.loads(reopened.manifest_file.read_text())["shard_count"] == 4
+    for task in tasks:
+        shard = reopened.tasks_file / f"shard-{shard_index(task.uuid, 4):03d}.json"
+        assert task.uuid in shard.read_text()
+
+def test_mutation_rewrites_one_shard(sharded_api, tmp_path):
+    """Test that updating or deleting a task only rewrites its own shard."""
+    for i in range(20):
+        sharded_api.create_task(f"Task {i}", f"Description {i}")
+    store = sharded_api._file_handler.tasks_file
+
+    before = _shard_bytes(store)
+    sharded_api.update_task("Task 3", status="completed")
+    after = _shard_bytes(store)
+    assert len([name for name in before if before[name] != after[name]]) == 1
+
+    sharded_api.delete_task("Task 5")
+    final = _shard_bytes(store)
+    assert len([name for name in after if after[name] != final[name]]) == 1
+    assert len(sharded_api.list_tasks()) == 19
+
+def test_uuid_change_moves_task_to_its_shard(sharded_api, tmp_path):
+    """Test that a task whose uuid changed leaves the shard of its old uuid."""
+    for i in range(8):
+        sharded_api.create_task(f"Task {i}", f"Description {i}")
+    handler = sharded_api._file_handler
+    tasks = handler.load_tasks()
+    task = tasks[0]
+    old_shard = shard_index(task.uuid, 4)
+    task.uuid = next(f"moved-{n}" for n in range(100) if shard_index(f"moved-{n}", 4) != old_shard)
+    handler.persist_update(tasks, task)
+
+    reopened = ShardedFileHandler(data_dir=str(tmp_path)).load_tasks()
+    assert [t.uuid for t in reopened if t.title == "Task 0"] == [task.uuid]
+    assert len(reopened) == 8
+
+def test_process_pool_load(sharded_api, tmp_path):
+    """Test that a process pool loads the same tasks as a thread pool."""
+    for i in range(10):
+        sharded_api.create_task(f"Task {i}", f"Description {i}")
+
+    threads = ShardedFileHandler(data_dir=str(tmp_path))
+    processes = ShardedFileHandler(data_dir=str(tmp_path), executor="process", workers=2)
+    assert [task.to_dict() for task in processes.load_tasks()] == \
+        [task.to_dict() for task in threads.load_tasks()]
+
+def test_save_tasks_skips_unchanged_shards(sharded_api):
+    """Test that a full save leaves shards with unchanged contents alone."""
+    for i in range(10):
+        sharded_api.create_task(f"Task {i}", f"Description {i}")
+    handler = sharded_api._file_handler
+    tasks = handler.load_tasks()
+    mtimes = {path.name: path.stat().st_mtime_ns for path in handler.tasks_file.glob("shard-*.json")}
+
+    tasks[0].status = "completed"
+    handler.save_tasks(tasks)
+
+    changed = [path.name for path in handler.tasks_file.glob("shard-*.json")
+               if path.stat().st_mtime_ns != mtimes[path.name]]
+    assert changed == [f"shard-{shard_index(tasks[0].uuid, 4):03d}.json"]
+    assert handler.load_tasks()[0].status == "completed"
+
+def test_store_file_info(sharded_api):
+    """Test that validation and file info treat the store as one task list."""
+    sharded_api.create_task("First Task", "One")
+    sharded_api.create_task("Second Task", "Two")
+    handler = sharded_api._file_handler
+
+    is_valid, _, count = handler.validate_task_file(str(handler.tasks_file))
+    assert is_valid and count == 2
+    assert sharded_api.get_current_file_info()[1] == 2
+    assert handler.get_file_info()["statuses"] == {"pending": 2}
+
+def test_unknown_executor(tmp_path):
+    """Test that an unknown executor is rejected."""
+    with pytest.raises(ValueError):
+        ShardedFileHandler(data_dir=str(tmp_path), executor="fiber")
@@ -0,0 +1,96 @@
+"""
+Unit tests for binary task snapshots.
+"""
+
+import json
+import pytest
+from datetime import datetime, timezone
+from src.utils.file_handler import FileHandler
+from src.models.task import Task
+
+@pytest.fixture
+def snapshot_handler(tmp_path):
+    """Create a FileHandler that keeps binary snapshots."""
+    return FileHandler(data_dir=str(tmp_path), snapshot=True)
+
+@pytest.fixture
+def sample_tasks():
+    """Tasks covering naive, aware and missing dates."""
+    return [
+        Task(title="Naive Dates", description="One", due_date=datetime(2030, 1, 2, 3, 4, 5, 6)),
+        Task(title="Aware Dates", description="Two", dependencies=["task-001"],
+             created_date=datetime(2024, 5, 6, tzinfo=timezone.utc)),
+        Task(title="Without Due Date", description="Three", priority=5, status="completed"),
+    ]
+
+def _fresh_handler(handler, **kwargs):
+    """Create a new handler on the same directory, as after a restart."""
+    return FileHandler(data_dir=str(handler.data_dir), snapshot=True, **kwargs)
+
+def test_snapshot_round_trip(snapshot_handler, sample_tasks, monkeypatch):
+    """Test that a fresh snapshot is loaded instead of decoding the JSON."""
+    snapshot_handler.save_tasks(sample_tasks)
+    snapshot_handler.write_snapshots()
+    assert (snapshot_handler.data_dir / "tasks.json.snapshot").exists()
+    
+    handler = _fresh_handler(snapshot_handler)
+    monkeypatch.setattr(handler.codec, "loads", lambda data: pytest.fail("JSON was decoded"))
+    loaded = handler.load_tasks()
+    assert [task.to_dict() for task in loaded] == [task.to_dict() for task in sample_tasks]
+    assert loaded == sample_tasks
+
+def test_saves_defer_snapshot(snapshot_handler, sample_tasks):
+    """Test that saves leave the snapshot to write_snapshots(), which skips unsaved changes."""
+    snapshot_path = snapshot_handler.data_dir / "tasks.json.snapshot"
+    snapshot_handler.save_tasks(sample_tasks)
+    tasks = snapshot_handler.load_tasks()
+    tasks[0].status = "completed"
+    snapshot_handler.save_tasks(tasks)
+    assert not snapshot_path.exists()
+    
+    tasks[1].status = "blocked"
+    snapshot_handler.write_snapshots()
+    assert not snapshot_path.exists()
+    
+    snapshot_handler.save_tasks(tasks)
+    snapshot_handler.write_snapshots()
+    loaded = _fresh_handler(snapshot_handler).load_tasks()
+    assert [task.status for task in loaded] == ["completed", "blocked", "completed"]
+
+def test_snapshot_ignored_when_json_changes(snapshot_handler, sample_tasks):
+    """Test that editing the JSON file outside the handler invalidates the snapshot."""
+    snapshot_handler.save_tasks(sample_tasks)
+    
+    data = json.loads(snapshot_handler.tasks_file.read_text())
+    data[0]["status"] = "completed"
+    snapshot_handler.tasks_file.write_text(json.dumps(data, indent=2))
+    
+    assert _fresh_handler(snapshot_handler).load_tasks()[0].status == "completed"
+
+def test_corrupt_snapshot_falls_back_to_json(snapshot_handler, sample_tasks):
+    """Test that a damaged snapshot is ignored and rebuilt."""
+    snapshot_handler.save_tasks(sample_tasks)
+    snapshot_handler.write_snapshots()
+    snapshot_path = snapshot_handler.data_dir / "tasks.json.snapshot"
+    snapshot_path.write_bytes(snapshot_path.read_bytes()[:40])
+    
+    assert len(_fresh_handler(snapshot_handler).load_tasks()) == 3
+    assert len(snapshot_path.read_bytes()) > 40
+
+def test_snapshot_built_on_first_json_load(tmp_path, sample_tasks):
+    """Test that loading a plain JSON file leaves a snapshot for the next start."""
+    FileHandler(data_dir=str(tmp_path)).save_tasks(sample_tasks)
+    assert not (tmp_path / "tasks.json.snapshot").exists()
+    
+    FileHandler(data_dir=str(tmp_path), snapshot=True).load_tasks()
+    assert (tmp_path / "tasks.json.snapshot").exists()
+
+def test_snapshot_skipped_with_journal(tmp_path, sample_tasks):
+    """Test that journaled mutations are never hidden behind an older snapshot."""
+    handler = FileHandler(data_dir=str(tmp_path), snapshot=True, journal=True)
+    handler.save_tasks(sample_tasks)
+    tasks = handler.load_tasks()
+    tasks[0].status = "completed"
+    handler.persist_update(tasks, tasks[0])
+    
+    assert FileHandler(data_dir=str(tmp_path), snapshot=True).load_tasks()[0].status == "completed"
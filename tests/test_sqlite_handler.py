@@ -0,0 +1,103 @@
+"""
+Unit tests for the SQLite storage backend.
+"""
+
+import json
+import sqlite3
+import pytest
+from src.utils.sqlite_handler import SqliteFileHandler
+from src.api.task_api import TaskAPI
+from src.models.task import Task
+
+@pytest.fixture
+def sqlite_handler(tmp_path):
+    """Create a SqliteFileHandler with a temporary data directory."""
+    return SqliteFileHandler(data_dir=str(tmp_path))
+
+@pytest.fixture
+def task_api(sqlite_handler):
+    """Create a TaskAPI backed by the SQLite handler."""
+    return TaskAPI(file_handler=sqlite_handler)
+
+def test_save_and_load_tasks(sqlite_handler):
+    """Test that tasks round-trip through the database in order."""
+    tasks = [
+        Task(id="task-001", title="Test Task 1", description="One", dependencies=["task-002"]),
+        Task(id="task-002", title="Test Task 2", description="Two", status="in_progress", priority=4)
+    ]
+    sqlite_handler.save_tasks(tasks)
+
+    loaded = sqlite_handler.load_tasks()
+    assert [task.to_dict() for task in loaded] == [task.to_dict() for task in tasks]
+
+def test_task_api_crud(task_api, sqlite_handler):
+    """Test that TaskAPI works unchanged on top of the SQLite handler."""
+    task_api.create_task("Write the report", "Quarterly numbers", priority=5)
+    task_api.create_task("Review the report", "Check numbers", dependencies=["Write the report"])
+    task_api.update_task("Write the report", status="completed")
+
+    assert task_api.get_task("Write the report")["status"] == "completed"
+    assert [t.title for t in task_api.get_tasks_by_status("completed")] == ["Write the report"]
+    assert [t.title for t in task_api.get_tasks_by_priority(5)] == ["Write the report"]
+    assert task_api.get_task("Review the report")["dependencies"] == ["Write the report"]
+
+    assert task_api.delete_task("Review the report")
+    assert len(task_api.list_tasks()) == 1
+
+    # Dependency rows are removed together with their task
+    with sqlite3.connect(str(sqlite_handler.tasks_file)) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM task_dependencies").fetchone()[0] == 0
+
+def test_uuid_changes_are_not_lost_silently(task_api, sqlite_handler):
+    """Test that an update is never applied to a uuid without a stored row."""
+    task_api.create_task("Write the report", "Quarterly numbers")
+    assert task_api.update_task("Write the report", uuid="new-uuid") is None
+
+    tasks = sqlite_handler.load_tasks()
+    uuid = tasks[0].uuid
+    tasks[0].uuid = "new-uuid"
+    with pytest.raises(ValueError):
+        sqlite_handler.persist_update(tasks, tasks[0])
+    assert [task.uuid for task in sqlite_handler.load_tasks()] == [uuid]
+
+def test_lookups_use_indexes(sqlite_handler):
+    """Test that status and priority lookups are answered by an index."""
+    sqlite_handler.save_tasks([Task(title="Test Task 1", description="One")])
+    with sqlite3.connect(str(sqlite_handler.tasks_file)) as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT seq FROM tasks WHERE status = ?", ("pending",)).fetchall()
+    assert "idx_tasks_status" in " ".join(str(row) for row in plan)
+
+def test_find_tasks_matches_alternatives(task_api, sqlite_handler):
+    """Test combined filters where a field may hold any of several values."""
+    sqlite_handler.save_tasks([
+        Task(title="Test Task 1", description="One", priority=5, source="ai"),
+        Task(title="Test Task 2", description="Two", priority=4),
+        Task(title="Test Task 3", description="Three", priority=2, source="ai"),
+    ])
+    found = task_api.find_tasks(status="pending", priority=range(4, 6), source="ai")
+    assert [task.title for task in found] == ["Test Task 1"]
+    assert [task.title for task in sqlite_handler.find_tasks(priority=[2, 4])] == ["Test Task 2", "Test Task 3"]
+
+def test_find_tasks_rejects_unknown_field(sqlite_handler):
+    """Test that querying an unindexed field raises a ValueError."""
+    with pytest.raises(ValueError):
+        sqlite_handler.find_tasks(description="anything")
+
+def test_import_and_export_json(sqlite_handler, tmp_path):
+    """Test the one-shot JSON importer and exporter."""
+    source = tmp_path / "sample_tasks.json"
+    with open(source, 'w') as f:
+        json.dump({"tasks": [
+            {"id": "task-001", "title": "Test Task 1", "description": "One"},
+            {"id": "task-002", "title": "Test Task 2", "description": "Two", "status": "completed"}
+        ]}, f)
+
+    assert sqlite_handler.import_json(str(source)) == 2
+    assert sqlite_handler.validate_task_file(str(sqlite_handler.tasks_file))[2] == 2
+
+    target = tmp_path / "exported.json"
+    assert sqlite_handler.export_json(str(target)) == 2
+    with open(target, 'r') as f:
+        exported = json.load(f)
+    assert [task["id"] for task in exported] == ["task-001", "task-002"]
+    assert exported[1]["status"] == "completed"
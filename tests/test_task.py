@@ -55,4 +55,44 @@ def test_task_from_dict():
     assert task.description == "Test Description"
     assert task.dependencies == ["task1"]
     assert task.status == "completed"
-    assert task.priority == 3 
\ No newline at end of file
+    assert task.priority == 3
+
+
+def test_task_memory_layout():
+    """Test that tasks are slotted, share status strings and own their dependency lists."""
+    first = Task.from_dict({"title": "First Task", "description": "One", "status": "".join(["pend", "ing"])})
+    second = Task(title="Second Task", description="Two")
+    
+    assert not hasattr(first, "__dict__")
+    assert first.status is second.status
+    assert first.dependencies == [] and first.dependencies is not second.dependencies
+    
+    first.dependencies.append("Second Task")
+    assert first.to_dict()["dependencies"] == ["Second Task"]
+    assert second.dependencies == []
+    # Dicts get their own copy of the list
+    second.to_dict()["dependencies"].append("First Task")
+    assert second.dependencies == []
+
+def test_task_from_dicts():
+    """Test bulk decoding, including defaults, renamed and unknown fields."""
+    records = [
+        {"title": "First Task", "description": "One", "created_at": "2025-01-01T09:00:00",
+         "updated_at": "2025-01-02T09:00:00", "tags": ["work"], "due_date": "2025-02-01T00:00:00"},
+        {"id": "task-002", "due_date": "2025-02-01T00:00:00", "priority": "high"},
+        {"title": "Third Task", "created_date": "yesterday", "due_date": "someday"},
+    ]
+    copies = [dict(record) for record in records]
+    
+    first, second, third = Task.from_dicts(records)
+    
+    assert records == copies
+    assert first.created_date == datetime(2025, 1, 1, 9, 0)
+    assert first.due_date is second.due_date
+    assert second.title == "Task task-002"
+    assert second.description == "No description provided"
+    assert second.priority == 5
+    assert isinstance(third.created_date, datetime)
+    assert third.due_date is None
+    assert [task.to_dict() for task in (first, second, third)] == \
+        [Task.from_dict(task.to_dict()).to_dict() for task in (first, second, third)]
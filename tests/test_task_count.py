@@ -0,0 +1,132 @@
+"""
+Unit tests for task counting and the task file catalog.
+"""
+
+import json
+import os
+import pytest
+from pathlib import Path
+from src.utils.file_handler import FileHandler
+from src.api.task_api import TaskAPI
+
+TASKS = [
+    {"id": "task-001", "title": "Test Task 1", "extra": {"title": "nested"}},
+    {"title": "Test Task 2", "dependencies": ["task-001"]},
+    {"description": "Missing title and id"},
+    "not a task",
+]
+
+@pytest.fixture
+def file_handler(tmp_path):
+    """Create a FileHandler with a temporary data directory."""
+    return FileHandler(data_dir=str(tmp_path))
+
+def test_get_task_count_matches_validation(file_handler, tmp_path):
+    """Test that counting agrees with full validation for every layout."""
+    indented = json.dumps(TASKS[:2], indent=2)
+    documents = {
+        "list.json": json.dumps(TASKS, indent=2),
+        "wrapped.json": json.dumps({"tasks": TASKS}, indent=2),
+        "compact.json": json.dumps(TASKS),
+        "broken.json": '[{"id": "task-001",',
+        "unterminated.json": indented.replace('"Test Task 2"', '"Test Task 2'),
+        "missing_comma.json": indented.replace("},\n  {", "}\n  {"),
+        "empty.json": "[]",
+    }
+    for name, content in documents.items():
+        path = tmp_path / name
+        path.write_text(content)
+        is_valid, _, expected = file_handler.validate_task_file(str(path))
+        assert file_handler.get_task_count(str(path)) == (expected if is_valid else 0)
+
+def test_get_task_count_uses_catalog(file_handler, tmp_path, monkeypatch):
+    """Test that unchanged files are counted from the catalog without reading them."""
+    path = tmp_path / "tasks_a.json"
+    path.write_text(json.dumps(TASKS, indent=2))
+    assert file_handler.get_task_count(str(path)) == 2
+    
+    # A new handler reads the persisted catalog instead of the file
+    handler = FileHandler(data_dir=str(tmp_path))
+    monkeypatch.setattr(FileHandler, "_validate_task_file", lambda *a, **k: pytest.fail("file was re-read"))
+    assert handler.get_task_count(str(path)) == 2
+    
+    # The catalog itself is not listed as a task file
+    files, count = handler.list_task_files()
+    assert [f.name for f in files] == ["tasks_a.json"]
+
+def test_get_task_count_refreshes_changed_file(file_handler, tmp_path):
+    """Test that a changed file is recounted."""
+    path = tmp_path / "tasks_a.json"
+    path.write_text(json.dumps(TASKS, indent=2))
+    assert file_handler.get_task_count(str(path)) == 2
+    
+    path.write_text(json.dumps(TASKS[:1], indent=2))
+    assert file_handler.get_task_count(str(path)) == 1
+
+def test_list_task_files_catalogs_directory(file_handler, tmp_path):
+    """Test that listing task files records per-file metadata in the catalog."""
+    (tmp_path / "tasks_a.json").write_text(json.dumps(TASKS, indent=2))
+    (tmp_path / "tasks_b.json").write_text(json.dumps({"tasks": [
+        {"title": "Done task", "status": "completed"},
+        {"title": "Open task"},
+    ]}))
+    (tmp_path / "broken.json").write_text("{not json")
+    
+    file_handler.list_task_files()
+    
+    info = file_handler.get_file_info(str(tmp_path / "tasks_b.json"))
+    assert info["task_count"] == 2
+    assert info["total_records"] == 2
+    assert info["statuses"] == {"completed": 1, "pending": 1}
+    assert info["valid"] is True
+    assert info["schema_valid"] is None
+    assert len(info["content_hash"]) == 64
+    
+    assert file_handler.get_file_info(str(tmp_path / "tasks_a.json"))["total_records"] == 4
+    assert file_handler.get_file_info(str(tmp_path / "broken.json"))["valid"] is False
+
+def test_list_task_files_refreshes_only_changed_files(file_handler, tmp_path, monkeypatch):
+    """Test that only new or changed files are re-read when listing again."""
+    for name in ("tasks_a.json", "tasks_b.json", "tasks_c.json"):
+        (tmp_path / name).write_text(json.dumps(TASKS, indent=2))
+    file_handler.list_task_files()
+    
+    (tmp_path / "tasks_b.json").write_text(json.dumps(TASKS[:1], indent=2))
+    (tmp_path / "tasks_c.json").unlink()
+    
+    handler = FileHandler(data_dir=str(tmp_path))
+    reread = []
+    original = FileHandler._validate_task_file
+    def recording(self, file_path, **kwargs):
+        reread.append(Path(file_path).name)
+        return original(self, file_path, **kwargs)
+    monkeypatch.setattr(FileHandler, "_validate_task_file", recording)
+    
+    files, count = handler.list_task_files()
+    assert count == 2
+    assert reread == ["tasks_b.json"]
+    assert handler.get_file_info(str(tmp_path / "tasks_b.json"))["task_count"] == 1
+    assert "tasks_c.json" not in handler.get_catalog().entries
+
+def test_touched_file_reuses_entry_by_hash(file_handler, tmp_path, monkeypatch):
+    """Test that a file whose mtime changed but content did not is not re-parsed."""
+    path = tmp_path / "tasks_a.json"
+    path.write_text(json.dumps(TASKS, indent=2))
+    first = file_handler.get_file_info(str(path))
+    
+    os.utime(path, ns=(first["mtime_ns"] + 10**9, first["mtime_ns"] + 10**9))
+    monkeypatch.setattr(FileHandler, "_validate_task_file", lambda *a, **k: pytest.fail("file was re-parsed"))
+    second = file_handler.get_file_info(str(path))
+    assert second["task_count"] == first["task_count"]
+    assert second["mtime_ns"] != first["mtime_ns"]
+
+@pytest.mark.parametrize("journal", [False, True])
+def test_current_file_info_tracks_mutations(tmp_path, journal):
+    """Test that the current file's task count reflects saved and journaled tasks."""
+    task_api = TaskAPI(data_file=str(tmp_path / "tasks.json"), journal=journal)
+    task_api.create_task("First Task", "One")
+    task_api.create_task("Second Task", "Two")
+    assert task_api.get_current_file_info() == (str(tmp_path / "tasks.json"), 2)
+    
+    task_api.delete_task("First Task")
+    assert task_api.get_current_file_info()[1] == 1
@@ -0,0 +1,141 @@
+"""
+Unit tests for the task indexes kept by TaskAPI.
+"""
+
+import pytest
+from src.api.task_api import TaskAPI
+from src.api.task_index import TaskIndex
+from src.models.task import Task
+from src.utils.file_handler import FileHandler
+
+@pytest.fixture
+def task_api(tmp_path):
+    """TaskAPI over a fresh tasks file."""
+    return TaskAPI(data_file=str(tmp_path / "tasks.json"))
+
+def test_index_lookups_and_duplicates():
+    """Test lookups, list order among duplicates and incremental maintenance."""
+    first = Task(title="Shared Title", description="", id="task-001")
+    second = Task(title="Shared Title", description="", id="task-002")
+    third = Task(title="Other Title", description="")
+    index = TaskIndex([first, second, third])
+
+    assert index.get("id", "task-002") is second
+    assert index.get("title", "Shared Title") is first
+    assert index.find("title", "Shared Title") == [first, second]
+    assert index.get("id", None) is None
+    assert len(index) == 3
+
+    index.remove(first)
+    assert index.get("title", "Shared Title") is second
+    assert index.find("title", "Shared Title") == [second]
+
+    old_values = {key: getattr(third, key) for key in TaskIndex.KEYS}
+    third.title = "Renamed Title"
+    index.reindex(third, old_values)
+    assert index.get("title", "Other Title") is None
+    assert index.get("title", "Renamed Title") is third
+
+    fourth = Task(title="Renamed Title", description="")
+    index.add(fourth)
+    assert index.find("title", "Renamed Title") == [third, fourth]
+    assert index.get("uuid", fourth.uuid) is fourth
+
+def test_api_keeps_index_across_mutations(task_api):
+    """Test that API mutations update the index instead of rebuilding it."""
+    task_api.create_task("First Task", "One")
+    index = task_api._index
+
+    task_api.create_task("First Task", "Duplicate")
+    task_api.update_task("First Task", title="Renamed Task")
+    assert task_api.delete_task("First Task (1)")
+
+    assert task_api._index is index
+    assert task_api.get_task("Renamed Task")["description"] == "One"
+    assert task_api.get_task("First Task") is None
+    assert [task["title"] for task in task_api.list_tasks()] == ["Renamed Task"]
+
+def test_api_rebuilds_index_after_external_write(task_api):
+    """Test that tasks written by someone else are found after a reload."""
+    task_api.create_task("First Task", "One")
+    index = task_api._index
+
+    other = FileHandler(data_dir=str(task_api._file_handler.data_dir))
+    other.tasks_file = task_api._file_handler.tasks_file
+    tasks = other.load_tasks()
+    tasks.append(Task(title="External Task", description="Two"))
+    other.save_tasks(tasks)
+
+    assert task_api.get_task("External Task")["description"] == "Two"
+    assert task_api._index is not index
+
+def test_index_select_intersects_filters():
+    """Test combined filters, alternatives and list order of the results."""
+    tasks = [Task(title=f"Filter Task {i}", description="", status=status, priority=i % 5 + 1,
+                  source="ai" if i % 2 else "human")
+             for i, status in enumerate(["pending", "completed", "pending", "pending", "blocked", "pending"])]
+    index = TaskIndex(tasks)
+
+    assert index.select(status="pending") == [tasks[0], tasks[2], tasks[3], tasks[5]]
+    assert index.select(status="pending", priority=range(4, 6), source="ai") == [tasks[3]]
+    assert index.select(status=["blocked", "completed"], source="human") == [tasks[4]]
+    assert index.select(status="archived") == []
+    with pytest.raises(ValueError):
+        index.select(description="")
+
+    old_values = index.values(tasks[0])
+    tasks[0].priority = 4
+    tasks[0].source = "ai"
+    index.reindex(tasks[0], old_values)
+    assert index.select(status="pending", priority=[4, 5], source="ai") == [tasks[0], tasks[3]]
+
+    index.remove(tasks.pop(3))
+    added = Task(title="Filter Task 6", description="", status="pending", priority=5, source="ai")
+    tasks.append(added)
+    index.add(added)
+    assert index.select(status="pending", priority=[4, 5], source="ai") == [tasks[0], added]
+
+def test_api_filters_follow_updates(task_api):
+    """Test that status and priority filters see tasks changed through the API."""
+    task_api.create_task("First Task", "One", priority=4)
+    task_api.create_task("Second Task", "Two", priority=2)
+    task_api.create_task("Third Task", "Three", priority=5)
+    assert [t.title for t in task_api.get_tasks_by_status("pending")] == \
+        ["First Task", "Second Task", "Third Task"]
+
+    task_api.update_task("Second Task", priority=5)
+    task_api.update_task("Third Task", status="completed")
+    assert [t.title for t in task_api.find_tasks(status="pending", priority=[4, 5])] == \
+        ["First Task", "Second Task"]
+    assert [t.title for t in task_api.get_tasks_by_priority(5)] == ["Second Task", "Third Task"]
+
+    task_api.delete_task("First Task")
+    assert [t.title for t in task_api.find_tasks(status="pending", source="human")] == ["Second Task"]
+
+def test_api_normalizes_updated_priority(task_api):
+    """Test that priority names are converted on update, as when tasks are loaded."""
+    task_api.create_task("First Task", "One")
+
+    assert task_api.update_task("First Task", priority="high")["priority"] == 5
+    assert task_api.get_task("First Task")["priority"] == 5
+    assert [t.title for t in task_api.get_tasks_by_priority(5)] == ["First Task"]
+
+def test_unique_title_allocation():
+    """Test that suffixes skip taken titles and freed suffixes are reused."""
+    tasks = [Task(title="Daily standup", description="")]
+    tasks += [Task(title=f"Daily standup ({i})", description="") for i in (1, 2, 4)]
+    index = TaskIndex(tasks)
+
+    assert index.unique_title("Weekly review") == "Weekly review"
+    assert index.unique_title("Daily standup") == "Daily standup (3)"
+    for title in ("Daily standup (3)", "Daily standup (5)"):
+        added = Task(title=index.unique_title("Daily standup"), description="")
+        assert added.title == title
+        tasks.append(added)
+        index.add(added)
+
+    index.remove(tasks[2])
+    assert index.unique_title("Daily standup") == "Daily standup (2)"
+    # A task keeps a suffix it already holds when renamed to its own base title
+    assert index.unique_title("Daily standup", tasks[1]) == "Daily standup (1)"
+    assert index.unique_title("Daily standup (1)", tasks[1]) == "Daily standup (1)"
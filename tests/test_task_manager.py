@@ -184,6 +184,19 @@ class TestTaskManager(unittest.TestCase):
                         # Verify that success messages were printed
                         mock_print.assert_any_call(f"[green]Created new task file: test_new_file.json[/green]")
     
+    def test_create_new_task_file_without_codec(self):
+        """Test that a compressed file is not created when its codec is missing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.task_manager.default_data_dir = temp_dir
+            
+            with patch('src.main.Prompt.ask', side_effect=["test_new_file.json.zst"]), \
+                 patch('src.utils.compression.zstandard', None), \
+                 patch('src.main.console.print') as mock_print:
+                self.task_manager.create_new_task_file()
+            
+            self.assertFalse(os.path.exists(os.path.join(temp_dir, "test_new_file.json.zst")))
+            self.assertIn("zstandard", mock_print.call_args[0][0])
+    
     def test_create_new_task_file_existing(self):
         """Test that create_new_task_file handles existing files correctly."""
         # Create a temporary directory for the test
@@ -0,0 +1,147 @@
+"""
+Unit tests for the task query DSL and cursor pagination.
+"""
+
+import json
+import pytest
+from datetime import datetime, timedelta, timezone
+from src.api.task_api import TaskAPI
+from src.api.task_query import parse_query
+from src.utils.sqlite_handler import SqliteFileHandler
+
+NOW = datetime(2025, 3, 1, 12, 0)
+
+def _tasks(count):
+    """Task fields with mixed statuses, priorities, sources and due dates."""
+    return [{"title": f"Query task {i}", "description": "Standup notes" if i % 3 == 0 else "Other",
+             "status": "completed" if i % 4 == 0 else "pending", "priority": i % 5 + 1,
+             "source": "ai" if i % 2 else "human",
+             "due_date": NOW + timedelta(days=i - 10) if i % 2 else None}
+            for i in range(count)]
+
+@pytest.fixture
+def task_api(tmp_path):
+    """TaskAPI over a tasks file with 30 tasks."""
+    task_api = TaskAPI(data_file=str(tmp_path / "tasks.json"))
+    task_api.create_many(_tasks(30))
+    return task_api
+
+def _titles(page):
+    return [task["title"] for task in page["tasks"]]
+
+def test_parse_query():
+    """Test that terms compile into conditions, words, sort keys and a limit."""
+    query = parse_query('status:pending,blocked priority>=high due<7d title:"Daily standup" '
+                        'notes sort:-priority,due limit:50', now=NOW)
+
+    assert [(c.name, c.op, c.values) for c in query.conditions] == [
+        ("status", ":", ("pending", "blocked")),
+        ("priority", ">=", (5,)),
+        ("due_date", "<", (NOW + timedelta(days=7),)),
+        ("title", ":", ("Daily standup",)),
+    ]
+    assert query.words == ["notes"]
+    assert query.sort == [("priority", True), ("due_date", False)]
+    assert query.limit == 50
+    assert query.index_criteria() == {"status": {"pending", "blocked"}, "priority": {5},
+                                      "title": {"Daily standup"}}
+
+@pytest.mark.parametrize("text", ["priority:9", "limit:0", "sort:colour", "due>none", "created<soon"])
+def test_parse_query_rejects_invalid_terms(text):
+    """Test that malformed queries raise a ValueError."""
+    with pytest.raises(ValueError):
+        parse_query(text)
+
+def test_query_filters_and_sorts(task_api):
+    """Test that a query matches the same tasks as filtering by hand, in sort order."""
+    query = parse_query("status:pending priority>=3 due<5d source!=human standup sort:-priority,due",
+                        now=NOW)
+    expected = sorted(
+        (t for t in _tasks(30) if t["status"] == "pending" and t["priority"] >= 3 and t["source"] != "human"
+         and t["due_date"] is not None and t["due_date"] < NOW + timedelta(days=5)
+         and "standup" in t["description"].lower()),
+        key=lambda t: (-t["priority"], t["due_date"]))
+
+    page = task_api.query(query)
+    assert _titles(page) == [t["title"] for t in expected]
+    assert page["next_cursor"] is None
+    # Tasks without a due date sort last
+    assert _titles(task_api.query("sort:due limit:16"))[-1] == "Query task 0"
+
+def test_query_matches_missing_keys(task_api):
+    """Test that none matches tasks without an id, which the indexes leave out."""
+    task_api.update_task("Query task 1", id="task-001")
+
+    assert parse_query("id:none").index_criteria() == {}
+    assert len(task_api.query("id:none")["tasks"]) == 29
+    assert _titles(task_api.query("id:none,task-001 title:\"Query task 1\"")) == ["Query task 1"]
+    assert _titles(task_api.query("id!=none")) == ["Query task 1"]
+
+def test_query_rejects_mixed_sort_values(task_api):
+    """Test that sorting values of different types is reported as a bad query."""
+    task_api.update_task("Query task 1", id="task-001")
+    task_api.update_task("Query task 2", id=2)
+
+    with pytest.raises(ValueError, match="Cannot sort tasks by id"):
+        task_api.query("sort:id")
+    with pytest.raises(ValueError, match="Cannot sort tasks by id"):
+        task_api.query("sort:-id limit:5")
+
+def test_query_compares_aware_dates(tmp_path):
+    """Test that dates with a UTC offset are compared with naive ones as local times."""
+    tasks_file = tmp_path / "tasks.json"
+    tasks_file.write_text(json.dumps([
+        {"title": "Aware task", "description": "", "due_date": "2025-03-01T00:00:00Z"},
+        {"title": "Naive task", "description": "", "due_date": "2025-03-05T00:00:00"},
+        {"title": "Undated task", "description": ""},
+    ]))
+    task_api = TaskAPI(data_file=str(tasks_file))
+    aware = datetime(2025, 3, 1, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+    assert _titles(task_api.query(parse_query("due<7d", now=aware))) == ["Aware task", "Naive task"]
+    assert _titles(task_api.query("due>2024-01-01")) == ["Aware task", "Naive task"]
+    assert _titles(task_api.query("due>=2025-03-01T00:00:00+00:00")) == ["Aware task", "Naive task"]
+    assert _titles(task_api.query("sort:-due")) == ["Naive task", "Aware task", "Undated task"]
+    page = task_api.query("sort:due limit:1")
+    assert _titles(task_api.query("sort:due", cursor=page["next_cursor"])) == ["Naive task", "Undated task"]
+
+def test_cursor_pages_through_results(task_api):
+    """Test that pages join up to the full result, also while tasks change."""
+    text = "status:pending sort:-priority,title"
+    full = _titles(task_api.query(text))
+
+    first = task_api.query(text, limit=5)
+    assert _titles(first) == full[:5]
+    # Removing the page's last task and adding one that sorts before the cursor moves nothing
+    task_api.delete_task(full[4])
+    task_api.create_task("Aaaa early task", "", priority=5)
+    second = task_api.query(text, cursor=first["next_cursor"], limit=5)
+    assert _titles(second) == full[5:10]
+
+    pages, cursor = [], None
+    while True:
+        page = task_api.query("status:pending", cursor=cursor, limit=4)
+        pages.extend(_titles(page))
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert pages == [t["title"] for t in task_api.list_tasks() if t["status"] == "pending"]
+
+def test_cursor_must_match_sort_order(task_api):
+    """Test that a cursor cannot be reused with a different sort order."""
+    cursor = task_api.query("sort:priority", limit=3)["next_cursor"]
+    with pytest.raises(ValueError):
+        task_api.query("sort:-priority", cursor=cursor)
+    with pytest.raises(ValueError):
+        task_api.query("sort:priority", cursor="not-a-cursor")
+
+def test_query_on_sqlite(tmp_path):
+    """Test that SQLite selects the candidates with its own indexes."""
+    task_api = TaskAPI(file_handler=SqliteFileHandler(data_dir=str(tmp_path)))
+    task_api.create_many(_tasks(12))
+
+    page = task_api.query("status:pending priority>=3 sort:-priority limit:2")
+    assert _titles(page) == ["Query task 9", "Query task 3"]
+    page = task_api.query(parse_query("status:pending priority>=3 sort:-priority"), cursor=page["next_cursor"])
+    assert _titles(page) == ["Query task 2", "Query task 7"]
+    assert page["next_cursor"] is None
@@ -0,0 +1,86 @@
+"""
+Unit tests for columnar task tables.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from src.api.task_api import TaskAPI
+from src.models import task_table
+from src.models.task import Task
+from src.models.task_table import TaskTable
+
+NOW = datetime(2025, 3, 1, 12, 0)
+
+@pytest.fixture
+def tasks():
+    """Six tasks with mixed statuses, priorities and due dates."""
+    statuses = ["pending", "completed", "pending", "in_progress", "blocked", "pending"]
+    return [Task(title=f"Table Task {i}", description="", status=status, priority=i % 5 + 1,
+                 created_date=NOW - timedelta(days=i * 10),
+                 due_date=NOW + timedelta(days=5 - 3 * i) if i % 2 == 0 else None)
+            for i, status in enumerate(statuses)]
+
+def test_columns_match_tasks(tasks):
+    """Test that a table holds the tasks' fields as parallel columns."""
+    np = pytest.importorskip("numpy")
+    table = TaskTable.from_tasks(tasks)
+
+    assert len(table) == 6
+    assert list(table.titles) == [task.title for task in tasks]
+    assert list(table.column("status")) == [task.status for task in tasks]
+    assert table.statuses[:3] == ("pending", "in_progress", "completed")
+    assert table.priorities.dtype == np.int8
+    assert table.created[1] == np.datetime64(tasks[1].created_date, "us")
+    assert np.isnat(table.due[1])
+
+def test_filter(tasks):
+    """Test filtering by mask and by field values."""
+    np = pytest.importorskip("numpy")
+    table = TaskTable.from_tasks(tasks)
+
+    pending = table.filter(status="pending")
+    assert list(pending.titles) == ["Table Task 0", "Table Task 2", "Table Task 5"]
+    urgent = table.filter(table.priorities >= 3, status=["pending", "blocked"])
+    assert list(urgent.titles) == ["Table Task 2", "Table Task 4"]
+    assert len(table.filter(status="archived")) == 0
+
+def test_group_by_and_aggregate(tasks):
+    """Test grouped counts, means, percentiles and per-group tables."""
+    pytest.importorskip("numpy")
+    table = TaskTable.from_tasks(tasks)
+
+    assert table.aggregate("priority", "count", by="status") == \
+        {"pending": 3, "in_progress": 1, "completed": 1, "blocked": 1}
+    assert table.aggregate("priority", "mean", by="status")["pending"] == pytest.approx((1 + 3 + 1) / 3)
+    assert table.aggregate("priority", "max") == 5
+    assert table.percentile(table.ages(NOW), 50) == pytest.approx(25.0)
+    groups = table.group_by("priority")
+    assert list(groups) == [1, 2, 3, 4, 5]
+    assert list(groups[1].titles) == ["Table Task 0", "Table Task 5"]
+
+def test_overdue_and_histogram(tasks):
+    """Test the overdue mask and histograms of derived columns."""
+    pytest.importorskip("numpy")
+    table = TaskTable.from_tasks(tasks)
+
+    # Due dates: +5d, -1d, -7d for tasks 0, 2 and 4; none for the others
+    assert list(table.filter(table.overdue(NOW)).titles) == ["Table Task 2", "Table Task 4"]
+    counts, edges = table.histogram(table.ages(NOW), bins=[0, 20, 40, 60])
+    assert list(counts) == [2, 2, 2]
+
+def test_task_api_returns_table(tmp_path):
+    """Test that TaskAPI can list tasks as a table."""
+    pytest.importorskip("numpy")
+    task_api = TaskAPI(data_file=str(tmp_path / "tasks.json"))
+    task_api.create_task("First Task", "One")
+    task_api.create_task("Second Task", "Two", priority=4)
+
+    table = task_api.list_tasks(as_table=True)
+    assert isinstance(table, TaskTable)
+    assert list(table.priorities) == [1, 4]
+
+def test_missing_numpy_is_reported(tasks, monkeypatch):
+    """Test that a table without NumPy fails with a clear ImportError."""
+    monkeypatch.setattr(task_table, "np", None)
+    with pytest.raises(ImportError, match="numpy"):
+        TaskTable.from_tasks(tasks)
@@ -1,26 +1,28 @@
-import json
 import uuid
 
-# Read the current tasks
-with open('data/tasks.json', 'r') as f:
-    tasks = json.load(f)
+from src.utils.file_handler import FileHandler
 
-# Update each task with the new fields
-for task in tasks:
-    # Add UUID if not present
-    if 'uuid' not in task:
-        task['uuid'] = str(uuid.uuid4())
+# The records are edited as read, so fields the Task model does not know are
+# kept. The write lock keeps other writers out in between.
+handler = FileHandler()
+with handler.locked():
+    data = handler.read_records()
+    tasks = data["tasks"] if isinstance(data, dict) and "tasks" in data else data
     
-    # Add model information if not present
-    if 'model' not in task:
-        task['model'] = "unknown"
+    # Update each task with the new fields
+    for task in tasks:
+        # Add UUID if not present
+        if 'uuid' not in task:
+            task['uuid'] = str(uuid.uuid4())
+        
+        # Add model information if not present
+        if 'model' not in task:
+            task['model'] = "unknown"
+        
+        # Add source information if not present
+        if 'source' not in task:
+            task['source'] = "human"
     
-    # Add source information if not present
-    if 'source' not in task:
-        task['source'] = "human"
+    handler.write_records(data)
 
-# Write the updated tasks back to the file
-with open('data/tasks.json', 'w') as f:
-    json.dump(tasks, f, indent=2)
-
-print(f"Updated {len(tasks)} tasks in data/tasks.json")
+print(f"Updated {len(tasks)} tasks in {handler.tasks_file}")